@@ -63,7 +63,7 @@ export default function ProfilePage() {
               servicesOffered: me.services_offered || '',
               membershipPlan: me.membership_plan || '12 Months',
               bio: me.bio || 'Passionate about growing the Nagarbhavi Brigades community',
-              photo: me.photo || '',
+              photo: me.photos?.medium || me.photo || '',
             });
           }
         }).catch(console.error);
@@ -1,7 +1,8 @@
+import click
 from flask import Flask, jsonify
 from flask_cors import CORS
 from backend.config.config import Config
-from backend.utils.extensions import bcrypt, mail
+from backend.utils.extensions import mail
 from backend.routes.auth_routes import auth_bp
 from backend.routes.referral_routes import referral_bp
 from backend.routes.revenue_routes import revenue_bp
@@ -13,99 +14,64 @@ from backend.routes.guest_routes import guest_bp
 from backend.routes.learning_routes import learning_bp
 from backend.routes.analytics_routes import analytics_bp
 from backend.routes.search_routes import search_bp
+from backend.routes.export_routes import export_bp
+from backend.routes.sync_routes import sync_bp
+from backend.routes.dashboard_routes import dashboard_bp
+from backend.commands import register_commands
+from backend.utils.typeahead import member_index
+from backend.utils import sql_stats
+from sqlalchemy.exc import SQLAlchemyError
 
-def create_app():
+def create_app(lazy_imports=None):
+    """Build the app.
+
+    With lazy_imports (default: the LAZY_IMPORTS setting) Flask-Mail is
+    imported on first use, and Flask-Migrate/Alembic only for CLI commands
+    and in-process upgrades, which keeps worker boot short. bcrypt is only
+    imported where passwords are hashed (utils/passwords.py).
+    """
     app = Flask(__name__)
     app.config.from_object(Config)
+    if lazy_imports is None:
+        lazy_imports = app.config['LAZY_IMPORTS']
 
     # Initialize Extensions
     # Initialize Extensions
     # mongo.init_app(app)
-    bcrypt.init_app(app)
     mail.init_app(app)
     
-    import os
-    from backend.utils.extensions import db, migrate
+    from backend.utils.extensions import db
+    from backend.utils import schema
     db.init_app(app)
     
-    # Render starts gunicorn in backend/wsgi.py which might mess up relative paths
-    # Set the exact path to the migrations folder at the root project level
-    migrations_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'migrations'))
-    migrate.init_app(app, db, directory=migrations_dir)
+    # The `flask db` commands need Flask-Migrate registered; a gunicorn worker never does
+    if not lazy_imports or click.get_current_context(silent=True) is not None:
+        schema.init_migrate(app)
+    if not lazy_imports:
+        mail.load()
     
-    # Auto-upgrade the database
+    # Migrations run once per deploy via `flask schema upgrade`; workers only compare revisions.
+    # SCHEMA_STARTUP=upgrade keeps the old migrate-on-boot behaviour for single-process dev servers.
+    startup = app.config['SCHEMA_STARTUP']
     with app.app_context():
-        try:
-            from flask_migrate import upgrade
-            upgrade(directory=migrations_dir)
-        except Exception as e:
-            print(f"Auto-upgrade failed: {e}")
-            
-        # BULLETPROOF FALLBACK: Violently force the column creation if migrate failed
-        try:
-            from sqlalchemy import text
-            # Add missing columns to 'user' table
-            db.session.execute(text("ALTER TABLE \"user\" ADD COLUMN IF NOT EXISTS business_name VARCHAR(100)"))
-            db.session.execute(text("ALTER TABLE \"user\" ADD COLUMN IF NOT EXISTS business_category VARCHAR(100)"))
-            db.session.execute(text("ALTER TABLE \"user\" ADD COLUMN IF NOT EXISTS services_offered TEXT"))
-            db.session.execute(text("ALTER TABLE \"user\" ADD COLUMN IF NOT EXISTS photo TEXT"))
-            
-            # Add missing columns to 'revenue' table
-            db.session.execute(text("ALTER TABLE revenue ADD COLUMN IF NOT EXISTS appreciation_message TEXT"))
-            db.session.execute(text("ALTER TABLE revenue ADD COLUMN IF NOT EXISTS appreciation_reason TEXT"))
-            
-            # Add missing columns to 'referral' table
-            db.session.execute(text("ALTER TABLE referral ADD COLUMN IF NOT EXISTS referral_type VARCHAR(20) DEFAULT 'Others'"))
-            
-            db.session.execute(text("ALTER TABLE meeting ADD COLUMN IF NOT EXISTS organized_by INTEGER REFERENCES \"user\"(id)"))
-            db.session.execute(text("ALTER TABLE meeting ADD COLUMN IF NOT EXISTS meeting_mode VARCHAR(20) DEFAULT 'Offline'"))
-            db.session.execute(text("ALTER TABLE meeting ADD COLUMN IF NOT EXISTS meet_link VARCHAR(500)"))
-            
-            # Create missing tables if they don't exist
-            db.session.execute(text("""
-                CREATE TABLE IF NOT EXISTS one_to_one (
-                    id SERIAL PRIMARY KEY,
-                    member_id INTEGER NOT NULL REFERENCES \"user\"(id),
-                    with_member_id INTEGER NOT NULL REFERENCES \"user\"(id),
-                    date VARCHAR(20),
-                    location VARCHAR(200),
-                    topics_discussed TEXT,
-                    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            
-            db.session.execute(text("""
-                CREATE TABLE IF NOT EXISTS meeting_attendees (
-                    user_id INTEGER NOT NULL REFERENCES \"user\"(id),
-                    meeting_id INTEGER NOT NULL REFERENCES meeting(id),
-                    PRIMARY KEY (user_id, meeting_id)
-                )
-            """))
-            
-            db.session.execute(text("""
-                CREATE TABLE IF NOT EXISTS event (
-                    id SERIAL PRIMARY KEY,
-                    title VARCHAR(100) NOT NULL,
-                    date VARCHAR(20) NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            
-            db.session.execute(text("""
-                CREATE TABLE IF NOT EXISTS event_attendees (
-                    user_id INTEGER NOT NULL REFERENCES \"user\"(id),
-                    event_id INTEGER NOT NULL REFERENCES event(id),
-                    PRIMARY KEY (user_id, event_id)
-                )
-            """))
-            
-            db.session.commit()
-            print("Successfully verified/added all missing columns via raw SQL fallback.")
-        except Exception as e2:
-            db.session.rollback()
-            print(f"Raw SQL fallback failed: {e2}")
-            
+        if startup == 'upgrade':
+            try:
+                schema.upgrade_schema()
+            except Exception as e:
+                print(f"Auto-upgrade failed: {e}")
+        elif startup in ('check', 'strict'):
+            try:
+                schema.check_schema(strict=startup == 'strict')
+            except SQLAlchemyError as e:
+                print(f"Schema check failed: {e}")
+
+        # Build the member typeahead index now rather than on the first keystroke; CLI commands don't need it
+        if click.get_current_context(silent=True) is None:
+            try:
+                member_index.rebuild()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                print(f"Typeahead index not built: {e}")
     
     CORS(app) # Enable CORS for all routes
 
@@ -121,6 +87,18 @@ def create_app():
     app.register_blueprint(learning_bp, url_prefix='/api/learning')
     app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
     app.register_blueprint(search_bp, url_prefix='/api/search')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+    app.register_blueprint(sync_bp, url_prefix='/api/sync')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+
+    register_commands(app)
+    if app.config['SQL_STATS']:
+        sql_stats.init_app(app)
+
+    # Start sending now, so mail queued or backing off before a restart goes out without new traffic
+    if app.config['MAIL_OUTBOX_INLINE_WORKER'] and click.get_current_context(silent=True) is None:
+        from backend.utils import email_outbox
+        email_outbox.get_worker(app).start()
 
     @app.route('/', methods=['GET'])
     def index():
@@ -128,7 +106,5 @@ def create_app():
     
     return app
 
-app = create_app()
-
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    create_app().run(host='0.0.0.0', port=5000, debug=False)
@@ -0,0 +1,82 @@
+"""Shared helpers for the backend benchmark scripts.
+
+Run them from the repository root, e.g. ``python -m backend.benchmarks.engagement``.
+Each script builds the app against a throwaway SQLite database unless
+DATABASE_URL is already set.
+"""
+import os
+import time
+import datetime
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+
+def bench_app():
+    # Config reads DATABASE_URL at import time, so set it before importing the app
+    if not os.getenv('DATABASE_URL'):
+        fd, path = tempfile.mkstemp(prefix='bench_', suffix='.db')
+        os.close(fd)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    # The outbox worker's polling would show up in count_queries(); benchmarks that send mail start it themselves
+    os.environ.setdefault('MAIL_OUTBOX_INLINE_WORKER', 'False')
+
+    from flask import Flask
+    from flask_migrate import stamp
+    from backend.config.config import Config
+    from backend.utils.extensions import db, migrate
+    import backend.models  # noqa: F401  register tables on db.metadata
+
+    # Build the schema from the models and stamp it, so the app's startup
+    # schema check sees a database at head
+    migrations_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'migrations'))
+    schema_app = Flask(__name__)
+    schema_app.config.from_object(Config)
+    db.init_app(schema_app)
+    migrate.init_app(schema_app, db, directory=migrations_dir)
+    with schema_app.app_context():
+        db.create_all()
+        stamp(directory=migrations_dir)
+
+    from backend.app import create_app
+    return create_app()
+
+
+def auth_headers(app, user_id, role='member'):
+    import jwt
+    token = jwt.encode({
+        'user_id': str(user_id),
+        'role': role,
+        'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+    }, app.config['SECRET_KEY'], algorithm='HS256')
+    return {'Authorization': f'Bearer {token}'}
+
+
+@contextmanager
+def count_queries(engine):
+    """Count statements sent to the database inside the block."""
+    from sqlalchemy import event
+
+    stats = {'queries': 0, 'seconds': 0.0}
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        stats['queries'] += 1
+
+    event.listen(engine, 'before_cursor_execute', before_execute)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats['seconds'] = time.perf_counter() - start
+        event.remove(engine, 'before_cursor_execute', before_execute)
+
+
+def measure(label, fn):
+    """Run fn once and print its wall time and peak Python memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {elapsed * 1000:10.1f} ms   peak {peak / 1024 / 1024:8.1f} MiB")
@@ -0,0 +1,73 @@
+"""Per-request cost of token_required: full User load vs the cached principal.
+
+    python -m backend.benchmarks.auth_overhead [--requests 2000] [--photo-kb 2048]
+
+The "before" numbers replay the old decorator (decode the JWT, then
+User.query.get, which drags the base64 photo along). The session is reset
+between calls, as it is between real requests.
+"""
+import time
+import argparse
+from functools import wraps
+from backend.benchmarks import bench_app, auth_headers
+
+
+def old_token_required(f):
+    import jwt
+    from flask import request, current_app
+    from backend.models import User
+
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.headers['Authorization'].split(" ")[1]
+        data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
+        return f(User.query.get(data['user_id']), *args, **kwargs)
+    return decorated
+
+
+def measure(app, db, headers, handler, requests, before_each=None):
+    start = time.perf_counter()
+    for _ in range(requests):
+        if before_each:
+            before_each()
+        with app.test_request_context('/', headers=headers):
+            handler()
+        db.session.remove()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--photo-kb', type=int, default=2048, help='size of the stored profile photo')
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.utils.auth import token_required, principal_cache
+    from backend.models import User
+
+    def view(current_user):
+        return current_user.id
+
+    with app.app_context():
+        user = User(name='Member', email='member@example.com', password='x', role='member',
+                    photo='data:image/png;base64,' + 'A' * (args.photo_kb * 1024))
+        db.session.add(user)
+        db.session.commit()
+        headers = auth_headers(app, user.id)
+        db.session.remove()
+
+        results = [
+            ('before (User.query.get)', measure(app, db, headers, old_token_required(view), args.requests)),
+            ('after, cache miss', measure(app, db, headers, token_required(view), args.requests, principal_cache.clear)),
+            ('after, cache hit', measure(app, db, headers, token_required(view), args.requests)),
+        ]
+
+    print(f"token_required overhead, {args.photo_kb} KiB photo, {args.requests} requests:")
+    for label, micros in results:
+        print(f"  {label:<24} {micros:10.1f} us/request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Wall time and peak memory of POST /api/notifications/broadcast.
+
+    python -m backend.benchmarks.broadcast [--recipients 50000]
+
+The "before" numbers replay the old fan-out (one Notification object per
+member added to the session, body copied into every row). Email sending is
+suppressed; only preparing the batches is measured.
+"""
+import os
+import argparse
+from backend.benchmarks import bench_app, auth_headers, measure
+
+SUBJECT = 'Chapter meeting moved'
+CONTENT = '<p>' + 'This week the chapter meeting moves to the community hall. ' * 40 + '</p>'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--recipients', type=int, default=50000)
+    args = parser.parse_args()
+
+    os.environ['MAIL_SUPPRESS_SEND'] = 'True'
+    app = bench_app()
+    app.config['MAIL_USERNAME'] = app.config['MAIL_USERNAME'] or 'chapter@example.com'
+    from sqlalchemy import insert, delete, func
+    from backend.utils.extensions import db
+    from backend.models import User, Notification, Broadcast
+
+    with app.app_context():
+        admin = User(name='Admin', email='admin@example.com', password='x', role='admin')
+        db.session.add(admin)
+        db.session.commit()
+        admin_id = admin.id
+        print(f"Seeding {args.recipients} members...")
+        for start in range(0, args.recipients - 1, 10000):
+            db.session.execute(insert(User), [
+                {'name': f'Member {i}', 'email': f'member{i}@example.com', 'password': 'x', 'role': 'member'}
+                for i in range(start, min(start + 10000, args.recipients - 1))
+            ])
+        db.session.commit()
+        db.session.remove()
+
+        def old_fan_out():
+            email_list = []
+            for user in User.query.all():
+                db.session.add(Notification(
+                    user_id=user.id, type='broadcast', subject=SUBJECT, content=CONTENT,
+                    message=f"{SUBJECT}: {CONTENT[:50]}...", read_status=False
+                ))
+                if user.email:
+                    email_list.append(user.email)
+            db.session.commit()
+            db.session.remove()
+
+        client = app.test_client()
+        headers = auth_headers(app, admin_id, 'admin')
+
+        def endpoint():
+            res = client.post('/api/notifications/broadcast', headers=headers,
+                              json={'subject': SUBJECT, 'content': CONTENT, 'recipientGroup': 'all'})
+            assert res.status_code == 200, res.data
+
+        measure('before: per-member ORM rows', old_fan_out)
+        db.session.execute(delete(Notification))
+        db.session.commit()
+        measure('POST /api/notifications/broadcast', endpoint)
+
+        rows = db.session.query(func.count(Notification.id)).scalar()
+        broadcasts = db.session.query(func.count(Broadcast.id)).scalar()
+        print(f"{rows} notification rows, {broadcasts} broadcast body stored")
+
+
+if __name__ == '__main__':
+    main()
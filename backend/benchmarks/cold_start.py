@@ -0,0 +1,67 @@
+"""Cold-start time of the WSGI entry point, as a fresh gunicorn worker sees it.
+
+    python -m backend.benchmarks.cold_start [--runs 10]
+
+Each run is a new interpreter that imports backend.wsgi against a database
+already at head. "before" replays the old boot: backend.app built the app at
+import and wsgi.py built it again, each running a full Alembic upgrade pass
+and, on PostgreSQL, the raw ALTER TABLE fallback. Point DATABASE_URL at a
+PostgreSQL database to see the DDL lock cost; on SQLite import time dominates.
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+CHILD = '''
+import sys, time
+start = time.perf_counter()
+import backend.wsgi
+if sys.argv[1] == 'before':
+    from flask_migrate import upgrade
+    from backend.utils.schema import MIGRATIONS_DIR
+    from sqlalchemy import text
+    from backend.utils.extensions import db
+    for _ in range(2):
+        with backend.wsgi.app.app_context():
+            upgrade(directory=MIGRATIONS_DIR)
+            if db.engine.dialect.name == 'postgresql':
+                for table, column in [('"user"', 'business_name VARCHAR(100)'), ('"user"', 'business_category VARCHAR(100)'),
+                                      ('"user"', 'services_offered TEXT'), ('"user"', 'photo TEXT'),
+                                      ('revenue', 'appreciation_message TEXT'), ('revenue', 'appreciation_reason TEXT'),
+                                      ('referral', "referral_type VARCHAR(20) DEFAULT 'Others'"),
+                                      ('meeting', 'organized_by INTEGER REFERENCES "user"(id)'),
+                                      ('meeting', "meeting_mode VARCHAR(20) DEFAULT 'Offline'"), ('meeting', 'meet_link VARCHAR(500)')]:
+                    db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column}'))
+                db.session.commit()
+print(time.perf_counter() - start)
+'''
+
+
+def boot(mode, env):
+    out = subprocess.run(
+        [sys.executable, '-c', CHILD, mode], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    from backend.benchmarks import bench_app
+    bench_app()  # creates the throwaway database at head and sets DATABASE_URL
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    env = dict(os.environ, PYTHONPATH=root, SCHEMA_STARTUP='check')
+    for mode in ('before', 'after'):
+        boot(mode, env)  # warm the filesystem cache and .pyc files
+        times = [boot(mode, env) for _ in range(args.runs)]
+        print(f"{mode:<7} median {statistics.median(times) * 1000:8.1f} ms   "
+              f"min {min(times) * 1000:8.1f} ms   max {max(times) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Bandwidth and server time of polled list endpoints, with and without If-None-Match.
+
+    python -m backend.benchmarks.conditional_get [--polls 500] [--write-every 100] [--notifications 500]
+
+Each route is polled --polls times. "before" is a client that ignores
+ETags and downloads the list every time; "after" sends the last ETag
+back, as a browser does with Cache-Control: no-cache. Every --write-every
+polls a row in the list changes, so "after" also shows the 200s that
+follow a write. The response cache is switched off to measure ETags alone.
+"""
+import time
+import random
+import argparse
+import statistics
+from sqlalchemy import insert
+from backend.benchmarks import bench_app, auth_headers
+from backend.benchmarks.referral_filters import seed
+
+
+def poll(client, url, headers, polls, write_every, write, conditional):
+    times, sent, statuses, etag = [], 0, {}, None
+    for i in range(polls):
+        if write_every and i and i % write_every == 0:
+            write()
+        request_headers = dict(headers, **({'If-None-Match': etag} if conditional and etag else {}))
+        start = time.perf_counter()
+        res = client.get(url, headers=request_headers)
+        times.append(time.perf_counter() - start)
+        sent += len(res.data)
+        statuses[res.status_code] = statuses.get(res.status_code, 0) + 1
+        etag = res.headers.get('ETag') or etag
+    return times, sent, statuses
+
+
+def report(label, times, sent, statuses, polls):
+    times = sorted(times)
+    print(f"  {label:<7} p50 {statistics.median(times) * 1000:7.2f} ms   p95 {times[int(len(times) * 0.95) - 1] * 1000:7.2f} ms   "
+          f"{sent / polls / 1024:8.1f} KiB per poll   {dict(sorted(statuses.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--polls', type=int, default=500)
+    parser.add_argument('--write-every', type=int, default=100)
+    parser.add_argument('--notifications', type=int, default=500)
+    parser.add_argument('--referrals', type=int, default=100000)
+    parser.add_argument('--meetings', type=int, default=300)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.models import User, Meeting, Notification, Referral, meeting_attendees
+    from backend.utils.response_cache import response_cache
+    response_cache.enabled = False
+
+    rng = random.Random(11)
+    with app.app_context():
+        admin_id, member_id, _ = seed(db, args.referrals)
+        user_ids = [u for u, in db.session.query(User.id)]
+        db.session.execute(insert(Notification), [
+            {'user_id': member_id, 'type': 'broadcast', 'message': f'Chapter update {i}: ' + 'x' * 80}
+            for i in range(args.notifications)
+        ])
+        db.session.execute(insert(Meeting), [
+            {'title': f'Meeting {i}', 'date': f'2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}', 'location': 'Nagarbhavi'}
+            for i in range(args.meetings)
+        ])
+        db.session.execute(insert(meeting_attendees), [
+            {'user_id': u, 'meeting_id': m}
+            for m, in db.session.query(Meeting.id) for u in rng.sample(user_ids, min(20, len(user_ids)))
+        ])
+        db.session.commit()
+        db.session.remove()
+
+    client = app.test_client()
+    admin, member = auth_headers(app, admin_id, 'admin'), auth_headers(app, member_id)
+
+    def read_notification():
+        with app.app_context():
+            n = Notification.query.filter_by(user_id=member_id, read_status=False).order_by(Notification.id.desc()).first()
+            n.read_status = True
+            db.session.commit()
+
+    def close_referral():
+        with app.app_context():
+            r = Referral.query.filter(Referral.status != 'Closed').order_by(Referral.created_at.desc()).first()
+            r.status = 'Closed'
+            db.session.commit()
+
+    def schedule_meeting():
+        client.post('/api/meetings/', headers=admin, json={'title': 'Extra', 'date': '2099-01-01'})
+
+    for label, url, headers, write in [
+        ('notifications (member)', '/api/notifications/', member, read_notification),
+        (f'referrals (admin, {args.referrals} rows)', '/api/referrals/', admin, close_referral),
+        ('meetings with participants', '/api/meetings/?include=participants', admin, schedule_meeting),
+        ('meetings, everything', '/api/meetings/?paginate=false', admin, schedule_meeting),
+    ]:
+        print(label)
+        report('before', *poll(client, url, headers, args.polls, args.write_every, write, False), args.polls)
+        report('after', *poll(client, url, headers, args.polls, args.write_every, write, True), args.polls)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Member dashboard: one list request per widget against one /api/dashboard/me.
+
+    python -m backend.benchmarks.dashboard [--referrals 20000] [--loads 100] [--workers 4]
+
+"before" is what a dashboard page has to do without the aggregate: GET
+referrals, revenue, meetings, events, notifications, guests and
+learning (first pages) - seven round trips from the browser.
+"after" is /api/dashboard/me with the response cache off, with its
+sections built inline and on --workers threads, then with the cache on
+and a write every tenth load. SQLite serialises readers on one file and
+a single CPU gives the threads nothing to overlap with, so the thread
+pool only pays off against a networked PostgreSQL.
+"""
+import time
+import random
+import argparse
+import datetime
+import statistics
+from sqlalchemy import insert
+from backend.benchmarks import bench_app, auth_headers, count_queries
+from backend.benchmarks.referral_filters import seed
+
+BEFORE = ['/api/referrals/', '/api/revenue/', '/api/meetings/', '/api/events/',
+          '/api/notifications/', '/api/guests/', '/api/learning/']
+
+
+def run(client, engine, headers, urls, loads, write=None):
+    times, sizes, queries = [], [], 0
+    for i in range(loads):
+        if write and i and i % 10 == 0:
+            write(i)
+        start = time.perf_counter()
+        with count_queries(engine) as stats:
+            responses = [client.get(url, headers=headers) for url in urls]
+        times.append(time.perf_counter() - start)
+        sizes.append(sum(len(res.data) for res in responses))
+        queries += stats['queries']
+        assert all(res.status_code == 200 for res in responses), [res.status_code for res in responses]
+    return times, sizes, queries / loads
+
+
+def report(label, times, sizes, queries):
+    times = sorted(times)
+    print(f"  {label:<20} p50 {statistics.median(times) * 1000:7.2f} ms   p95 {times[int(len(times) * 0.95) - 1] * 1000:7.2f} ms   "
+          f"{queries:5.1f} queries   {statistics.mean(sizes) / 1024:6.1f} KiB per load")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--referrals', type=int, default=20000)
+    parser.add_argument('--loads', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.config.config import Config
+    from backend.utils.extensions import db
+    from backend.models import Revenue, Meeting, Event, Notification, Guest, LearningCredit, meeting_attendees
+    from backend.utils.response_cache import response_cache
+
+    rng = random.Random(5)
+    today = datetime.date.today()
+    with app.app_context():
+        engine = db.engine
+        _, member_id, other_id = seed(db, args.referrals)
+        db.session.execute(insert(Revenue), [
+            {'amount': rng.randint(1, 500) * 100, 'member_id': rng.choice([member_id, other_id]),
+             'created_by': rng.choice([member_id, other_id]), 'date': f'2026-{i % 12 + 1:02d}-01'}
+            for i in range(500)
+        ])
+        db.session.execute(insert(Meeting), [
+            {'title': f'Meeting {i}', 'date': (today + datetime.timedelta(days=i - 150)).isoformat()} for i in range(300)
+        ])
+        db.session.execute(insert(Event), [
+            {'title': f'Event {i}', 'date': (today + datetime.timedelta(days=i - 50)).isoformat()} for i in range(100)
+        ])
+        db.session.execute(insert(meeting_attendees), [{'user_id': member_id, 'meeting_id': i} for i in range(1, 200, 2)])
+        db.session.execute(insert(Notification), [
+            {'user_id': member_id, 'type': 'broadcast', 'message': f'Chapter update {i}', 'read_status': i % 3 == 0}
+            for i in range(300)
+        ])
+        db.session.execute(insert(Guest), [{'name': f'Guest {i}', 'invited_by': member_id} for i in range(40)])
+        db.session.execute(insert(LearningCredit), [
+            {'member_id': member_id, 'topic': f'Topic {i}', 'duration_hours': 1.5} for i in range(60)
+        ])
+        db.session.commit()
+        db.session.remove()
+
+    client = app.test_client()
+    headers = auth_headers(app, member_id)
+
+    def learn(i):
+        res = client.post('/api/learning/', headers=headers, json={'topic': f'Bench {i}', 'duration_hours': 1})
+        assert res.status_code == 201, res.data
+
+    print(f"member dashboard ({args.loads} loads, {args.referrals} referrals in the chapter)")
+    response_cache.enabled = False
+    report('before', *run(client, engine, headers, BEFORE, args.loads))
+    Config.DASHBOARD_WORKERS = 0
+    report('after, inline', *run(client, engine, headers, ['/api/dashboard/me'], args.loads))
+    Config.DASHBOARD_WORKERS = args.workers
+    report(f'after, {args.workers} threads', *run(client, engine, headers, ['/api/dashboard/me'], args.loads))
+
+    response_cache.enabled = True
+    hours = client.get('/api/dashboard/me', headers=headers).json['counts']['learning_hours']
+    report('after, cached', *run(client, engine, headers, ['/api/dashboard/me'], args.loads, learn))
+    expected = hours + (args.loads - 1) // 10
+    assert client.get('/api/dashboard/me', headers=headers).json['counts']['learning_hours'] == expected, 'stale dashboard'
+
+
+if __name__ == '__main__':
+    main()
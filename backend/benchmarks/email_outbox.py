@@ -0,0 +1,134 @@
+"""Drain the email outbox into a local aiosmtpd server.
+
+    pip install aiosmtpd
+    python -m backend.benchmarks.email_outbox [--emails 1000] [--fail-every 0]
+
+Queues --emails messages through send_email, runs the worker pool against an
+in-process SMTP stand-in and reports throughput, SMTP connections opened and
+latency. --fail-every N makes the server reject every Nth message with a
+temporary error to exercise retries. The "before" line replays the old
+thread-and-connection-per-email sender against the same server.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+
+class CountingHandler:
+    def __init__(self, fail_every):
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.connections = 0
+        self.rejected = 0
+        self.seen = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        with self.lock:
+            self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        with self.lock:
+            self.seen += 1
+            if self.fail_every and self.seen % self.fail_every == 0:
+                self.rejected += 1
+                return '451 Try again later'
+            self.messages += 1
+        return '250 Message accepted for delivery'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--emails', type=int, default=1000)
+    parser.add_argument('--fail-every', type=int, default=0)
+    parser.add_argument('--port', type=int, default=8025)
+    args = parser.parse_args()
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        print('aiosmtpd is not installed: pip install aiosmtpd')
+        sys.exit(2)
+
+    # Mail settings are read when the app is created, so point them at the stand-in first
+    os.environ.update({
+        'MAIL_SERVER': '127.0.0.1',
+        'MAIL_PORT': str(args.port),
+        'MAIL_USE_TLS': 'False',
+        'MAIL_USERNAME': 'chapter@example.com',
+        'MAIL_PASSWORD': '',
+        'MAIL_OUTBOX_INLINE_WORKER': 'False',
+        'MAIL_OUTBOX_RETRY_SECONDS': '0.2',
+        'MAIL_OUTBOX_POLL_SECONDS': '0.1',
+    })
+    handler = CountingHandler(args.fail_every)
+    controller = Controller(handler, hostname='127.0.0.1', port=args.port)
+    controller.start()
+
+    from backend.benchmarks import bench_app
+    app = bench_app()
+    from flask_mail import Message
+    from backend.utils.extensions import db, mail
+    from backend.utils import email_outbox
+    from backend.utils.email_service import send_email
+
+    try:
+        with app.app_context():
+            # Old sender: one thread and one SMTP connection per email
+            before = min(args.emails, 200)
+            start = time.perf_counter()
+            threads = []
+            for i in range(before):
+                msg = Message(f'Old {i}', sender='chapter@example.com', recipients=[f'member{i}@example.com'])
+                msg.html = '<p>Hello</p>'
+
+                def send(msg=msg):
+                    with app.app_context():
+                        try:
+                            mail.send(msg)
+                        except Exception:
+                            pass
+                threads.append(threading.Thread(target=send))
+                threads[-1].start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            print(f"before: {before} emails, {before} threads, {handler.connections} connections, "
+                  f"{before / elapsed:7.1f} emails/s")
+
+            handler.messages = handler.connections = handler.seen = handler.rejected = 0
+            start = time.perf_counter()
+            for i in range(args.emails):
+                send_email(f'Referral {i}', [f'member{i}@example.com'], '<p>You have a new referral!</p>')
+            queued = time.perf_counter() - start
+
+            worker = email_outbox.get_worker(app)
+            start = time.perf_counter()
+            worker.start()
+            while True:
+                stats = email_outbox.queue_stats()
+                db.session.remove()
+                if stats['pending'] == 0 and stats['sending'] == 0:
+                    break
+                time.sleep(0.05)
+            elapsed = time.perf_counter() - start
+            worker.stop()
+
+            stats = email_outbox.queue_stats()
+            print(f"after:  {args.emails} emails queued in {queued * 1000:.0f} ms, "
+                  f"{worker.size} worker(s), {handler.connections} connections, "
+                  f"{args.emails / elapsed:7.1f} emails/s")
+            print(f"        delivered {handler.messages}, rejected {handler.rejected}, "
+                  f"retried {stats['retried']}, failed {stats['failed']}")
+            print(f"        queue latency p50 {stats['latency_p50_seconds']}s p95 {stats['latency_p95_seconds']}s, "
+                  f"SMTP p50 {stats['smtp_p50_seconds']}s")
+    finally:
+        controller.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Query count of /api/analytics/engagement as the chapter grows.
+
+    python -m backend.benchmarks.engagement [--sizes 100,500,2000]
+
+Exits non-zero if the number of statements per request is not flat.
+"""
+import sys
+import random
+import argparse
+from backend.benchmarks import bench_app, auth_headers, count_queries
+
+
+def seed_members(db, start, count):
+    from sqlalchemy import insert
+    from backend.models import User, Referral, OneToOne, meeting_attendees, event_attendees, Meeting, Event
+
+    users = [{
+        'name': f'Member {i}',
+        'email': f'member{i}@example.com',
+        'password': 'x',
+        'role': 'member',
+        'business_category': random.choice(['Software', 'Legal', 'Finance', 'Retail'])
+    } for i in range(start, start + count)]
+    db.session.execute(insert(User), users)
+
+    ids = [u.id for u in User.query.with_entities(User.id).filter(User.email.in_([u['email'] for u in users]))]
+    meeting_ids = [m.id for m in Meeting.query.with_entities(Meeting.id)]
+    event_ids = [e.id for e in Event.query.with_entities(Event.id)]
+
+    referrals, otos, mtg, evt = [], [], set(), set()
+    for uid in ids:
+        for _ in range(random.randint(0, 6)):
+            referrals.append({'from_member_id': uid, 'to_member_id': random.choice(ids), 'contact_name': 'Lead', 'status': 'Open'})
+        for _ in range(random.randint(0, 2)):
+            otos.append({'member_id': uid, 'with_member_id': random.choice(ids)})
+        mtg.update((uid, m) for m in random.sample(meeting_ids, random.randint(0, 5)))
+        evt.update((uid, e) for e in random.sample(event_ids, random.randint(0, 3)))
+
+    if referrals:
+        db.session.execute(insert(Referral), referrals)
+    if otos:
+        db.session.execute(insert(OneToOne), otos)
+    if mtg:
+        db.session.execute(insert(meeting_attendees), [{'user_id': u, 'meeting_id': m} for u, m in mtg])
+    if evt:
+        db.session.execute(insert(event_attendees), [{'user_id': u, 'event_id': e} for u, e in evt])
+    db.session.commit()
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='100,500,2000')
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.utils import member_stats
+    from backend.utils.auth import principal_cache
+    from backend.models import Meeting, Event
+
+    random.seed(42)
+    with app.app_context():
+        db.session.add_all([Meeting(title=f'Meeting {i}', date='2026-01-01') for i in range(20)])
+        db.session.add_all([Event(title=f'Event {i}', date='2026-01-01') for i in range(10)])
+        db.session.commit()
+
+        client = app.test_client()
+        seeded = 0
+        results = []
+        headers = None
+        for size in sizes:
+            ids = seed_members(db, seeded, size - seeded)
+            seeded = size
+            member_stats.rebuild()
+            headers = headers or auth_headers(app, ids[0])
+            db.session.remove()
+            # Count the principal lookup on every size, not just the first request
+            principal_cache.clear()
+
+            with count_queries(db.engine) as stats:
+                res = client.get('/api/analytics/engagement', headers=headers)
+            assert res.status_code == 200, res.data
+            assert len(res.get_json()) == size
+            results.append((size, stats['queries'], stats['seconds']))
+            print(f"{size:>6} members: {stats['queries']:>3} queries, {stats['seconds'] * 1000:8.1f} ms")
+
+    query_counts = {q for _, q, _ in results}
+    if len(query_counts) != 1:
+        print('FAIL: query count grows with member count')
+        sys.exit(1)
+    print('OK: query count is flat')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Fail if a list route's queries fall back to a sequential scan on a large table.
+
+    python -m backend.benchmarks.explain_check [--rows 100000]
+
+Seeds a large dataset, calls every parameterless GET route under /api as a
+member and as an admin, captures the SELECTs each one issues and runs
+EXPLAIN on them (EXPLAIN QUERY PLAN on SQLite). Works against SQLite and
+PostgreSQL via DATABASE_URL.
+"""
+import re
+import sys
+import random
+import argparse
+import datetime
+from sqlalchemy import event, insert, text
+from backend.benchmarks import bench_app, auth_headers
+
+# Tables that grow with activity; the user/meeting/event tables stay chapter-sized
+LARGE_TABLES = {
+    'referral', 'revenue', 'notification', 'guest', 'learning_credit',
+    'one_to_one', 'meeting_attendees', 'event_attendees',
+}
+
+# Admin-only whole-table aggregates; scanning everything is what they are for
+ALLOWED_SCANS = {
+    ('admin', 'revenue.get_total_revenue'),
+    ('admin', 'revenue.get_revenue_summary'),
+}
+
+SQLITE_SCAN = re.compile(r'\bSCAN (\w+)(?! USING)(?:\s|$)')
+POSTGRES_SCAN = re.compile(r'Seq Scan on "?(\w+)"?')
+
+
+def seed(db, rows):
+    from backend.models import (User, Referral, Revenue, Notification, Guest, LearningCredit,
+                                OneToOne, Meeting, Event, meeting_attendees, event_attendees)
+
+    admin = User(name='Admin', email='admin@example.com', password='x', role='admin')
+    db.session.add(admin)
+    db.session.execute(insert(User), [
+        {'name': f'Member {i}', 'email': f'member{i}@example.com', 'password': 'x', 'role': 'member'}
+        for i in range(2000)
+    ])
+    db.session.add_all([Meeting(title=f'Meeting {i}', date='2026-01-01') for i in range(50)])
+    db.session.add_all([Event(title=f'Event {i}', date='2026-01-01') for i in range(50)])
+    db.session.commit()
+
+    member_ids = [u.id for u in User.query.with_entities(User.id).filter_by(role='member')]
+    now = datetime.datetime.utcnow()
+
+    def when():
+        return now - datetime.timedelta(minutes=random.randint(0, 3 * 365 * 24 * 60))
+
+    def bulk(model, make):
+        for start in range(0, rows, 20000):
+            db.session.execute(insert(model), [make() for _ in range(min(20000, rows - start))])
+
+    bulk(Referral, lambda: {'from_member_id': random.choice(member_ids), 'to_member_id': random.choice(member_ids),
+                            'contact_name': 'Lead', 'status': 'Open', 'created_at': when()})
+    bulk(Revenue, lambda: {'amount': 1000.0, 'member_id': random.choice(member_ids), 'created_by': random.choice(member_ids),
+                           'date': when().strftime('%Y-%m-%d'), 'created_at': when()})
+    bulk(Notification, lambda: {'user_id': random.choice(member_ids), 'message': 'Hello', 'created_at': when()})
+    bulk(Guest, lambda: {'name': 'Guest', 'invited_by': random.choice(member_ids), 'created_at': when()})
+    bulk(LearningCredit, lambda: {'member_id': random.choice(member_ids), 'topic': 'Sales', 'created_at': when()})
+    bulk(OneToOne, lambda: {'member_id': random.choice(member_ids), 'with_member_id': random.choice(member_ids)})
+    attendance = {(random.choice(member_ids), random.randint(1, 50)) for _ in range(min(rows, 50000))}
+    db.session.execute(insert(meeting_attendees), [{'user_id': u, 'meeting_id': m} for u, m in attendance])
+    db.session.execute(insert(event_attendees), [{'user_id': u, 'event_id': e} for u, e in attendance])
+    db.session.commit()
+    return admin.id, member_ids[0]
+
+
+def list_routes(app):
+    for rule in app.url_map.iter_rules():
+        if 'GET' in rule.methods and not rule.arguments and rule.rule.startswith('/api/'):
+            yield rule.endpoint, rule.rule
+
+
+def explain(db, statement, parameters):
+    with db.engine.connect() as conn:
+        if db.engine.dialect.name == 'sqlite':
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+            return [r[-1] for r in rows], SQLITE_SCAN
+        rows = conn.exec_driver_sql('EXPLAIN ' + statement, parameters).all()
+        return [r[0] for r in rows], POSTGRES_SCAN
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000, help='rows per large table')
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+
+    random.seed(11)
+    with app.app_context():
+        print(f"Seeding {args.rows} rows per large table...")
+        admin_id, member_id = seed(db, args.rows)
+        with db.engine.begin() as conn:
+            conn.execute(text('ANALYZE'))
+
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().upper().startswith('SELECT'):
+                captured.append((statement, parameters))
+
+        client = app.test_client()
+        failures = 0
+        for role, user_id in [('member', member_id), ('admin', admin_id)]:
+            headers = auth_headers(app, user_id, role)
+            for endpoint, path in sorted(list_routes(app)):
+                captured.clear()
+                event.listen(db.engine, 'before_cursor_execute', capture)
+                try:
+                    res = client.get(path, headers=headers)
+                finally:
+                    event.remove(db.engine, 'before_cursor_execute', capture)
+                if res.status_code >= 400:
+                    continue
+
+                seen = set()
+                route_ok = True
+                for statement, parameters in captured:
+                    if statement in seen:
+                        continue
+                    seen.add(statement)
+                    plan, pattern = explain(db, statement, parameters)
+                    scanned = {m for line in plan for m in pattern.findall(line)} & LARGE_TABLES
+                    if scanned and (role, endpoint) not in ALLOWED_SCANS:
+                        failures += 1
+                        route_ok = False
+                        print(f"FAIL {role:<6} {path}: sequential scan on {', '.join(sorted(scanned))}")
+                        print('    ' + ' '.join(statement.split())[:300])
+                        for line in plan:
+                            print(f"      {line}")
+                if route_ok:
+                    print(f"ok   {role:<6} {path} ({len(seen)} distinct statements)")
+
+    if failures:
+        print(f"{failures} statement(s) fall back to sequential scans")
+        sys.exit(1)
+    print('OK: every list route is index-backed')
+
+
+if __name__ == '__main__':
+    main()
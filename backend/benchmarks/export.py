@@ -0,0 +1,56 @@
+"""Peak memory of exporting referrals: streamed CSV against the full JSON list.
+
+    python -m backend.benchmarks.export [--rows 50000 200000]
+
+For each size, "before" is what admins did to export: GET
+/api/referrals?paginate=false, which builds every ORM object and then
+every dict. "after" consumes /api/export/referrals chunk by chunk, the way
+a browser download does. The streamed peak should not grow with --rows.
+"""
+import argparse
+from sqlalchemy import delete
+from backend.benchmarks import bench_app, auth_headers, measure
+from backend.benchmarks.referral_filters import seed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[50000, 200000])
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.models import Referral, User
+
+    client = app.test_client()
+    for rows in args.rows:
+        with app.app_context():
+            db.session.execute(delete(Referral))
+            db.session.execute(delete(User))
+            db.session.commit()
+            admin_id, _, _ = seed(db, rows)
+            db.session.remove()
+        headers = auth_headers(app, admin_id, 'admin')
+
+        def full_list():
+            res = client.get('/api/referrals/', query_string={'paginate': 'false'}, headers=headers)
+            assert len(res.json) == rows
+
+        def streamed(fmt):
+            def run():
+                res = client.get('/api/export/referrals', query_string={'format': fmt}, headers=headers, buffered=False)
+                lines = 0
+                for chunk in res.response:
+                    lines += chunk.count(b'\n')
+                res.close()
+                assert lines >= rows, lines
+            return run
+
+        print(f"{rows} referrals")
+        measure('  before: list ?paginate=false', full_list)
+        measure('  after:  /api/export csv', streamed('csv'))
+        measure('  after:  /api/export ndjson', streamed('ndjson'))
+
+
+if __name__ == '__main__':
+    main()
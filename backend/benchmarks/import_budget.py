@@ -0,0 +1,48 @@
+"""Import-time budget for the WSGI entry point.
+
+    python -m backend.benchmarks.import_budget [--runs 7] [--budget-ms 900]
+
+Imports backend.wsgi in fresh interpreters under -X importtime, eagerly
+(LAZY_IMPORTS=False, the old boot) and lazily, and prints the median and the
+packages only the eager boot pays for. Exits 1 if the lazy median is over
+--budget-ms, so it can run in CI next to the build.
+"""
+import os
+import sys
+import argparse
+import statistics
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--budget-ms', type=float, default=900)
+    args = parser.parse_args()
+
+    from backend.benchmarks import bench_app
+    from backend.utils.startup_profile import import_profile
+    bench_app()  # creates the throwaway database at head and sets DATABASE_URL
+
+    results, medians = {}, {}
+    for mode, lazy in (('before', 'False'), ('after', 'True')):
+        env = dict(os.environ, LAZY_IMPORTS=lazy, SCHEMA_STARTUP='check')
+        import_profile(env=env)  # warm the filesystem cache and .pyc files
+        runs = [import_profile(env=env) for _ in range(args.runs)]
+        totals = [total for total, _ in runs]
+        results[mode] = runs[totals.index(sorted(totals)[len(totals) // 2])][1]
+        medians[mode] = statistics.median(totals)
+        print(f"{mode:<7} median {medians[mode]:8.1f} ms   "
+              f"min {min(totals):8.1f} ms   max {max(totals):8.1f} ms")
+
+    deferred = sorted(set(results['before']) - set(results['after']), key=lambda name: -results['before'][name])
+    print('deferred: ' + ', '.join(f"{name} {results['before'][name]:.1f} ms" for name in deferred))
+
+    median = medians['after']
+    if median > args.budget_ms:
+        print(f"over budget: {median:.1f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"within budget: {median:.1f} ms <= {args.budget_ms:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""A login storm: N members signing in at once, against a threaded server.
+
+    python -m backend.benchmarks.login_storm [--logins 200] [--concurrency 50] [--rounds 10]
+
+"before" hashes inline on the request threads with no limit, as
+bcrypt.check_password_hash did; "after" goes through utils/passwords.hasher
+with its configured workers, queue and wait. While the storm runs a probe
+thread hits GET / to show how cheap requests fare next to it. Sign-ins the
+hasher sheds come back as 503 with Retry-After and are counted, not retried.
+"""
+import os
+import json
+import time
+import argparse
+import threading
+import statistics
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from backend.benchmarks import bench_app
+
+
+def percentile(times, pct):
+    times = sorted(times)
+    return times[max(0, int(len(times) * pct) - 1)] if times else 0.0
+
+
+def request(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as res:
+            res.read()
+            status = res.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def storm(base, logins, concurrency):
+    stop = threading.Event()
+    probes = []
+
+    def probe():
+        while not stop.is_set():
+            probes.append(request(base + '/')[1])
+            time.sleep(0.02)
+
+    prober = threading.Thread(target=probe)
+    prober.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(
+            lambda i: request(base + '/api/auth/login', {'email': f'storm{i}@example.com', 'password': f'secret-{i}'}),
+            range(logins)
+        ))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+    return results, probes, elapsed
+
+
+def report(label, results, probes, elapsed):
+    ok = [t for status, t in results if status == 200]
+    shed = sum(1 for status, _ in results if status == 503)
+    other = len(results) - len(ok) - shed
+    print(f"{label:<7} {len(ok):4d} ok in {elapsed:6.1f} s   login p50 {statistics.median(ok) * 1000 if ok else 0:7.0f} ms   "
+          f"p99 {percentile(ok, 0.99) * 1000:7.0f} ms   503s {shed:4d}   other {other}   "
+          f"GET / p99 {percentile(probes, 0.99) * 1000:6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args()
+
+    app = bench_app()
+    app.config['BCRYPT_LOG_ROUNDS'] = args.rounds
+    from werkzeug.serving import make_server
+    from backend.utils.extensions import db
+    from backend.models import User
+    from backend.routes import auth_routes
+    from backend.utils.passwords import PasswordHasher, hasher
+
+    with app.app_context():
+        passwords = hasher.hash_many([f'secret-{i}' for i in range(args.logins)], rounds=args.rounds)
+        db.session.add_all([User(name=f'Storm {i}', email=f'storm{i}@example.com', password=pw)
+                            for i, pw in enumerate(passwords)])
+        db.session.commit()
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+    print(f"bcrypt rounds {args.rounds}, {os.cpu_count()} CPU(s), {args.logins} logins, {args.concurrency} at a time")
+
+    auth_routes.hasher = PasswordHasher(workers=0, queue=args.logins, wait=None)
+    report('before', *storm(base, args.logins, args.concurrency))
+
+    auth_routes.hasher = hasher
+    request(base + '/api/auth/login', {'email': 'storm0@example.com', 'password': 'secret-0'})  # start the pool
+    report('after', *storm(base, args.logins, args.concurrency))
+    print(f"hasher: {hasher.stats()}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Query-count regression check for GET /api/meetings.
+
+    python -m backend.benchmarks.meetings [--meetings 500 --attendees 50]
+
+Listing must stay at a fixed number of statements however many meetings
+and attendees there are: the @query_budget declared on get_meetings
+(auth lookup, meeting page, one attendance query).
+"""
+import sys
+import random
+import argparse
+from sqlalchemy import insert
+from backend.benchmarks import bench_app, auth_headers, count_queries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--meetings', type=int, default=500)
+    parser.add_argument('--attendees', type=int, default=50)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.models import User, Meeting, meeting_attendees
+    from backend.utils.sql_stats import budget_of
+
+    budget = budget_of(app.view_functions['meetings.get_meetings'])
+
+    random.seed(5)
+    with app.app_context():
+        db.session.execute(insert(User), [
+            {'name': f'Member {i}', 'email': f'member{i}@example.com', 'password': 'x'}
+            for i in range(max(args.attendees * 2, 100))
+        ])
+        db.session.execute(insert(Meeting), [
+            {'title': f'Meeting {i}', 'date': f'2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}'}
+            for i in range(args.meetings)
+        ])
+        user_ids = [u.id for u in User.query.with_entities(User.id)]
+        meeting_ids = [m.id for m in Meeting.query.with_entities(Meeting.id)]
+        db.session.execute(insert(meeting_attendees), [
+            {'user_id': u, 'meeting_id': m}
+            for m in meeting_ids for u in random.sample(user_ids, args.attendees)
+        ])
+        db.session.commit()
+        db.session.remove()
+
+        client = app.test_client()
+        headers = auth_headers(app, user_ids[0])
+        failed = False
+        for label, query in [
+            ('all meetings with participants', '?paginate=false&include=participants'),
+            ('all meetings, counts only', '?paginate=false'),
+            ('first page with participants', '?include=participants'),
+            ('first page, counts only', ''),
+        ]:
+            with count_queries(db.engine) as stats:
+                res = client.get(f'/api/meetings/{query}', headers=headers)
+            assert res.status_code == 200, res.data
+            body = res.get_json()
+            items = body if isinstance(body, list) else body['items']
+            assert all(m['attendee_count'] == args.attendees for m in items)
+            if 'include=participants' in query:
+                assert all(len(m['participants']) == args.attendees for m in items)
+
+            ok = stats['queries'] <= budget
+            failed = failed or not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {label:<32} {len(items):>4} meetings  "
+                  f"{stats['queries']:>3} queries  {stats['seconds'] * 1000:8.1f} ms")
+
+    if failed:
+        print(f"FAIL: more than {budget} queries per listing")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Onboarding a chapter: /api/users/import against one /api/auth/register per member.
+
+    python -m backend.benchmarks.member_import [--members 10000] [--rounds 6] [--sample 200]
+
+bcrypt dominates both, so --rounds sets BCRYPT_LOG_ROUNDS for the run (the
+production default is 12; each extra round doubles the hashing time). The
+"before" rate is measured on --sample registrations and extrapolated to
+--members. Hashing in the import uses one process per CPU.
+"""
+import os
+import io
+import csv
+import time
+import argparse
+from backend.benchmarks import bench_app, auth_headers
+
+
+def members_csv(count, offset=0):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['name', 'email', 'password', 'business_category', 'phone'])
+    for i in range(offset, offset + count):
+        writer.writerow([f'Member {i}', f'member{i}@example.com', f'secret-{i}', 'Travel', f'98{i:08d}'])
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=6)
+    parser.add_argument('--sample', type=int, default=200)
+    args = parser.parse_args()
+
+    app = bench_app()
+    app.config['BCRYPT_LOG_ROUNDS'] = args.rounds
+    from backend.utils.extensions import db
+    from backend.models import User
+
+    with app.app_context():
+        admin = User(name='Admin', email='admin@example.com', password='x', role='admin')
+        db.session.add(admin)
+        db.session.commit()
+        admin_id = admin.id
+
+    client = app.test_client()
+    print(f"bcrypt rounds {args.rounds}, {os.cpu_count()} CPU(s)")
+
+    start = time.perf_counter()
+    for i in range(args.sample):
+        res = client.post('/api/auth/register', json={
+            'name': f'Registered {i}', 'email': f'registered{i}@example.com', 'password': f'secret-{i}',
+            'business_category': 'Travel', 'phone': f'97{i:08d}'
+        })
+        assert res.status_code == 201, res.get_data(as_text=True)
+    per_member = (time.perf_counter() - start) / args.sample
+    print(f"before: {per_member * 1000:6.2f} ms per register call, "
+          f"~{per_member * args.members:7.1f} s for {args.members} members")
+
+    body = members_csv(args.members)
+    start = time.perf_counter()
+    res = client.post('/api/users/import', data=body, content_type='text/csv',
+                      headers=auth_headers(app, admin_id, 'admin'))
+    elapsed = time.perf_counter() - start
+    assert res.status_code == 201, res.get_data(as_text=True)
+    print(f"after:  {elapsed:7.1f} s to import {res.json['created']} members "
+          f"({elapsed / args.members * 1000:.2f} ms each), {res.json['failed']} failed")
+
+    # Every row again: all should come back as already registered, without hashing anything
+    start = time.perf_counter()
+    res = client.post('/api/users/import', data=body, content_type='text/csv',
+                      headers=auth_headers(app, admin_id, 'admin'))
+    print(f"again:  {time.perf_counter() - start:7.2f} s to reject {res.json['failed']} duplicates")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Fail if a GET route runs more statements than its budget, or repeats one like an N+1.
+
+    python -m backend.benchmarks.query_budget [--rows 5000] [--default-budget 8]
+
+Seeds the explain_check dataset, calls every parameterless GET route under
+/api as a member and as an admin with the response cache off, and counts
+the statements each request runs (authentication included). Routes
+declare their budget with @query_budget(n) from backend.utils.sql_stats;
+the rest get --default-budget. A few query-string variants are called too.
+Each request runs under expect_queries(budget) with app.testing on, as a
+test would, so a declared budget is also enforced by the app itself. The
+same counts are available at runtime from /api/analytics/queries and the
+Server-Timing header.
+"""
+import sys
+import random
+import argparse
+from backend.benchmarks import bench_app, auth_headers
+from backend.benchmarks.explain_check import seed, list_routes
+
+# Variants whose statement count can differ from the bare route; unpaginated lists are where N+1s show
+EXTRA_PATHS = [
+    '/api/meetings/?include=participants&paginate=false',
+    '/api/events/?paginate=false',
+    '/api/referrals/?paginate=false',
+    '/api/notifications/?paginate=false',
+    '/api/analytics/?filter=lifetime',
+    '/api/analytics/engagement?status=Active,Growing',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000, help='rows per large table')
+    parser.add_argument('--default-budget', type=int, default=8)
+    args = parser.parse_args()
+
+    app = bench_app()
+    # Routes over their declared @query_budget raise QueryBudgetExceeded in testing mode
+    app.testing = True
+    from backend.utils.extensions import db
+    from backend.utils import sql_stats
+    from backend.utils.response_cache import response_cache
+    response_cache.enabled = False
+
+    random.seed(11)
+    with app.app_context():
+        admin_id, member_id = seed(db, args.rows)
+        db.session.remove()
+
+    client = app.test_client()
+    failures = 0
+    for role, user_id in [('member', member_id), ('admin', admin_id)]:
+        headers = auth_headers(app, user_id, role)
+        paths = sorted(list_routes(app)) + [(app.url_map.bind('').match(p.split('?')[0])[0], p) for p in EXTRA_PATHS]
+        for endpoint, path in paths:
+            budget = sql_stats.budget_of(app.view_functions[endpoint])
+            declared = budget is not None
+            budget = budget if declared else args.default_budget
+            try:
+                with sql_stats.expect_queries(budget) as stats:
+                    res = client.get(path, headers=headers)
+                over = False
+            except sql_stats.QueryBudgetExceeded:
+                over = True
+            else:
+                if res.status_code >= 400:
+                    continue
+
+            repeated = stats.repeated()
+            status = 'ok  '
+            if over or repeated:
+                failures += 1
+                status = 'FAIL'
+            print(f"{status} {role:<6} {path:<52} {stats.queries:3d} queries (budget {budget}{'' if declared else ', default'})"
+                  f"  {stats.seconds * 1000:7.1f} ms")
+            for statement, n in repeated.items():
+                print(f"      repeated {n}x: {sql_stats.squash(statement)[:200]}")
+
+    if failures:
+        print(f"{failures} route(s) over their query budget")
+        sys.exit(1)
+    print('OK: every GET route is within its query budget')
+
+
+if __name__ == '__main__':
+    main()
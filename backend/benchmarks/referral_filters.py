@@ -0,0 +1,153 @@
+"""Referral list filters at scale: duplicates, latency and query plans.
+
+    python -m backend.benchmarks.referral_filters [--rows 1000000]
+
+Seeds --rows referrals between 2000 members and requests the first page of
+/api/referrals with each filter combination, as an admin and as a member.
+"before" replays the old filtering (an OR join to "user" per filter) and
+counts the duplicate rows in its first 50 (Query uniqued them away, so
+pages came back short); "after" is the route. Every SELECT
+the route issues is EXPLAINed and the run fails if one scans the referral
+table without an index.
+"""
+import sys
+import time
+import random
+import argparse
+import datetime
+from sqlalchemy import event, insert, text, or_
+from backend.benchmarks import bench_app, auth_headers
+from backend.benchmarks.explain_check import explain
+
+CATEGORIES = ['Interior Design', 'Chartered Accountant', 'Real Estate', 'Travel', 'Insurance', 'Printing',
+              'Catering', 'Photography', 'Web Development', 'Dental Care', 'Legal Services', 'Event Planning']
+STATUSES = ['Open'] * 6 + ['Contacted'] * 2 + ['Closed', 'Lost']
+TYPES = ['Self', 'Others']
+
+
+def seed(db, rows):
+    from backend.models import User, Referral
+
+    rng = random.Random(17)
+    admin = User(name='Admin', email='admin@example.com', password='x', role='admin')
+    db.session.add(admin)
+    db.session.execute(insert(User), [
+        {'name': f'Member {i}', 'email': f'member{i}@example.com', 'password': 'x', 'role': 'member',
+         'business_category': CATEGORIES[i % len(CATEGORIES)]}
+        for i in range(2000)
+    ])
+    db.session.commit()
+    member_ids = [u.id for u in User.query.with_entities(User.id).filter_by(role='member')]
+    now = datetime.datetime.utcnow()
+    for start in range(0, rows, 20000):
+        db.session.execute(insert(Referral), [{
+            'from_member_id': rng.choice(member_ids), 'to_member_id': rng.choice(member_ids),
+            'contact_name': f'Lead {rng.randint(0, 99999)}', 'status': rng.choice(STATUSES),
+            'referral_type': rng.choice(TYPES),
+            'created_at': now - datetime.timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60)),
+        } for _ in range(min(20000, rows - start))])
+        db.session.commit()
+    return admin.id, member_ids[0], member_ids[1]
+
+
+def old_query(current_user_id, role, args):
+    """get_referrals as it was: an OR join to "user" for search and again for category."""
+    from backend.models import Referral, User
+
+    query = Referral.query
+    if args.get('search'):
+        query = query.join(User, or_(Referral.from_member_id == User.id, Referral.to_member_id == User.id), isouter=True).filter(
+            or_(Referral.contact_name.ilike(f"%{args['search']}%"), User.name.ilike(f"%{args['search']}%")))
+    if args.get('category'):
+        query = query.join(User, or_(Referral.from_member_id == User.id, Referral.to_member_id == User.id), isouter=True).filter(
+            User.business_category == args['category'])
+    if role != 'admin':
+        query = query.filter(or_(Referral.from_member_id == current_user_id, Referral.to_member_id == current_user_id))
+    return query.order_by(Referral.created_at.desc(), Referral.id.desc()).limit(50)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.models import Referral
+
+    with app.app_context():
+        start = time.perf_counter()
+        admin_id, member_id, other_id = seed(db, args.rows)
+        with db.engine.begin() as conn:
+            conn.execute(text('ANALYZE'))
+        print(f"seeded {args.rows} referrals in {time.perf_counter() - start:.0f} s ({db.engine.dialect.name})")
+
+        cases = [
+            ('admin', {'category': 'Travel'}),
+            ('admin', {'search': 'Member 1'}),
+            ('admin', {'search': 'Member 1', 'category': 'Travel'}),
+            ('admin', {'status': 'Closed'}),
+            ('admin', {'status': 'Lost', 'referral_type': 'Self', 'category': 'Catering'}),
+            ('admin', {'startDate': '2025-01-01', 'endDate': '2025-01-31'}),
+            ('admin', {'counterparty': str(member_id)}),
+            ('admin', {'counterparty': str(member_id), 'status': 'Open', 'filter': '12m'}),
+            ('member', {'category': 'Travel'}),
+            ('member', {'status': 'Closed', 'startDate': '2025-01-01'}),
+            ('member', {'counterparty': str(other_id)}),
+        ]
+
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                captured.append((statement, parameters))
+
+        client = app.test_client()
+        failures = 0
+        print(f"{'':<6} {'filters':<62} {'before':>10} {'dupes':>5} {'after':>10}  plan")
+        for role, params in cases:
+            user_id = admin_id if role == 'admin' else member_id
+            label = '&'.join(f'{k}={v}' for k, v in params.items())
+
+            before = dupes = '-'
+            if set(params) <= {'search', 'category'}:
+                try:
+                    start = time.perf_counter()
+                    # Column rows: Query would silently unique whole entities, leaving a short page instead
+                    ids = [r.id for r in old_query(user_id, role, params).with_entities(Referral.id)]
+                    before = f"{(time.perf_counter() - start) * 1000:8.1f}ms"
+                    dupes = len(ids) - len(set(ids))
+                except Exception as e:
+                    before = type(e).__name__[:10]
+                db.session.rollback()
+
+            captured.clear()
+            event.listen(db.engine, 'before_cursor_execute', capture)
+            try:
+                start = time.perf_counter()
+                res = client.get('/api/referrals/', query_string=params, headers=auth_headers(app, user_id, role))
+                elapsed = time.perf_counter() - start
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', capture)
+            assert res.status_code == 200, res.get_data(as_text=True)
+            ids = [item['id'] for item in res.json['items']]
+            assert len(ids) == len(set(ids)), 'duplicate referrals on the page'
+
+            scans = []
+            for statement, parameters in captured:
+                if 'FROM referral' not in statement:
+                    continue
+                plan, pattern = explain(db, statement, parameters)
+                scans += [line for line in plan if 'referral' in pattern.findall(line)]
+            failures += bool(scans)
+            print(f"{role:<6} {label:<62} {before:>10} {dupes:>5} {elapsed * 1000:8.1f}ms  "
+                  f"{'SCAN referral' if scans else 'indexed'}")
+
+    if failures:
+        print(f"{failures} filter combination(s) scan the referral table")
+        sys.exit(1)
+    print('OK: every referral filter is index-backed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Dashboard loads with and without the response cache.
+
+    python -m backend.benchmarks.response_cache [--members 2000] [--meetings 300] [--loads 300] [--write-every 50]
+
+A dashboard load is GET /api/meetings?include=participants, /api/events,
+/api/users and /api/analytics as an admin. Every --write-every loads a
+meeting is scheduled, which must invalidate the cached meetings and
+analytics responses: each load checks the newest meeting is listed.
+"""
+import time
+import random
+import argparse
+import statistics
+from sqlalchemy import insert
+from backend.benchmarks import bench_app, auth_headers, count_queries
+from backend.benchmarks.search import seed
+
+DASHBOARD = ['/api/meetings/?include=participants', '/api/events/', '/api/users/', '/api/analytics/?filter=12m']
+
+
+def run(client, engine, headers, loads, write_every):
+    times, queries, scheduled = [], 0, 0
+    for i in range(loads):
+        if write_every and i and i % write_every == 0:
+            scheduled += 1
+            res = client.post('/api/meetings/', headers=headers, json={
+                'title': f'Scheduled {scheduled}', 'date': '2099-01-01', 'time': '09:00'
+            })
+            assert res.status_code == 201, res.data
+        start = time.perf_counter()
+        with count_queries(engine) as stats:
+            responses = [client.get(url, headers=headers) for url in DASHBOARD]
+        times.append(time.perf_counter() - start)
+        queries += stats['queries']
+        assert all(res.status_code == 200 for res in responses)
+        if scheduled:
+            assert responses[0].json['items'][0]['title'] == f'Scheduled {scheduled}', 'stale meetings list'
+    return times, queries / loads
+
+
+def report(label, times, queries):
+    times = sorted(times)
+    print(f"{label:<7} p50 {statistics.median(times) * 1000:7.2f} ms   p95 {times[int(len(times) * 0.95) - 1] * 1000:7.2f} ms   "
+          f"{queries:5.1f} queries per load")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=2000)
+    parser.add_argument('--meetings', type=int, default=300)
+    parser.add_argument('--loads', type=int, default=300)
+    parser.add_argument('--write-every', type=int, default=50)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.models import User, Meeting, Event, meeting_attendees
+    from backend.utils.response_cache import response_cache
+
+    rng = random.Random(3)
+    with app.app_context():
+        admin_id = seed(db, args.members)
+        db.session.execute(insert(Meeting), [
+            {'title': f'Meeting {i}', 'date': f'2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}'} for i in range(args.meetings)
+        ])
+        db.session.execute(insert(Event), [
+            {'title': f'Event {i}', 'date': f'2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}'} for i in range(args.meetings // 3)
+        ])
+        user_ids = [u for u, in db.session.query(User.id)]
+        db.session.execute(insert(meeting_attendees), [
+            {'user_id': u, 'meeting_id': m}
+            for m, in db.session.query(Meeting.id) for u in rng.sample(user_ids, min(30, len(user_ids)))
+        ])
+        db.session.commit()
+        db.session.remove()
+        engine = db.engine
+
+    client = app.test_client()
+    headers = auth_headers(app, admin_id, 'admin')
+
+    response_cache.enabled = False
+    report('before', *run(client, engine, headers, args.loads, args.write_every))
+
+    response_cache.enabled = True
+    times, queries = run(client, engine, headers, args.loads, args.write_every)
+    report('after', times, queries)
+    stats = response_cache.stats()
+    print(f"hit rate {stats['hit_rate']}, {stats['size']} entries, invalidations {stats['invalidations']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Memory and latency of revenue totals: Python loops vs database aggregation.
+
+    python -m backend.benchmarks.revenue_summary [--rows 1000000]
+
+The "before" numbers replay what /api/revenue/total and /api/revenue/monthly
+used to do (load every Revenue row and sum in Python).
+"""
+import random
+import argparse
+import datetime
+from backend.benchmarks import bench_app, auth_headers, measure
+
+
+def seed_revenue(db, rows, member_ids):
+    from sqlalchemy import insert
+    from backend.models import Revenue
+
+    start = datetime.date(2020, 1, 1)
+    chunk = 50000
+    for offset in range(0, rows, chunk):
+        batch = []
+        for _ in range(min(chunk, rows - offset)):
+            day = start + datetime.timedelta(days=random.randint(0, 6 * 365))
+            batch.append({
+                'amount': round(random.uniform(500, 50000), 2),
+                'type': 'Thank You For Closed Business',
+                'member_id': random.choice(member_ids),
+                'created_by': random.choice(member_ids),
+                'date': day.strftime('%Y-%m-%d'),
+                'created_at': datetime.datetime.combine(day, datetime.time(12))
+            })
+        db.session.execute(insert(Revenue), batch)
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.models import User, Revenue
+
+    random.seed(7)
+    with app.app_context():
+        admin = User(name='Admin', email='admin@example.com', password='x', role='admin')
+        members = [User(name=f'Member {i}', email=f'm{i}@example.com', password='x', business_category=f'Category {i % 12}') for i in range(200)]
+        db.session.add_all([admin] + members)
+        db.session.commit()
+        admin_id = admin.id
+        print(f"Seeding {args.rows} revenue rows...")
+        seed_revenue(db, args.rows, [m.id for m in members])
+        db.session.remove()
+
+        def python_loops():
+            revenue = Revenue.query.all()
+            total = sum(r.amount for r in revenue)
+            monthly = {}
+            for r in revenue:
+                month = datetime.datetime.strptime(r.date, '%Y-%m-%d').strftime('%B')
+                monthly[month] = monthly.get(month, 0) + r.amount
+            db.session.remove()
+            return total, monthly
+
+        client = app.test_client()
+        headers = auth_headers(app, admin_id, 'admin')
+
+        def endpoint(path):
+            def call():
+                res = client.get(path, headers=headers)
+                assert res.status_code == 200, res.data
+            return call
+
+        measure('before: load rows + sum', python_loops)
+        measure('GET /api/revenue/total', endpoint('/api/revenue/total'))
+        measure('GET /api/revenue/summary', endpoint('/api/revenue/summary'))
+        measure('  ?period=quarter', endpoint('/api/revenue/summary?period=quarter'))
+        measure('  ?category=Category 3', endpoint('/api/revenue/summary?category=Category%203'))
+
+
+if __name__ == '__main__':
+    main()
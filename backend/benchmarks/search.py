@@ -0,0 +1,114 @@
+"""Latency of /api/search over a large member table.
+
+    python -m backend.benchmarks.search [--members 100000] [--requests 200]
+
+Seeds synthetic members and times typeahead-style queries (one to three
+prefixes, as typed) through the route. "before" runs the old unbounded
+ILIKE '%q%' over six columns and serializes every match; "after" is the
+full-text index (FTS5 on SQLite, tsvector/GIN on PostgreSQL via DATABASE_URL).
+"""
+import random
+import argparse
+import statistics
+import time
+from sqlalchemy import insert, or_
+from backend.benchmarks import bench_app, auth_headers
+
+FIRST = ['Rajesh', 'Priya', 'Suresh', 'Anitha', 'Kiran', 'Deepa', 'Mahesh', 'Lakshmi', 'Arjun', 'Kavya',
+         'Naveen', 'Shruti', 'Ravi', 'Meera', 'Ganesh', 'Pooja', 'Vinay', 'Divya', 'Harish', 'Sneha']
+LAST = ['Kumar', 'Rao', 'Shetty', 'Gowda', 'Reddy', 'Nair', 'Iyer', 'Hegde', 'Patil', 'Murthy']
+CATEGORIES = ['Interior Design', 'Chartered Accountant', 'Real Estate', 'Travel', 'Insurance', 'Printing',
+              'Catering', 'Photography', 'Web Development', 'Dental Care', 'Legal Services', 'Event Planning']
+WORDS = ['modular', 'kitchens', 'audit', 'gst', 'filing', 'apartments', 'villas', 'tours', 'policies',
+         'brochures', 'weddings', 'portraits', 'websites', 'implants', 'contracts', 'corporate', 'bangalore',
+         'consulting', 'renovation', 'packages', 'claims', 'banners', 'buffets', 'branding', 'orthodontics']
+
+QUERIES = ['ra', 'raj', 'rajesh', 'rajesh ku', 'interior', 'chart acc', 'kitch', 'wedd pho', 'gowda',
+           'travel tours', 'web', 'zzz', 'dental impl', 'priya re', 'gst']
+
+
+def seed(db, members):
+    from backend.models import User
+
+    rng = random.Random(7)
+    admin = User(name='Admin', email='admin@example.com', password='x', role='admin')
+    db.session.add(admin)
+    db.session.commit()
+    for start in range(0, members, 5000):
+        rows = []
+        for i in range(start, min(start + 5000, members)):
+            first, last, category = rng.choice(FIRST), rng.choice(LAST), rng.choice(CATEGORIES)
+            rows.append({
+                'name': f'{first} {last}',
+                'email': f'{first.lower()}.{last.lower()}{i}@example.com',
+                'password': 'x',
+                'phone': f'98{i:08d}',
+                'business_name': f'{last} {category.split()[0]} {rng.choice(["Solutions", "Associates", "Studio", "Co"])}',
+                'business_category': category,
+                'services_offered': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(10, 40))),
+            })
+        db.session.execute(insert(User), rows)
+        db.session.commit()
+    return admin.id
+
+
+def old_search(query):
+    from backend.models import User
+
+    search_term = f"%{query}%"
+    results = User.query.filter(or_(
+        User.name.ilike(search_term), User.email.ilike(search_term), User.phone.ilike(search_term),
+        User.business_name.ilike(search_term), User.business_category.ilike(search_term),
+        User.services_offered.ilike(search_term)
+    )).all()
+    return [{'id': str(r.id), 'name': r.name, 'email': r.email, 'phone': r.phone,
+             'business_name': r.business_name, 'business_category': r.business_category,
+             'services_offered': r.services_offered, 'role': r.role, 'chapter': r.chapter} for r in results]
+
+
+def report(label, times, matches):
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"{label:<7} p50 {statistics.median(times) * 1000:8.2f} ms   p95 {p95 * 1000:8.2f} ms   "
+          f"avg results {matches:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    with app.app_context():
+        start = time.perf_counter()
+        admin_id = seed(db, args.members)
+        print(f"seeded {args.members} members in {time.perf_counter() - start:.1f} s "
+              f"({db.engine.dialect.name})")
+
+        queries = [QUERIES[i % len(QUERIES)] for i in range(args.requests)]
+        # The old search returns every match, so use fewer requests to keep the run short
+        old_queries = queries[:max(len(QUERIES), args.requests // 10)]
+        times, matches = [], 0
+        for q in old_queries:
+            start = time.perf_counter()
+            matches += len(old_search(q))
+            times.append(time.perf_counter() - start)
+            db.session.remove()
+        report('before', times, matches / len(old_queries))
+
+    client = app.test_client()
+    headers = auth_headers(app, admin_id, 'admin')
+    times, matches = [], 0
+    for q in queries:
+        start = time.perf_counter()
+        response = client.get('/api/search/', query_string={'q': q}, headers=headers)
+        times.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        matches += len(response.json)
+    report('after', times, matches / len(queries))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Member picker autocomplete: /api/users/suggest against fetching the member list.
+
+    python -m backend.benchmarks.suggest [--members 5000] [--requests 2000]
+
+"before" is what the pickers did: GET /api/auth/users?paginate=false and
+filter the whole list in the browser. "after" times the in-memory index on
+its own (the sub-millisecond target) and through the route, auth included.
+"""
+import time
+import argparse
+import statistics
+from backend.benchmarks import bench_app, auth_headers
+from backend.benchmarks.search import seed
+
+QUERIES = ['r', 'ra', 'raj', 'rajesh', 'rajesh k', 'pri', 'priya re', 'gow', 'inter', 'chart',
+           'kavya sh', 'dental', 'travel', 'mah', 'zzz', 'rajseh', 'shety', 'photo', 'real est', 'kum']
+
+
+def report(label, times, size):
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"{label:<13} p50 {statistics.median(times) * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms   "
+          f"avg response {size / 1024:9.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.utils.typeahead import member_index
+    with app.app_context():
+        admin_id = seed(db, args.members)
+        start = time.perf_counter()
+        member_index.rebuild()
+        print(f"indexed {len(member_index)} members in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    client = app.test_client()
+    headers = auth_headers(app, admin_id, 'admin')
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.requests)]
+
+    times, size = [], 0
+    for _ in range(min(args.requests, 50)):
+        start = time.perf_counter()
+        response = client.get('/api/auth/users', query_string={'paginate': 'false'}, headers=headers)
+        times.append(time.perf_counter() - start)
+        size += len(response.data)
+    report('before', times, size / len(times))
+
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        member_index.suggest(q)
+        times.append(time.perf_counter() - start)
+    report('after index', times, 0)
+
+    times, size = [], 0
+    for q in queries:
+        start = time.perf_counter()
+        response = client.get('/api/users/suggest', query_string={'q': q}, headers=headers)
+        times.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        size += len(response.data)
+    report('after route', times, size / len(queries))
+
+
+if __name__ == '__main__':
+    main()
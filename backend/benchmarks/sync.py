@@ -0,0 +1,113 @@
+"""Steady-state refresh: refetching the collections against one /api/sync delta.
+
+    python -m backend.benchmarks.sync [--referrals 20000] [--notifications 300] [--refreshes 20]
+
+"before" is what lib/api.ts did after each mutation: GET referrals,
+revenue, meetings and notifications with ?paginate=false. "after" is
+one /api/sync from the previous token. Between refreshes one referral is
+added, one notification read and, every fifth refresh, a referral deleted.
+Finally a member who sent and received referrals is deleted, and the
+script fails unless the next delta reports those referrals deleted.
+"""
+import sys
+import time
+import argparse
+import statistics
+from sqlalchemy import insert
+from backend.benchmarks import bench_app, auth_headers
+from backend.benchmarks.referral_filters import seed
+
+COLLECTIONS = ['/api/referrals/', '/api/revenue/', '/api/meetings/', '/api/notifications/']
+
+
+def report(label, times, sizes):
+    print(f"  {label:<7} p50 {statistics.median(times) * 1000:8.2f} ms   {statistics.mean(sizes) / 1024:9.1f} KiB per refresh")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--referrals', type=int, default=20000)
+    parser.add_argument('--notifications', type=int, default=300)
+    parser.add_argument('--meetings', type=int, default=200)
+    parser.add_argument('--refreshes', type=int, default=20)
+    args = parser.parse_args()
+
+    app = bench_app()
+    from backend.utils.extensions import db
+    from backend.models import User, Meeting, Notification
+    from backend.utils import sync
+    from backend.utils.response_cache import response_cache
+    response_cache.enabled = False
+
+    with app.app_context():
+        admin_id, member_id, other_id = seed(db, args.referrals)
+        db.session.execute(insert(Notification), [
+            {'user_id': uid, 'type': 'broadcast', 'message': f'Chapter update {i}'}
+            for uid in (admin_id, member_id) for i in range(args.notifications)
+        ])
+        db.session.execute(insert(Meeting), [
+            {'title': f'Meeting {i}', 'date': f'2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}'} for i in range(args.meetings)
+        ])
+        db.session.commit()
+        db.session.remove()
+
+    client = app.test_client()
+    # Refreshes in this script are milliseconds apart; with the usual overlap every delta would
+    # repeat all the earlier ones
+    sync.OVERLAP = sync.OVERLAP * 0
+
+    for label, user_id, role in [('member', member_id, 'member'), ('admin', admin_id, 'admin')]:
+        headers = auth_headers(app, user_id, role)
+        token = client.get('/api/sync/', headers=headers).json['token']
+        before, after = ([], []), ([], [])
+        for i in range(args.refreshes):
+            created = client.post('/api/referrals/', headers=headers, json={
+                'to_member_id': other_id, 'contact_name': f'Lead {i}', 'send_email': False
+            }).json['id']
+            unread = client.get('/api/notifications/', headers=headers).json['items']
+            client.put(f"/api/notifications/{unread[i % len(unread)]['id']}/read", headers=headers)
+            if i % 5 == 4:
+                client.delete(f'/api/referrals/{created}', headers=headers)
+
+            start = time.perf_counter()
+            size = sum(len(client.get(url + '?paginate=false', headers=headers).data) for url in COLLECTIONS)
+            before[0].append(time.perf_counter() - start)
+            before[1].append(size)
+
+            start = time.perf_counter()
+            res = client.get('/api/sync/', headers=headers, query_string={'since': token})
+            after[0].append(time.perf_counter() - start)
+            after[1].append(len(res.data))
+            assert res.status_code == 200 and not res.json['reset'], res.json
+            token = res.json['token']
+
+        print(f"{label} ({args.refreshes} refreshes)")
+        report('before', *before)
+        report('after', *after)
+
+    with app.app_context():
+        leaving = User(name='Leaving Member', email='leaving@example.com', password='x', role='member')
+        db.session.add(leaving)
+        db.session.commit()
+        leaving_id = leaving.id
+    headers = auth_headers(app, member_id)
+    referral_ids = {
+        client.post('/api/referrals/', headers=auth_headers(app, leaving_id), json={
+            'to_member_id': member_id, 'contact_name': 'From a leaving member', 'send_email': False
+        }).json['id'],
+        client.post('/api/referrals/', headers=headers, json={
+            'to_member_id': leaving_id, 'contact_name': 'To a leaving member', 'send_email': False
+        }).json['id'],
+    }
+    token = client.get('/api/sync/', headers=headers).json['token']
+    res = client.delete(f'/api/users/{leaving_id}', headers=auth_headers(app, admin_id, 'admin'))
+    assert res.status_code == 200, res.data
+    deleted = set(client.get('/api/sync/', headers=headers, query_string={'since': token}).json['changes']['referrals']['deleted'])
+    if not referral_ids <= deleted:
+        print(f"FAIL: deleting a member left referrals {sorted(referral_ids - deleted)} out of /api/sync")
+        sys.exit(1)
+    print("OK: deleting a member reports their referrals deleted in /api/sync")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import sys
+import json
+import time
+import click
+from flask.cli import AppGroup
+
+member_stats_cli = AppGroup('member-stats', help='Maintain the member_stats rollup table.')
+monthly_metrics_cli = AppGroup('monthly-metrics', help='Maintain the monthly_metric rollup table.')
+email_outbox_cli = AppGroup('email-outbox', help='Send and inspect queued emails.')
+schema_cli = AppGroup('schema', help='Migrate the database schema, once per deploy.')
+startup_cli = AppGroup('startup', help='Inspect worker startup cost.')
+members_cli = AppGroup('members', help='Bulk member administration.')
+sync_cli = AppGroup('sync', help='Maintain /api/sync tombstones.')
+
+
+def report_drift(table, drift, check):
+    for key, field, stored, actual in drift[:50]:
+        click.echo(f"{key}: {field} stored={stored} actual={actual}")
+    if len(drift) > 50:
+        click.echo(f"... and {len(drift) - 50} more")
+
+    if check:
+        if drift:
+            click.echo(f"{table} has drifted ({len(drift)} values)")
+            sys.exit(1)
+        click.echo(f"{table} is in sync")
+    else:
+        click.echo(f"Rebuilt {table} ({len(drift)} values corrected)")
+
+
+@member_stats_cli.command('rebuild')
+@click.option('--check', is_flag=True, help='Only report drift, leave the table untouched.')
+def rebuild_member_stats(check):
+    """Recompute member_stats from the raw tables."""
+    from backend.utils import member_stats
+
+    drift = member_stats.rebuild(check_only=check)
+    report_drift('member_stats', [(f"user {u}", c, s, a) for u, c, s, a in drift], check)
+
+
+@monthly_metrics_cli.command('backfill')
+@click.option('--check', is_flag=True, help='Only report drift, leave the table untouched.')
+def backfill_monthly_metrics(check):
+    """Recompute monthly_metric from referrals, revenue and members."""
+    from backend.utils import monthly_metrics
+
+    drift = monthly_metrics.backfill(check_only=check)
+    report_drift('monthly_metric', drift, check)
+
+
+@email_outbox_cli.command('run')
+@click.option('--once', is_flag=True, help='Send everything that is due, then exit.')
+def run_email_outbox(once):
+    """Run the SMTP worker pool in this process."""
+    from flask import current_app
+    from backend.utils import email_outbox
+
+    if once:
+        sent = 0
+        while True:
+            batch = email_outbox.process_batch()
+            if not batch:
+                break
+            sent += batch
+        click.echo(f"Processed {sent} queued email(s)")
+        return
+
+    worker = email_outbox.get_worker(current_app._get_current_object())
+    worker.start()
+    click.echo(f"Email outbox running with {worker.size} worker(s); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(60)
+            click.echo(json.dumps(email_outbox.queue_stats()))
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+@email_outbox_cli.command('stats')
+def email_outbox_stats():
+    """Print queue depth and this process's send metrics as JSON."""
+    from backend.utils import email_outbox
+
+    click.echo(json.dumps(email_outbox.queue_stats(), indent=2))
+
+
+@email_outbox_cli.command('purge')
+@click.option('--days', default=30, show_default=True, help='Delete sent emails older than this.')
+def purge_email_outbox(days):
+    """Delete old sent emails from the outbox."""
+    from backend.utils import email_outbox
+
+    click.echo(f"Deleted {email_outbox.purge(days)} sent email(s)")
+
+
+@schema_cli.command('upgrade')
+@click.option('--lock-timeout', default=300, show_default=True, help='Seconds to wait for another upgrade to finish.')
+def upgrade_schema(lock_timeout):
+    """Run migrations to head under a database advisory lock."""
+    from backend.utils import schema
+
+    before, after = schema.upgrade_schema(lock_timeout)
+    if before == after:
+        click.echo(f"Schema already at {after}")
+    else:
+        click.echo(f"Schema upgraded from {before or 'empty'} to {after}")
+
+
+@schema_cli.command('check')
+def check_schema():
+    """Exit non-zero if the database is behind the migrations."""
+    from backend.utils import schema
+
+    if not schema.check_schema():
+        sys.exit(1)
+    click.echo(f"Schema is at head ({schema.head_revision()})")
+
+
+@startup_cli.command('profile')
+@click.option('--module', default='backend.wsgi', show_default=True, help='Module a worker imports.')
+@click.option('--top', default=15, show_default=True, help='Packages to list.')
+@click.option('--budget-ms', type=float, help='Exit non-zero if the import takes longer.')
+def profile_startup(module, top, budget_ms):
+    """Time each package a fresh worker imports (python -X importtime)."""
+    from backend.utils.startup_profile import import_profile
+
+    total, modules = import_profile(module)
+    for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:top]:
+        click.echo(f"{ms:9.1f} ms  {name}")
+    click.echo(f"{total:9.1f} ms  total import of {module}")
+    if budget_ms is not None and total > budget_ms:
+        click.echo(f"Over the {budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+@members_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--dry-run', is_flag=True, help='Only validate; report what would fail.')
+@click.option('--workers', type=int, help='Hashing processes (default: one per CPU).')
+def import_members(path, dry_run, workers):
+    """Import members from a CSV or JSON file; exits non-zero if any row fails."""
+    from backend.utils import member_import
+
+    with open(path, 'rb') as f:
+        try:
+            rows = member_import.parse_rows(f.read(), 'json' if path.endswith('.json') else 'csv')
+        except member_import.MemberImportError as e:
+            raise click.ClickException(str(e))
+
+    start = time.perf_counter()
+    result = member_import.import_members(rows, dry_run=dry_run, workers=workers)
+    for entry in result['errors']:
+        click.echo(f"row {entry['row']} ({entry['email'] or 'no email'}): {'; '.join(entry['errors'])}")
+    verb = 'would import' if dry_run else 'imported'
+    click.echo(f"{result['total']} rows, {verb} {result['valid'] if dry_run else result['created']}, "
+               f"{result['failed']} failed ({time.perf_counter() - start:.1f} s)")
+    if result['failed']:
+        sys.exit(1)
+
+
+
+@sync_cli.command('prune')
+@click.option('--days', type=int, help='Keep this many days of tombstones (default SYNC_TOMBSTONE_DAYS).')
+def prune_tombstones(days):
+    """Forget deletions older than the retention; clients with older tokens refetch."""
+    from backend.utils import sync
+
+    click.echo(f"Pruned {sync.prune_tombstones(days)} tombstones")
+
+
+def register_commands(app):
+    app.cli.add_command(member_stats_cli)
+    app.cli.add_command(monthly_metrics_cli)
+    app.cli.add_command(email_outbox_cli)
+    app.cli.add_command(schema_cli)
+    app.cli.add_command(startup_cli)
+    app.cli.add_command(members_cli)
+    app.cli.add_command(sync_cli)
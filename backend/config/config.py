@@ -1,14 +1,20 @@
 import os
-from dotenv import load_dotenv
 
-# Explicitly load .env from backend directory
+# Explicitly load .env from backend directory; skip importing python-dotenv when there isn't one (e.g. on Render)
 basedir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
-load_dotenv(os.path.join(basedir, '.env'))
+if os.path.exists(os.path.join(basedir, '.env')):
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(basedir, '.env'))
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///site.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # What create_app does about migrations: 'check' (warn if behind), 'strict' (refuse to start),
+    # 'upgrade' (migrate in-process, for local dev) or 'off'
+    SCHEMA_STARTUP = os.getenv('SCHEMA_STARTUP', 'check')
+    # Import Flask-Mail and Flask-Migrate on first use instead of at boot (see create_app)
+    LAZY_IMPORTS = os.getenv('LAZY_IMPORTS', 'True') == 'True'
     SQLALCHEMY_ENGINE_OPTIONS = {
         "pool_pre_ping": True,
         "pool_recycle": 300,
@@ -19,3 +25,45 @@ class Config:
     MAIL_USE_TLS = os.getenv('MAIL_USE_TLS', 'True') == 'True'
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
+    MAIL_SUPPRESS_SEND = os.getenv('MAIL_SUPPRESS_SEND', 'False') == 'True'
+    MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', 50)) # BCC recipients per bulk email message
+    # Email outbox worker pool (utils/email_outbox.py). Set MAIL_OUTBOX_INLINE_WORKER=False when a
+    # separate `flask email-outbox run` process does the sending.
+    MAIL_OUTBOX_INLINE_WORKER = os.getenv('MAIL_OUTBOX_INLINE_WORKER', 'True') == 'True'
+    MAIL_OUTBOX_WORKERS = int(os.getenv('MAIL_OUTBOX_WORKERS', 2))
+    MAIL_OUTBOX_BATCH_SIZE = int(os.getenv('MAIL_OUTBOX_BATCH_SIZE', 20)) # emails per claim / SMTP connection
+    MAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('MAIL_OUTBOX_MAX_ATTEMPTS', 5))
+    MAIL_OUTBOX_RETRY_SECONDS = float(os.getenv('MAIL_OUTBOX_RETRY_SECONDS', 30)) # doubled after each failure
+    MAIL_OUTBOX_POLL_SECONDS = float(os.getenv('MAIL_OUTBOX_POLL_SECONDS', 5))
+    # Authenticated principals cached per worker; the TTL bounds how stale another worker's copy can be
+    PRINCIPAL_CACHE_SIZE = int(os.getenv('PRINCIPAL_CACHE_SIZE', 1024))
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 60))
+    # Cached list/summary responses (utils/response_cache.py); size 0 turns the per-worker cache off.
+    # With a Redis URL workers share entries and invalidations instead.
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 512))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 300))
+    RESPONSE_CACHE_REDIS_URL = os.getenv('RESPONSE_CACHE_REDIS_URL')
+    # Threads per worker that build /api/dashboard/me sections concurrently, each holding a DB
+    # connection while it runs (0 = one after another on the request's connection)
+    DASHBOARD_WORKERS = int(os.getenv('DASHBOARD_WORKERS', 4))
+    # Per-request SQL stats (utils/sql_stats.py): a Server-Timing header with query count and DB time,
+    # per-endpoint totals at /api/analytics/queries, the slowest statements kept per endpoint, and how
+    # often one statement may repeat in a request before it is logged as a likely N+1
+    SQL_STATS = os.getenv('SQL_STATS', 'True') == 'True'
+    SQL_STATS_SLOWEST = int(os.getenv('SQL_STATS_SLOWEST', 3))
+    SQL_STATS_REPEAT_LIMIT = int(os.getenv('SQL_STATS_REPEAT_LIMIT', 10))
+    # Days deleted rows are remembered for /api/sync; older sync tokens get a full refetch
+    SYNC_TOMBSTONE_DAYS = int(os.getenv('SYNC_TOMBSTONE_DAYS', 30))
+    # bcrypt cost for new hashes; logins rehash older hashes when it changes (utils/passwords.py)
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Processes per gunicorn worker for bcrypt (0 = inline), extra calls allowed to wait, and how long
+    # a call may wait for a slot before the request gets a 503
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 8))
+    PASSWORD_HASH_WAIT = float(os.getenv('PASSWORD_HASH_WAIT', 0.5))
+    # Seconds before a worker rebuilds its /api/users/suggest index, bounding staleness from other workers' writes
+    SUGGEST_INDEX_MAX_AGE = int(os.getenv('SUGGEST_INDEX_MAX_AGE', 300))
+    # Member photos and their thumbnails; on Render point this at a persistent disk
+    PHOTO_STORE = os.getenv('PHOTO_STORE', 'local')
+    PHOTO_STORAGE_DIR = os.getenv('PHOTO_STORAGE_DIR', os.path.join(basedir, 'instance', 'photos'))
+    PHOTO_MAX_BYTES = int(os.getenv('PHOTO_MAX_BYTES', 5 * 1024 * 1024))
@@ -1,8 +1,42 @@
 from backend.utils.extensions import db
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import Session
+
+# Member search document (backend/utils/search.py). PostgreSQL keeps a GIN index on this
+# expression, so queries must repeat it verbatim for the planner to use the index.
+USER_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(business_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(business_category, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(services_offered, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(phone, '')), 'D')"
+)
+
+# SQLite has no tsvector; an FTS5 table over the same columns, kept in sync by triggers
+USER_SEARCH_COLUMNS = ['name', 'business_name', 'business_category', 'services_offered', 'email', 'phone']
+_cols = ', '.join(USER_SEARCH_COLUMNS)
+_new = ', '.join(f'new.{c}' for c in USER_SEARCH_COLUMNS)
+_old = ', '.join(f'old.{c}' for c in USER_SEARCH_COLUMNS)
+USER_SEARCH_SQLITE = [
+    f"CREATE VIRTUAL TABLE user_search USING fts5({_cols}, content='user', content_rowid='id', prefix='2 3')",
+    f"""CREATE TRIGGER user_search_ai AFTER INSERT ON "user" BEGIN
+        INSERT INTO user_search(rowid, {_cols}) VALUES (new.id, {_new});
+    END""",
+    f"""CREATE TRIGGER user_search_ad AFTER DELETE ON "user" BEGIN
+        INSERT INTO user_search(user_search, rowid, {_cols}) VALUES ('delete', old.id, {_old});
+    END""",
+    f"""CREATE TRIGGER user_search_au AFTER UPDATE OF {_cols} ON "user" BEGIN
+        INSERT INTO user_search(user_search, rowid, {_cols}) VALUES ('delete', old.id, {_old});
+        INSERT INTO user_search(rowid, {_cols}) VALUES (new.id, {_new});
+    END""",
+]
 
 class User(db.Model, UserMixin):
+    __table_args__ = (
+        db.Index('ix_user_search', db.text(USER_SEARCH_DOCUMENT), postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -14,8 +48,13 @@ class User(db.Model, UserMixin):
     phone = db.Column(db.String(20))
     chapter = db.Column(db.String(100), default='Nagarbhavi Brigades')
     membership_plan = db.Column(db.String(50), default='12 Months') # 'Lifetime', '6 Months', '12 Months'
-    photo = db.Column(db.Text) # Base64 encoded image
+    photo = db.deferred(db.Column(db.Text)) # Legacy base64 image, moved to the photo store by migration f3c6d1a8b920
+    photo_key = db.Column(db.String(64)) # '<version>.<ext>' of the current photo in the photo store
+    # monthly_metric bucket this row was counted in (utils/monthly_metrics.py), so later profile edits don't move it
+    metric_chapter = db.Column(db.String(100))
+    metric_category = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     referrals_given = db.relationship('Referral', foreign_keys='Referral.from_member_id', back_populates='sender', lazy=True)
@@ -28,7 +67,18 @@ class User(db.Model, UserMixin):
     meetings = db.relationship('Meeting', secondary='meeting_attendees', backref=db.backref('attendees', lazy='dynamic'))
     events = db.relationship('Event', secondary='event_attendees', backref=db.backref('attendees', lazy='dynamic'))
 
+for _statement in USER_SEARCH_SQLITE:
+    event.listen(User.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(User.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS user_search').execute_if(dialect='sqlite'))
+
 class Referral(db.Model):
+    __table_args__ = (
+        db.Index('ix_referral_from_member_id_created_at', 'from_member_id', 'created_at'),
+        db.Index('ix_referral_to_member_id_created_at', 'to_member_id', 'created_at'),
+        db.Index('ix_referral_created_at', 'created_at'),
+        db.Index('ix_referral_updated_at', 'updated_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     from_member_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     to_member_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -38,12 +88,24 @@ class Referral(db.Model):
     referral_type = db.Column(db.String(20)) # Self / Others
     comments = db.Column(db.Text)
     status = db.Column(db.String(50), default='Open') # Open / Closed
+    # monthly_metric bucket this row was counted in (utils/monthly_metrics.py), so later profile edits don't move it
+    metric_chapter = db.Column(db.String(100))
+    metric_category = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     sender = db.relationship('User', foreign_keys=[from_member_id], back_populates='referrals_given')
     receiver = db.relationship('User', foreign_keys=[to_member_id], back_populates='referrals_received')
 
 class Revenue(db.Model):
+    __table_args__ = (
+        db.Index('ix_revenue_member_id_created_at', 'member_id', 'created_at'),
+        db.Index('ix_revenue_created_by_created_at', 'created_by', 'created_at'),
+        db.Index('ix_revenue_created_at', 'created_at'),
+        db.Index('ix_revenue_updated_at', 'updated_at'),
+        db.Index('ix_revenue_date', 'date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Float, nullable=False)
     type = db.Column(db.String(50)) # 'Thank You For Closed Business'
@@ -54,7 +116,11 @@ class Revenue(db.Model):
     appreciation_message = db.Column(db.Text)
     appreciation_reason = db.Column(db.Text)
     date = db.Column(db.String(20)) # Stored as string or Date object
+    # monthly_metric bucket this row was counted in (utils/monthly_metrics.py), so later profile edits don't move it
+    metric_chapter = db.Column(db.String(100))
+    metric_category = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     referrer = db.relationship('User', foreign_keys=[member_id], back_populates='revenue_generated')
@@ -72,6 +138,7 @@ class Meeting(db.Model):
     meet_link = db.Column(db.String(500))
     fee = db.Column(db.Float, default=0.0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     organized_by = db.Column(db.Integer, db.ForeignKey('user.id')) # Organizer
 
     organizer = db.relationship('User', backref=db.backref('meetings_organized', lazy=True))
@@ -79,7 +146,8 @@ class Meeting(db.Model):
 # Association Table for Meeting Attendees
 meeting_attendees = db.Table('meeting_attendees',
     db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
-    db.Column('meeting_id', db.Integer, db.ForeignKey('meeting.id'), primary_key=True)
+    db.Column('meeting_id', db.Integer, db.ForeignKey('meeting.id'), primary_key=True),
+    db.Index('ix_meeting_attendees_meeting_id', 'meeting_id')
 )
 
 class Event(db.Model):
@@ -88,14 +156,22 @@ class Event(db.Model):
     date = db.Column(db.String(20), nullable=False)
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 # Association Table for Event Attendees
 event_attendees = db.Table('event_attendees',
     db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
-    db.Column('event_id', db.Integer, db.ForeignKey('event.id'), primary_key=True)
+    db.Column('event_id', db.Integer, db.ForeignKey('event.id'), primary_key=True),
+    db.Index('ix_event_attendees_event_id', 'event_id')
 )
 
 class Notification(db.Model):
+    __table_args__ = (
+        db.Index('ix_notification_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_notification_user_id_updated_at', 'user_id', 'updated_at'),
+        db.Index('ix_notification_broadcast_id', 'broadcast_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     type = db.Column(db.String(50)) # referral, broadcast, etc.
@@ -104,6 +180,11 @@ class Notification(db.Model):
     content = db.Column(db.Text)
     read_status = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Broadcast notifications keep subject/content on the shared Broadcast row instead of per recipient
+    broadcast_id = db.Column(db.Integer, db.ForeignKey('broadcast.id'))
+
+    broadcast = db.relationship('Broadcast', lazy=True)
 
 class Broadcast(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -114,6 +195,10 @@ class Broadcast(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Guest(db.Model):
+    __table_args__ = (
+        db.Index('ix_guest_invited_by_created_at', 'invited_by', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120))
@@ -123,10 +208,15 @@ class Guest(db.Model):
     status = db.Column(db.String(50), default='Invited') # Invited, Visited, Joined, Follow-up
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     inviter = db.relationship('User', foreign_keys=[invited_by], backref=db.backref('guests_invited', lazy=True))
 
 class LearningCredit(db.Model):
+    __table_args__ = (
+        db.Index('ix_learning_credit_member_id_created_at', 'member_id', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     topic = db.Column(db.String(200), nullable=False)
@@ -135,10 +225,16 @@ class LearningCredit(db.Model):
     date = db.Column(db.String(20), default=datetime.utcnow().strftime('%Y-%m-%d'))
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     member = db.relationship('User', foreign_keys=[member_id], backref=db.backref('learning_credits', lazy=True))
 
 class OneToOne(db.Model):
+    __table_args__ = (
+        db.Index('ix_one_to_one_member_id', 'member_id'),
+        db.Index('ix_one_to_one_with_member_id', 'with_member_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False) # Initiator
     with_member_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False) # Partner
@@ -149,3 +245,86 @@ class OneToOne(db.Model):
 
     initiator = db.relationship('User', foreign_keys=[member_id], backref=db.backref('one_to_ones_initiated', lazy=True))
     partner = db.relationship('User', foreign_keys=[with_member_id], backref=db.backref('one_to_ones_received', lazy=True))
+
+class MemberStats(db.Model):
+    # Per-member activity counters, kept in step by the write routes (see utils/member_stats.py)
+    __tablename__ = 'member_stats'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    referrals = db.Column(db.Integer, nullable=False, default=0) # Referrals given
+    meetings = db.Column(db.Integer, nullable=False, default=0)
+    events = db.Column(db.Integer, nullable=False, default=0)
+    one_to_ones = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class MonthlyMetric(db.Model):
+    # Pre-aggregated monthly facts for the dashboard charts (see utils/monthly_metrics.py).
+    # chapter/category are those of the member the activity is attributed to, '' when unknown.
+    __tablename__ = 'monthly_metric'
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    chapter = db.Column(db.String(100), primary_key=True, default='')
+    category = db.Column(db.String(100), primary_key=True, default='')
+    referrals = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    revenue_count = db.Column(db.Integer, nullable=False, default=0)
+    new_members = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class EmailOutbox(db.Model):
+    # Emails waiting for the SMTP worker pool (see utils/email_outbox.py)
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(200), nullable=False)
+    html = db.Column(db.Text)
+    recipients = db.Column(db.Text, nullable=False) # JSON list of addresses
+    bcc = db.Column(db.Boolean, nullable=False, default=False)
+    status = db.Column(db.String(20), nullable=False, default='pending') # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_by = db.Column(db.String(32))
+    claimed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+class Tombstone(db.Model):
+    # Deleted rows, so /api/sync can tell clients to drop them (see utils/sync.py). No foreign keys:
+    # the rows, and possibly their members, are gone. Pruned by `flask sync prune`.
+    __table_args__ = (
+        db.Index('ix_tombstone_deleted_at', 'deleted_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(30), nullable=False) # key in routes/sync_routes.SYNCED
+    row_id = db.Column(db.Integer, nullable=False)
+    # Members who could see the row; both null for rows every member sees
+    user_id = db.Column(db.Integer)
+    other_user_id = db.Column(db.Integer)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# Synced entity, and the columns naming the members who can see a row
+TOMBSTONED = {
+    Referral: ('referrals', 'from_member_id', 'to_member_id'),
+    Revenue: ('revenue', 'member_id', 'created_by'),
+    Meeting: ('meetings', None, None),
+    Notification: ('notifications', 'user_id', None),
+}
+
+@event.listens_for(Session, 'before_flush')
+def record_tombstones(session, flush_context, instances):
+    # Every ORM delete of a synced row, whichever route or command issued it. Bulk delete()
+    # statements and database cascades bypass this, so dependents are deleted through the
+    # session (see delete_member_rows in routes/user_routes.py)
+    for obj in list(session.deleted):
+        spec = TOMBSTONED.get(type(obj))
+        if spec and obj.id is not None:
+            entity, user_col, other_col = spec
+            session.add(Tombstone(
+                entity=entity, row_id=obj.id,
+                user_id=getattr(obj, user_col) if user_col else None,
+                other_user_id=getattr(obj, other_col) if other_col else None,
+            ))
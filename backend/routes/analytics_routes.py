@@ -1,8 +1,12 @@
 from flask import Blueprint, request, jsonify
-from backend.models import Referral, Revenue, Meeting, Event, User, OneToOne, meeting_attendees, event_attendees
+from backend.models import Referral, Revenue, Meeting, Event, User, MemberStats
 from backend.utils.extensions import db
 from backend.utils.auth import token_required, admin_required
-from sqlalchemy import func, extract, and_
+from backend.utils.engagement import get_engagement, serialize_engagement, STATUSES
+from backend.utils.monthly_metrics import monthly_series
+from backend.utils.response_cache import cached, response_cache
+from backend.utils.sql_stats import endpoint_stats, query_budget
+from sqlalchemy import func
 from datetime import datetime, timedelta
 import calendar
 
@@ -21,13 +25,21 @@ def get_date_range(filter_type):
 @analytics_bp.route('/', methods=['GET'])
 @token_required
 @admin_required
+@cached('referrals', 'revenue', 'meetings', 'events', 'users')
+@query_budget(8)
 def get_analytics(current_user):
     filter_type = request.args.get('filter', '6m')
     start_date = get_date_range(filter_type)
+    chapter = request.args.get('chapter')
+    category = request.args.get('category')
     
     # Referrals
-    referrals_given = Referral.query.filter(Referral.created_at >= start_date).count()
-    referrals_received = Referral.query.filter(Referral.created_at >= start_date).count() # Same as given globally
+    if filter_type == 'lifetime':
+        # Lifetime totals come straight from the maintained per-member counters
+        referrals_given = db.session.query(func.coalesce(func.sum(MemberStats.referrals), 0)).scalar()
+    else:
+        referrals_given = Referral.query.filter(Referral.created_at >= start_date).count()
+    referrals_received = referrals_given # Same as given globally
     
     # Revenue
     total_revenue = db.session.query(func.sum(Revenue.amount)).filter(Revenue.created_at >= start_date).scalar() or 0
@@ -38,12 +50,8 @@ def get_analytics(current_user):
     events_count = Event.query.filter(Event.created_at >= start_date).count()
     
     # Member Growth
-    # Group by month
-    growth_data = db.session.query(
-        extract('year', User.created_at).label('year'),
-        extract('month', User.created_at).label('month'),
-        func.count(User.id)
-    ).filter(User.created_at >= start_date).group_by('year', 'month').order_by('year', 'month').all()
+    # Read from the monthly rollup rather than grouping the raw tables
+    growth_data = monthly_series('new_members', start_date, chapter, category)
     
     formatted_growth = []
     for g in growth_data:
@@ -53,11 +61,7 @@ def get_analytics(current_user):
         })
 
     # Performance Trends (Referrals & Revenue over time)
-    trends = db.session.query(
-        extract('year', Referral.created_at).label('year'),
-        extract('month', Referral.created_at).label('month'),
-        func.count(Referral.id)
-    ).filter(Referral.created_at >= start_date).group_by('year', 'month').order_by('year', 'month').all()
+    trends = monthly_series('referrals', start_date, chapter, category)
     
     formatted_trends = []
     for t in trends:
@@ -81,56 +85,53 @@ def get_analytics(current_user):
 
 @analytics_bp.route('/engagement', methods=['GET'])
 @token_required
+@query_budget(3)
 def get_engagement_stats(current_user):
-    # This would calculate engagement for ALL members
-    users = User.query.filter_by(role='member').all()
-    result = []
-    
-    for u in users:
-        # Simple engagement calculation logic
-        # High: > 10 points, Growing: 5-10, Inactive: < 5
-        # Points: Meeting=2, Referral=2, Event=1, OneToOne=3
-        
-        points = 0
-        points += len(u.meetings) * 2
-        # Use simple length if dynamic is not set or use query
-        # But User.meetings is relationship
-        # referrals_given = len(u.referrals_given)
-        # points += referrals_given * 2
-        # events = len(u.events)
-        # points += events * 1
-        
-        # Let's use more accurate counts
-        ref_count = Referral.query.filter_by(from_member_id=u.id).count()
-        points += ref_count * 2
-        
-        mtg_count = db.session.query(meeting_attendees).filter_by(user_id=u.id).count()
-        points += mtg_count * 2
-        
-        evt_count = db.session.query(event_attendees).filter_by(user_id=u.id).count()
-        points += evt_count * 1
-        
-        oto_count = OneToOne.query.filter((OneToOne.member_id == u.id) | (OneToOne.with_member_id == u.id)).count()
-        points += oto_count * 3
-        
-        status = 'Inactive'
-        if points > 15:
-            status = 'Active'
-        elif points >= 7:
-            status = 'Growing'
-            
-        result.append({
-            'id': str(u.id),
-            '_id': str(u.id), # Frontend compatibility
-            'name': u.name,
-            'status': status,
-            'points': points,
-            'stats': {
-                'referrals': ref_count,
-                'meetings': mtg_count,
-                'events': evt_count,
-                'one_to_ones': oto_count
-            }
-        })
-        
-    return jsonify(result), 200
+    # Engagement for all members (or ?member_ids=1,2,3), optionally filtered by ?status=Active,Growing
+    member_ids = None
+    if request.args.get('member_ids'):
+        try:
+            member_ids = [int(m) for m in request.args['member_ids'].split(',') if m.strip()]
+        except ValueError:
+            return jsonify({'message': 'Invalid member_ids'}), 400
+
+    statuses = None
+    if request.args.get('status'):
+        statuses = [s.strip().capitalize() for s in request.args['status'].split(',') if s.strip()]
+        if any(s not in STATUSES for s in statuses):
+            return jsonify({'message': f"Invalid status, expected one of {', '.join(STATUSES)}"}), 400
+
+    # Plain list unless the caller asks for a page
+    paginated = 'page' in request.args or 'per_page' in request.args
+    if not paginated:
+        rows, _ = get_engagement(member_ids, statuses)
+        return jsonify([serialize_engagement(r) for r in rows]), 200
+
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        per_page = min(max(int(request.args.get('per_page', 50)), 1), 500)
+    except ValueError:
+        return jsonify({'message': 'Invalid page or per_page'}), 400
+
+    rows, total = get_engagement(member_ids, statuses, limit=per_page, offset=(page - 1) * per_page)
+    return jsonify({
+        'items': [serialize_engagement(r) for r in rows],
+        'page': page,
+        'per_page': per_page,
+        'total': total
+    }), 200
+
+@analytics_bp.route('/cache', methods=['GET'])
+@token_required
+@admin_required
+def get_cache_stats(current_user):
+    # Hit/miss counts of this worker's response cache, overall and per endpoint
+    return jsonify(response_cache.stats()), 200
+
+@analytics_bp.route('/queries', methods=['GET'])
+@token_required
+@admin_required
+def get_query_stats(current_user):
+    # Queries and DB time per endpoint on this worker, slowest first, with the slowest statements,
+    # any statement repeated often enough to look like an N+1, and requests over the route's budget
+    return jsonify(endpoint_stats.stats()), 200
@@ -1,12 +1,32 @@
 from flask import Blueprint, request, jsonify, current_app
 from backend.models import User
-from backend.utils.extensions import db, bcrypt
+from backend.utils.extensions import db
+from backend.utils.passwords import hasher, HasherOverloaded
 import jwt
 import datetime
-from backend.utils.auth import token_required
+from backend.utils.auth import token_required, invalidate_principal
+from backend.utils import monthly_metrics
+from backend.utils.typeahead import member_index
+from backend.utils.response_cache import cached, response_cache
+from backend.utils.pagination import paginated_response
 
 auth_bp = Blueprint('auth', __name__)
 
+@auth_bp.errorhandler(HasherOverloaded)
+def password_hasher_overloaded(e):
+    # Shed the request rather than queue it behind every other bcrypt call; clients retry
+    return jsonify({'message': 'Too many sign-ins right now, please try again in a moment'}), 503, {'Retry-After': '1'}
+
+def serialize_user_summary(u):
+    return {
+        'id': str(u.id),
+        '_id': str(u.id), # Frontend compatibility
+        'name': u.name,
+        'email': u.email,
+        'role': u.role,
+        'business_category': u.business_category
+    }
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -14,7 +34,7 @@ def register():
     if User.query.filter_by(email=email).first():
         return jsonify({'message': 'User already exists!'}), 409
 
-    hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+    hashed_password = hasher.hash(data['password'])
     
     new_user = User(
         name=data['name'],
@@ -28,7 +48,10 @@ def register():
     )
     
     db.session.add(new_user)
+    monthly_metrics.record(None, new_user, new_user, new_members=1)
     db.session.commit()
+    member_index.upsert(new_user)
+    response_cache.invalidate('users')
     
     return jsonify({'message': 'User created successfully!'}), 201
 
@@ -42,8 +65,13 @@ def login():
     user = User.query.filter_by(email=email).first()
 
     if user:
-        is_match = bcrypt.check_password_hash(user.password, data['password'])
+        is_match = hasher.check(user.password, data['password'])
         if is_match:
+            if hasher.needs_rehash(user.password):
+                # BCRYPT_LOG_ROUNDS changed since this hash was made; upgrade it while we have the password
+                user.password = hasher.hash(data['password'])
+                db.session.commit()
+
             # Create a JWT token
             token = jwt.encode({
                 'user_id': str(user.id), # Keep as str(user.id) for consistency with existing code
@@ -67,19 +95,9 @@ def login():
 
 @auth_bp.route('/users', methods=['GET'])
 @token_required
+@cached('users')
 def get_users(current_user):
-    users = User.query.all()
-    result = []
-    for u in users:
-        result.append({
-            'id': str(u.id),
-            '_id': str(u.id), # Frontend compatibility
-            'name': u.name,
-            'email': u.email,
-            'role': u.role,
-            'business_category': u.business_category
-        })
-    return jsonify(result), 200
+    return paginated_response(User.query, User.created_at, User.id, serialize_user_summary)
 
 @auth_bp.route('/change-password', methods=['POST'])
 @token_required
@@ -91,14 +109,14 @@ def change_password(current_user):
     if not current_password or not new_password:
         return jsonify({'message': 'Missing fields'}), 400
 
-    # User object is passed from token_required decorator (we need to update that too)
-    # Assuming token_required returns the User object
-    
-    if not bcrypt.check_password_hash(current_user.password, current_password):
+    # token_required only hands us the cached principal, so load the row to check and set the hash
+    user = User.query.get(current_user.id)
+    if not hasher.check(user.password, current_password):
         return jsonify({'message': 'Incorrect current password'}), 401
 
-    hashed_password = bcrypt.generate_password_hash(new_password).decode('utf-8')
-    current_user.password = hashed_password
+    hashed_password = hasher.hash(new_password)
+    user.password = hashed_password
     db.session.commit()
+    invalidate_principal(user.id)
     
     return jsonify({'message': 'Password updated successfully'}), 200
@@ -0,0 +1,17 @@
+from flask import Blueprint, jsonify
+from backend.utils.auth import token_required
+from backend.utils.dashboard import build_dashboard
+from backend.utils.response_cache import cached, member_tag
+from backend.utils.sql_stats import query_budget
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+@dashboard_bp.route('/me', methods=['GET'])
+@token_required
+# Meetings, events, broadcasts and member names are shared; everything else is the member's own
+@cached('meetings', 'events', 'notifications', 'users', lambda user: member_tag(user.id), scope='user')
+@query_budget(9)
+def get_my_dashboard(current_user):
+    data = build_dashboard(current_user.id)
+    data['member'] = {'id': str(current_user.id), 'name': current_user.name, 'role': current_user.role}
+    return jsonify(data), 200
@@ -1,26 +1,72 @@
 from flask import Blueprint, request, jsonify
-from backend.models import Event, User
+from backend.models import Event, User, event_attendees
 from backend.utils.extensions import db
 from backend.utils.auth import token_required, admin_required
 from backend.utils.email_service import send_email
+from backend.utils import member_stats
+from backend.utils.pagination import paginated_response
+from backend.utils.response_cache import cached, response_cache
+from backend.utils.sql_stats import query_budget
+from backend.routes.meeting_routes import ID_CHUNK
+import datetime
 
 event_bp = Blueprint('events', __name__)
 
+def load_registrations(event_ids):
+    """Registered member ids for a batch of events, one query per ID_CHUNK events."""
+    registered = {eid: [] for eid in event_ids}
+    for start in range(0, len(event_ids), ID_CHUNK):
+        chunk = event_ids[start:start + ID_CHUNK]
+        rows = db.session.query(event_attendees.c.event_id, event_attendees.c.user_id).filter(
+            event_attendees.c.event_id.in_(chunk)
+        ).order_by(event_attendees.c.event_id, event_attendees.c.user_id)
+        for event_id, user_id in rows:
+            registered[event_id].append(str(user_id))
+    return registered
+
+def serialize_event(e, registered_members):
+    return {
+        'id': str(e.id),
+        '_id': str(e.id),
+        'title': e.title,
+        'date': e.date,
+        'description': e.description,
+        'registered_members': registered_members
+    }
+
 @event_bp.route('/', methods=['GET'])
 @token_required
+@cached('events')
+@query_budget(4)  # auth lookup, page version, event page, one registrations query per ID_CHUNK events
 def get_events(current_user):
-    events = Event.query.all()
-    result = []
-    for e in events:
-        result.append({
-            'id': str(e.id),
-            '_id': str(e.id),
-            'title': e.title,
-            'date': e.date,
-            'description': e.description,
-            'registered_members': [str(u.id) for u in e.attendees]
-        })
-    return jsonify(result), 200
+    query = Event.query
+    # Date is stored as string YYYY-MM-DD in Event model
+    today = datetime.datetime.utcnow().strftime('%Y-%m-%d')
+
+    when = request.args.get('when')
+    # Upcoming events read soonest first, everything else latest first
+    ascending = when == 'upcoming'
+    if when == 'upcoming':
+        query = query.filter(Event.date >= today)
+    elif when == 'past':
+        query = query.filter(Event.date < today)
+    elif when:
+        return jsonify({'message': 'when must be upcoming or past'}), 400
+
+    time_filter = request.args.get('filter')
+    if time_filter in ['6m', '12m']:
+        months = 6 if time_filter == '6m' else 12
+        cutoff_date = (datetime.datetime.utcnow() - datetime.timedelta(days=months * 30)).strftime('%Y-%m-%d')
+        query = query.filter(Event.date >= cutoff_date)
+
+    def serialize_page(events):
+        registered = load_registrations([e.id for e in events])
+        return [serialize_event(e, registered[e.id]) for e in events]
+
+    # Same (date, id) ordering as meetings
+    return paginated_response(
+        query, Event.date, Event.id, serialize_rows=serialize_page, depends_on=(User,), ascending=ascending
+    )
 
 @event_bp.route('/', methods=['POST'])
 @token_required
@@ -34,6 +80,7 @@ def create_event(current_user):
     )
     db.session.add(new_event)
     db.session.commit()
+    response_cache.invalidate('events')
     return jsonify({'message': 'Event created'}), 201
 
 @event_bp.route('/<id>/register', methods=['POST'])
@@ -46,8 +93,11 @@ def register_event(current_user, id):
     if event.attendees.filter_by(id=current_user.id).first():
         return jsonify({'message': 'Already registered'}), 400
         
-    event.attendees.append(current_user)
+    db.session.execute(event_attendees.insert().values(user_id=current_user.id, event_id=event.id))
+    event.updated_at = datetime.datetime.utcnow() # registered_members changed; moves the list's ETag
+    member_stats.bump(current_user.id, events=1)
     db.session.commit()
+    response_cache.invalidate('events')
     
     if current_user.email:
         send_email(
@@ -65,8 +115,14 @@ def cancel_event(current_user, id):
         return jsonify({'message': 'Event not found'}), 404
         
     if event.attendees.filter_by(id=current_user.id).first():
-        event.attendees.remove(current_user)
+        db.session.execute(event_attendees.delete().where(
+            event_attendees.c.user_id == current_user.id,
+            event_attendees.c.event_id == event.id
+        ))
+        event.updated_at = datetime.datetime.utcnow()
+        member_stats.bump(current_user.id, events=-1)
         db.session.commit()
+        response_cache.invalidate('events')
         return jsonify({'message': 'Registration cancelled'}), 200
     return jsonify({'message': 'Not registered'}), 400
 
@@ -78,6 +134,8 @@ def delete_event(current_user, id):
     if not event:
         return jsonify({'message': 'Event not found'}), 404
         
+    member_stats.bump([u.id for u in event.attendees], events=-1)
     db.session.delete(event)
     db.session.commit()
+    response_cache.invalidate('events')
     return jsonify({'message': 'Event deleted'}), 200
@@ -0,0 +1,110 @@
+from flask import Blueprint, request, jsonify
+from backend.models import Referral, Revenue, Meeting, Event, User, meeting_attendees, event_attendees
+from backend.utils.extensions import db
+from backend.utils.auth import token_required
+from backend.utils.export import ExportError, parse_format, export_response
+from backend.routes.referral_routes import filtered_referral_query
+from backend.routes.revenue_routes import filtered_revenue_query
+from sqlalchemy import literal
+import datetime
+
+export_bp = Blueprint('export', __name__)
+
+def referral_export(current_user, args):
+    # Same filters and visibility as GET /api/referrals
+    sender = db.aliased(User)
+    receiver = db.aliased(User)
+    query = filtered_referral_query(current_user, args).join(
+        sender, Referral.from_member_id == sender.id
+    ).join(
+        receiver, Referral.to_member_id == receiver.id
+    ).with_entities(
+        Referral.id, Referral.created_at, Referral.from_member_id, sender.name, Referral.to_member_id, receiver.name,
+        Referral.contact_name, Referral.email, Referral.phone, Referral.referral_type, Referral.status, Referral.comments
+    ).order_by(Referral.created_at.desc(), Referral.id.desc())
+    columns = ['id', 'created_at', 'from_member_id', 'from_member', 'to_member_id', 'to_member',
+               'contact_name', 'email', 'phone', 'referral_type', 'status', 'comments']
+    return columns, [query]
+
+def revenue_export(current_user, args):
+    # Same filters and visibility as GET /api/revenue
+    referrer = db.aliased(User)
+    recipient = db.aliased(User)
+    query = filtered_revenue_query(current_user, args).join(
+        referrer, Revenue.member_id == referrer.id
+    ).join(
+        recipient, Revenue.created_by == recipient.id
+    ).with_entities(
+        Revenue.id, Revenue.date, Revenue.amount, Revenue.type, Revenue.member_id, referrer.name,
+        Revenue.created_by, recipient.name, Revenue.referral_id, Revenue.notes, Revenue.created_at
+    ).order_by(Revenue.created_at.desc(), Revenue.id.desc())
+    columns = ['id', 'date', 'amount', 'type', 'member_id', 'member', 'created_by', 'recorded_by',
+               'referral_id', 'notes', 'created_at']
+    return columns, [query]
+
+def attendance_export(current_user, args):
+    """Meeting and event attendance, one row per member per occasion.
+
+    Filters: kind=meeting|event, member_id (admins; members only see their
+    own), filter=6m|12m and startDate/endDate against the occasion's date.
+    """
+    kind = args.get('kind')
+    if kind not in (None, '', 'meeting', 'event'):
+        raise ExportError('kind must be meeting or event')
+
+    member_id = args.get('member_id')
+    if current_user.role != 'admin':
+        member_id = current_user.id
+    elif member_id:
+        try:
+            member_id = int(member_id)
+        except ValueError:
+            raise ExportError('Invalid member_id')
+
+    start_date = args.get('startDate')
+    if args.get('filter') in ['6m', '12m']:
+        months = 6 if args.get('filter') == '6m' else 12
+        cutoff_date = (datetime.datetime.utcnow() - datetime.timedelta(days=months * 30)).strftime('%Y-%m-%d')
+        start_date = max(start_date or cutoff_date, cutoff_date)
+    end_date = args.get('endDate')
+
+    queries = []
+    for name, model, table, key in [('meeting', Meeting, meeting_attendees, meeting_attendees.c.meeting_id),
+                                    ('event', Event, event_attendees, event_attendees.c.event_id)]:
+        if kind and kind != name:
+            continue
+        query = db.session.query(
+            literal(name), model.id, model.title, model.date, User.id, User.name, User.email
+        ).select_from(table).join(model, model.id == key).join(User, User.id == table.c.user_id)
+        if member_id:
+            query = query.filter(table.c.user_id == member_id)
+        # Dates are stored as YYYY-MM-DD strings, so string comparison orders them
+        if start_date:
+            query = query.filter(model.date >= start_date)
+        if end_date:
+            query = query.filter(model.date <= end_date)
+        queries.append(query.order_by(model.date.desc(), model.id.desc(), User.id))
+
+    columns = ['kind', 'occasion_id', 'title', 'date', 'member_id', 'member', 'email']
+    return columns, queries
+
+EXPORTS = {
+    'referrals': referral_export,
+    'revenue': revenue_export,
+    'attendance': attendance_export,
+}
+
+@export_bp.route('/<entity>', methods=['GET'])
+@token_required
+def export(current_user, entity):
+    """Stream ?format=csv (default) or ndjson, filtered like the matching list endpoint."""
+    if entity not in EXPORTS:
+        return jsonify({'message': f"Unknown export, expected one of {', '.join(EXPORTS)}"}), 404
+    try:
+        fmt = parse_format(request.args)
+        columns, queries = EXPORTS[entity](current_user, request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    filename = f"{entity}-{datetime.datetime.utcnow().strftime('%Y-%m-%d')}"
+    return export_response(filename, columns, queries, fmt)
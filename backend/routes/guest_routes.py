@@ -2,10 +2,24 @@ from flask import Blueprint, request, jsonify
 from backend.models import Guest, User
 from backend.utils.extensions import db
 from backend.utils.auth import token_required
+from backend.utils.pagination import paginated_response
+from backend.utils.response_cache import response_cache, member_tag
 from datetime import datetime
 
 guest_bp = Blueprint('guest_bp', __name__)
 
+def serialize_guest(guest):
+    return {
+        'id': guest.id,
+        'name': guest.name,
+        'phone': guest.phone,
+        'email': guest.email,
+        'visit_date': guest.visit_date,
+        'status': guest.status,
+        'notes': guest.notes,
+        'created_at': guest.created_at.strftime('%Y-%m-%d')
+    }
+
 @guest_bp.route('/', methods=['POST'])
 @token_required
 def invite_guest(current_user):
@@ -26,28 +40,15 @@ def invite_guest(current_user):
 
     db.session.add(new_guest)
     db.session.commit()
+    response_cache.invalidate(member_tag(current_user.id))
 
     return jsonify({'message': 'Guest invited successfully!', 'guest_id': new_guest.id}), 201
 
 @guest_bp.route('/', methods=['GET'])
 @token_required
 def get_guests(current_user):
-    guests = Guest.query.filter_by(invited_by=current_user.id).all()
-    
-    output = []
-    for guest in guests:
-        output.append({
-            'id': guest.id,
-            'name': guest.name,
-            'phone': guest.phone,
-            'email': guest.email,
-            'visit_date': guest.visit_date,
-            'status': guest.status,
-            'notes': guest.notes,
-            'created_at': guest.created_at.strftime('%Y-%m-%d')
-        })
-
-    return jsonify(output), 200
+    query = Guest.query.filter_by(invited_by=current_user.id)
+    return paginated_response(query, Guest.created_at, Guest.id, serialize_guest)
 
 @guest_bp.route('/<int:id>', methods=['PUT'])
 @token_required
@@ -67,5 +68,6 @@ def update_guest(current_user, id):
         guest.notes = data['notes']
         
     db.session.commit()
+    response_cache.invalidate(member_tag(current_user.id))
 
     return jsonify({'message': 'Guest updated successfully'}), 200
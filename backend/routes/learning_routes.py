@@ -2,10 +2,23 @@ from flask import Blueprint, request, jsonify
 from backend.models import LearningCredit, User
 from backend.utils.extensions import db
 from backend.utils.auth import token_required
+from backend.utils.pagination import paginated_response
+from backend.utils.response_cache import response_cache, member_tag
 from datetime import datetime
 
 learning_bp = Blueprint('learning_bp', __name__)
 
+def serialize_credit(credit):
+    return {
+        'id': credit.id,
+        'topic': credit.topic,
+        'source': credit.source,
+        'duration_hours': credit.duration_hours,
+        'date': credit.date,
+        'notes': credit.notes,
+        'created_at': credit.created_at.strftime('%Y-%m-%d')
+    }
+
 @learning_bp.route('/', methods=['POST'])
 @token_required
 def submit_ceu(current_user):
@@ -25,24 +38,12 @@ def submit_ceu(current_user):
 
     db.session.add(new_credit)
     db.session.commit()
+    response_cache.invalidate(member_tag(current_user.id))
 
     return jsonify({'message': 'Learning credit submitted successfully!', 'credit_id': new_credit.id}), 201
 
 @learning_bp.route('/', methods=['GET'])
 @token_required
 def get_ceus(current_user):
-    credits = LearningCredit.query.filter_by(member_id=current_user.id).order_by(LearningCredit.created_at.desc()).all()
-    
-    output = []
-    for credit in credits:
-        output.append({
-            'id': credit.id,
-            'topic': credit.topic,
-            'source': credit.source,
-            'duration_hours': credit.duration_hours,
-            'date': credit.date,
-            'notes': credit.notes,
-            'created_at': credit.created_at.strftime('%Y-%m-%d')
-        })
-
-    return jsonify(output), 200
+    query = LearningCredit.query.filter_by(member_id=current_user.id)
+    return paginated_response(query, LearningCredit.created_at, LearningCredit.id, serialize_credit)
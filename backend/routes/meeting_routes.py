@@ -1,13 +1,82 @@
 from flask import Blueprint, request, jsonify
-from backend.models import Meeting, User
+from backend.models import Meeting, User, meeting_attendees
 from backend.utils.extensions import db
 from backend.utils.auth import token_required, admin_required
+from backend.utils import member_stats
+from backend.utils.pagination import paginated_response
+from backend.utils.response_cache import cached, response_cache
+from backend.utils.sql_stats import query_budget
+from sqlalchemy import func
 import datetime
 
 meeting_bp = Blueprint('meetings', __name__)
 
+# Ids per IN (...) list: only there to stay under the bind-parameter limit (SQLite 32766,
+# PostgreSQL 65535), so any realistic listing, even ?paginate=false, takes a single query
+ID_CHUNK = 30000
+
+def load_attendance(meeting_ids, with_participants):
+    """Attendee counts, and participant lists if asked for, for a batch of meetings.
+
+    One query per ID_CHUNK meetings instead of two per meeting.
+    """
+    counts = dict.fromkeys(meeting_ids, 0)
+    participants = {mid: [] for mid in meeting_ids} if with_participants else None
+
+    for start in range(0, len(meeting_ids), ID_CHUNK):
+        chunk = meeting_ids[start:start + ID_CHUNK]
+        if with_participants:
+            rows = db.session.query(
+                meeting_attendees.c.meeting_id, User.id, User.name, User.email
+            ).join(User, User.id == meeting_attendees.c.user_id).filter(
+                meeting_attendees.c.meeting_id.in_(chunk)
+            ).order_by(meeting_attendees.c.meeting_id, User.id)
+            for meeting_id, user_id, name, email in rows:
+                participants[meeting_id].append({
+                    'id': str(user_id),
+                    'name': name,
+                    'email': email
+                })
+                counts[meeting_id] += 1
+        else:
+            rows = db.session.query(
+                meeting_attendees.c.meeting_id, func.count()
+            ).filter(meeting_attendees.c.meeting_id.in_(chunk)).group_by(meeting_attendees.c.meeting_id)
+            counts.update(dict(rows.all()))
+
+    return counts, participants
+
+def serialize_meeting(m, attendee_count, participants=None):
+    # Construct date_time if mostly likely needed, or just let frontend handle it.
+    # Frontend uses meeting.date_time.
+    date_str = m.date if m.date else ""
+    time_str = m.time if m.time else ""
+    dt = f"{date_str}T{time_str}" if date_str and time_str else None
+    
+    result = {
+        'id': str(m.id),
+        '_id': str(m.id),
+        'title': m.title,
+        'date': m.date,
+        'time': m.time,
+        'date_time': dt, # Added for frontend compatibility
+        'location': m.location,
+        'description': m.description,
+        'type': m.type,
+        'meeting_mode': m.meeting_mode,
+        'meet_link': m.meet_link,
+        'fee': m.fee,
+        'organizer_id': str(m.organized_by) if m.organized_by else None,
+        'attendee_count': attendee_count
+    }
+    if participants is not None:
+        result['participants'] = participants # Only with ?include=participants
+    return result
+
 @meeting_bp.route('/', methods=['GET'])
 @token_required
+@cached('meetings', 'users')  # participant names come from users
+@query_budget(4)  # auth lookup, page version, meeting page, one attendance query per ID_CHUNK meetings
 def get_meetings(current_user):
     time_filter = request.args.get('filter')
     query = Meeting.query
@@ -18,39 +87,20 @@ def get_meetings(current_user):
         cutoff_date = (datetime.datetime.utcnow() - datetime.timedelta(days=months * 30)).strftime('%Y-%m-%d')
         query = query.filter(Meeting.date >= cutoff_date)
 
-    meetings = query.order_by(Meeting.date.desc()).all()
-    result = []
-    for m in meetings:
-        participants = [{
-            'id': str(u.id),
-            'name': u.name,
-            'email': u.email
-        } for u in m.attendees]
-        
-        # Construct date_time if mostly likely needed, or just let frontend handle it.
-        # Frontend uses meeting.date_time.
-        date_str = m.date if m.date else ""
-        time_str = m.time if m.time else ""
-        dt = f"{date_str}T{time_str}" if date_str and time_str else None
-        
-        result.append({
-            'id': str(m.id),
-            '_id': str(m.id),
-            'title': m.title,
-            'date': m.date,
-            'time': m.time,
-            'date_time': dt, # Added for frontend compatibility
-            'location': m.location,
-            'description': m.description,
-            'type': m.type,
-            'meeting_mode': m.meeting_mode,
-            'meet_link': m.meet_link,
-            'fee': m.fee,
-            'organizer_id': str(m.organized_by) if m.organized_by else None,
-            'attendee_count': m.attendees.count(),
-            'participants': participants # Added list of participants
-        })
-    return jsonify(result), 200
+    # Participant arrays are opt-in (?include=participants); counts are always returned
+    include = {part.strip() for part in request.args.get('include', '').split(',')}
+    with_participants = 'participants' in include
+
+    def serialize_page(meetings):
+        counts, participants = load_attendance([m.id for m in meetings], with_participants)
+        return [
+            serialize_meeting(m, counts[m.id], participants[m.id] if with_participants else None)
+            for m in meetings
+        ]
+
+    # Meetings are listed by meeting date rather than creation time, so page on (date, id).
+    # Attendees are users: deleting or renaming one changes the counts and participant lists.
+    return paginated_response(query, Meeting.date, Meeting.id, serialize_rows=serialize_page, depends_on=(User,))
 
 @meeting_bp.route('/', methods=['POST'])
 @token_required
@@ -93,6 +143,7 @@ def create_meeting(current_user):
         )
         db.session.add(new_meeting)
         db.session.commit()
+        response_cache.invalidate('meetings')
         return jsonify({'message': 'Meeting scheduled', 'id': str(new_meeting.id)}), 201
     except Exception as e:
         import traceback
@@ -113,6 +164,7 @@ def update_meeting(current_user, id):
             setattr(meeting, key, value)
             
     db.session.commit()
+    response_cache.invalidate('meetings')
     return jsonify({'message': 'Meeting updated'}), 200
 
 @meeting_bp.route('/<id>/register', methods=['POST'])
@@ -123,12 +175,15 @@ def register_meeting(current_user, id):
         return jsonify({'message': 'Meeting not found'}), 404
         
     # Check if already registered
-    # current_user is a User object from token_required
+    # current_user is the cached Principal from token_required, not a User row
     if meeting.attendees.filter_by(id=current_user.id).first():
          return jsonify({'message': 'Already registered'}), 400
          
-    meeting.attendees.append(current_user)
+    db.session.execute(meeting_attendees.insert().values(user_id=current_user.id, meeting_id=meeting.id))
+    meeting.updated_at = datetime.datetime.utcnow() # attendee_count changed; moves the list's ETag
+    member_stats.bump(current_user.id, meetings=1)
     db.session.commit()
+    response_cache.invalidate('meetings')
     return jsonify({'message': 'Registered successfully'}), 200
 
 @meeting_bp.route('/<id>', methods=['DELETE'])
@@ -139,6 +194,8 @@ def delete_meeting(current_user, id):
     if not meeting:
         return jsonify({'message': 'Meeting not found'}), 404
         
+    member_stats.bump([u.id for u in meeting.attendees], meetings=-1)
     db.session.delete(meeting)
     db.session.commit()
+    response_cache.invalidate('meetings')
     return jsonify({'message': 'Meeting deleted'}), 200
@@ -1,29 +1,35 @@
 from flask import Blueprint, request, jsonify
-from backend.models import Notification, User
+from backend.models import Notification, User, Broadcast
 from backend.utils.extensions import db
 from backend.utils.auth import token_required, admin_required
-from backend.utils.email_service import send_email
+from backend.utils.email_service import send_bulk_email
+from backend.utils.pagination import paginated_response
+from backend.utils.response_cache import response_cache, member_tag
+from sqlalchemy import select, insert, literal, String, Boolean, DateTime, Integer
+from sqlalchemy.orm import joinedload
+from datetime import datetime
 
 notification_bp = Blueprint('notifications', __name__)
 
+def serialize_notification(n):
+    broadcast = n.broadcast if n.broadcast_id else None
+    return {
+        'id': str(n.id),
+        '_id': str(n.id),
+        'user_id': str(n.user_id),
+        'type': n.type,
+        'message': n.message,
+        'subject': broadcast.subject if broadcast else n.subject,
+        'content': broadcast.message if broadcast else n.content,
+        'read_status': n.read_status,
+        'created_at': n.created_at.isoformat() if n.created_at else None
+    }
+
 @notification_bp.route('/', methods=['GET'])
 @token_required
 def get_notifications(current_user):
-    notifications = Notification.query.filter_by(user_id=current_user.id).order_by(Notification.created_at.desc()).all()
-    result = []
-    for n in notifications:
-        result.append({
-            'id': str(n.id),
-            '_id': str(n.id),
-            'user_id': str(n.user_id),
-            'type': n.type,
-            'message': n.message,
-            'subject': n.subject,
-            'content': n.content,
-            'read_status': n.read_status,
-            'created_at': n.created_at.isoformat() if n.created_at else None
-        })
-    return jsonify(result), 200
+    query = Notification.query.filter_by(user_id=current_user.id).options(joinedload(Notification.broadcast))
+    return paginated_response(query, Notification.created_at, Notification.id, serialize_notification)
 
 @notification_bp.route('/broadcast', methods=['POST'])
 @token_required
@@ -33,40 +39,48 @@ def send_broadcast(current_user):
     subject = data.get('subject')
     content = data.get('content')
     group = data.get('recipientGroup', 'all')
+    if not subject or not content:
+        return jsonify({'message': 'Subject and content are required'}), 400
     
     # Filter users logic (simple implementation)
-    query = User.query
+    audience = []
     if group == 'premium':
         # Assuming membership_tier exists or we simulate
-        # query = query.filter(User.membership_tier.in_(['Premium', 'Gold']))
+        # audience.append(User.membership_tier.in_(['Premium', 'Gold']))
         pass 
     elif group == 'active':
-        # query = query.filter_by(status='active')
+        # audience.append(User.status == 'active')
         pass
-        
-    recipients = query.all()
-    
-    email_list = []
-    for user in recipients:
-        new_notif = Notification(
-            user_id=user.id,
-            type='broadcast',
-            subject=subject,
-            content=content,
-            message=f"{subject}: {content[:50]}...",
-            read_status=False
-        )
-        db.session.add(new_notif)
-        
-        if user.email:
-            email_list.append(user.email)
-            
+
+    # The body is stored once; each recipient only gets a short notification row pointing at it
+    broadcast = Broadcast(subject=subject, message=content, role=group, created_by=current_user.id)
+    db.session.add(broadcast)
+    db.session.flush()
+
+    summary = f"{subject}: {content[:50]}..."[:255]
+    rows = select(
+        User.id,
+        literal('broadcast', String),
+        literal(summary, String),
+        literal(False, Boolean),
+        literal(datetime.utcnow(), DateTime),
+        literal(broadcast.id, Integer)
+    ).where(*audience)
+    result = db.session.execute(insert(Notification).from_select(
+        ['user_id', 'type', 'message', 'read_status', 'created_at', 'broadcast_id'], rows
+    ))
+    recipient_count = result.rowcount
+
+    email_list = db.session.execute(
+        select(User.email).where(*audience, User.email.isnot(None), User.email != '')
+    ).scalars().all()
     db.session.commit()
+    response_cache.invalidate('notifications')
 
     if email_list:
-        send_email(subject, email_list, content)
+        send_bulk_email(subject, email_list, content)
         
-    return jsonify({'message': f'Broadcast sent to {len(recipients)} members'}), 200
+    return jsonify({'message': f'Broadcast sent to {recipient_count} members'}), 200
 
 @notification_bp.route('/<id>/read', methods=['PUT'])
 @token_required
@@ -75,5 +89,6 @@ def mark_read(current_user, id):
     if notification and notification.user_id == current_user.id:
         notification.read_status = True
         db.session.commit()
+        response_cache.invalidate(member_tag(current_user.id))
         return jsonify({'message': 'Marked as read'}), 200
     return jsonify({'message': 'Notification not found or access denied'}), 404
@@ -3,17 +3,49 @@ from backend.models import Referral, User
 from backend.utils.extensions import db
 from backend.utils.auth import token_required
 from backend.utils.email_service import send_email
+from backend.utils import member_stats, monthly_metrics
+from backend.utils.pagination import paginated_response
+from backend.utils.response_cache import response_cache, member_tag
 from sqlalchemy import or_
 import datetime
 
 referral_bp = Blueprint('referrals', __name__)
 
-@referral_bp.route('/', methods=['GET'])
-@token_required
-def get_referrals(current_user):
-    time_filter = request.args.get('filter')
-    search = request.args.get('search', '').strip()
-    category = request.args.get('category', '').strip()
+def serialize_referral(r):
+    return {
+        'id': str(r.id),
+        '_id': str(r.id),
+        'from_member': str(r.from_member_id),
+        'to_member': str(r.to_member_id),
+        'contact_name': r.contact_name,
+        'email': r.email,
+        'phone': r.phone,
+        'referral_type': r.referral_type,
+        'comments': r.comments,
+        'status': r.status,
+        'created_at': r.created_at.isoformat() if r.created_at else None
+    }
+
+def parse_day(value, name):
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f'Invalid {name}, expected YYYY-MM-DD')
+
+def filtered_referral_query(current_user, args):
+    """Referral query with the list filters applied and scoped to what current_user may see.
+
+    Member conditions are EXISTS subqueries, so every referral appears once
+    however many of its members match. Raises ValueError for malformed filters.
+    """
+    time_filter = args.get('filter')
+    search = args.get('search', '').strip()
+    category = args.get('category', '').strip()
+    status = args.get('status', '').strip()
+    referral_type = args.get('referral_type', '').strip()
+    start_date = args.get('startDate')
+    end_date = args.get('endDate')
+    counterparty = args.get('counterparty')
     query = Referral.query
 
     if time_filter in ['6m', '12m']:
@@ -21,46 +53,54 @@ def get_referrals(current_user):
         cutoff_date = datetime.datetime.utcnow() - datetime.timedelta(days=months * 30)
         query = query.filter(Referral.created_at >= cutoff_date)
 
+    if start_date:
+        query = query.filter(Referral.created_at >= parse_day(start_date, 'startDate'))
+    if end_date:
+        # Inclusive: everything before the start of the next day
+        query = query.filter(Referral.created_at < parse_day(end_date, 'endDate') + datetime.timedelta(days=1))
+
+    if status:
+        query = query.filter(Referral.status == status)
+    if referral_type:
+        query = query.filter(Referral.referral_type == referral_type)
+
+    if counterparty:
+        # Referrals sent to or received from this member
+        try:
+            counterparty = int(counterparty)
+        except ValueError:
+            raise ValueError('Invalid counterparty')
+        query = query.filter(or_(Referral.from_member_id == counterparty, Referral.to_member_id == counterparty))
+
     if search:
-        query = query.join(User, or_(Referral.from_member_id == User.id, Referral.to_member_id == User.id), isouter=True).filter(
-            or_(
-                Referral.contact_name.ilike(f'%{search}%'),
-                User.name.ilike(f'%{search}%')
-            )
-        )
-    
+        query = query.filter(or_(
+            Referral.contact_name.ilike(f'%{search}%'),
+            Referral.sender.has(User.name.ilike(f'%{search}%')),
+            Referral.receiver.has(User.name.ilike(f'%{search}%'))
+        ))
+
     if category:
-        # Filter where either sender or receiver is in that category
-        # Using aliased joins would be cleaner but let's try a simpler approach assuming User is joined
-        query = query.join(User, or_(Referral.from_member_id == User.id, Referral.to_member_id == User.id), isouter=True).filter(
-            User.business_category == category
-        )
+        # Either sender or receiver is in that category
+        query = query.filter(or_(
+            Referral.sender.has(User.business_category == category),
+            Referral.receiver.has(User.business_category == category)
+        ))
 
-    if current_user.role == 'admin':
-        referrals = query.order_by(Referral.created_at.desc()).all()
-    else:
+    if current_user.role != 'admin':
         # Fetch logic: Either from_member or to_member is current user
-        referrals = query.filter(
+        query = query.filter(
             or_(Referral.from_member_id == current_user.id, Referral.to_member_id == current_user.id)
-        ).order_by(Referral.created_at.desc()).all()
-
-    result = []
-    for r in referrals:
-        result.append({
-            'id': str(r.id),
-            '_id': str(r.id),
-            'from_member': str(r.from_member_id),
-            'to_member': str(r.to_member_id),
-            'contact_name': r.contact_name,
-            'email': r.email,
-            'phone': r.phone,
-            'referral_type': r.referral_type,
-            'comments': r.comments,
-            'status': r.status,
-            'created_at': r.created_at.isoformat() if r.created_at else None
-        })
-    
-    return jsonify(result), 200
+        )
+    return query
+
+@referral_bp.route('/', methods=['GET'])
+@token_required
+def get_referrals(current_user):
+    try:
+        query = filtered_referral_query(current_user, request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return paginated_response(query, Referral.created_at, Referral.id, serialize_referral)
 
 @referral_bp.route('/', methods=['POST'])
 @token_required
@@ -90,7 +130,10 @@ def add_referral(current_user):
     )
     
     db.session.add(new_referral)
+    member_stats.bump(current_user.id, referrals=1)
+    monthly_metrics.record(None, new_referral, current_user, referrals=1)
     db.session.commit()
+    response_cache.invalidate('referrals', member_tag(current_user.id), member_tag(to_member_id))
     
     # Send Email only if requested and recipient has email
     send_notification = data.get('send_email', True) # Default to True if missing, or maybe False based on preference? User has checkbox, so respects that.
@@ -118,6 +161,7 @@ def update_referral(current_user, id):
         referral.comments = data['comments']
         
     db.session.commit()
+    response_cache.invalidate('referrals', member_tag(referral.from_member_id), member_tag(referral.to_member_id))
     return jsonify({'message': 'Referral updated'}), 200
 
 @referral_bp.route('/<id>', methods=['DELETE'])
@@ -127,8 +171,12 @@ def delete_referral(current_user, id):
     if not referral:
         return jsonify({'message': 'Referral not found'}), 404
         
+    member_stats.bump(referral.from_member_id, referrals=-1)
+    monthly_metrics.record(referral.created_at, referral, referral.sender, referrals=-1)
+    members = member_tag(referral.from_member_id), member_tag(referral.to_member_id)
     db.session.delete(referral)
     db.session.commit()
+    response_cache.invalidate('referrals', *members)
     return jsonify({'message': 'Referral deleted'}), 200
 
 @referral_bp.route('/<id>/close', methods=['PATCH'])
@@ -138,5 +186,6 @@ def close_referral(current_user, id):
     if referral:
         referral.status = 'Closed'
         db.session.commit()
+        response_cache.invalidate('referrals', member_tag(referral.from_member_id), member_tag(referral.to_member_id))
         return jsonify({'message': 'Referral closed'}), 200
     return jsonify({'message': 'Referral not found'}), 404
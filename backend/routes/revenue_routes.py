@@ -3,19 +3,38 @@ from backend.models import Revenue, User
 from backend.utils.extensions import db
 from backend.utils.auth import token_required, admin_required
 from backend.utils.email_service import send_email
-from sqlalchemy import or_
+from backend.utils import monthly_metrics
+from backend.utils.pagination import paginated_response
+from backend.utils.response_cache import response_cache, member_tag
+from sqlalchemy import or_, func, cast, Integer
 import datetime
 
 revenue_bp = Blueprint('revenue', __name__)
 
-@revenue_bp.route('/', methods=['GET'])
-@token_required
-def get_revenue(current_user):
-    time_filter = request.args.get('filter')
-    member_id = request.args.get('member_id')
-    category = request.args.get('category')
-    start_date = request.args.get('startDate')
-    end_date = request.args.get('endDate')
+def serialize_revenue(r):
+    return {
+        'id': str(r.id),
+        '_id': str(r.id),
+        'amount': r.amount,
+        'type': r.type,
+        'member_id': str(r.member_id),
+        'created_by': str(r.created_by),
+        'referral_id': str(r.referral_id) if r.referral_id else None,
+        'notes': r.notes,
+        'date': r.date,
+        'created_at': r.created_at.isoformat() if r.created_at else None
+    }
+
+def filtered_revenue_query(current_user, args):
+    """Revenue query with the list filters applied and scoped to what current_user may see.
+
+    Shared by the list, total and summary endpoints so they always agree.
+    """
+    time_filter = args.get('filter')
+    member_id = args.get('member_id')
+    category = args.get('category')
+    start_date = args.get('startDate')
+    end_date = args.get('endDate')
     
     query = Revenue.query
 
@@ -40,32 +59,21 @@ def get_revenue(current_user):
     if end_date:
         query = query.filter(Revenue.date <= end_date)
 
-    if current_user.role == 'admin':
-        revenue = query.order_by(Revenue.created_at.desc()).all()
-    else:
+    if current_user.role != 'admin':
         # Use SQLAlchemy OR
-        revenue = query.filter(
+        query = query.filter(
             or_(
                 Revenue.member_id == current_user.id,
                 Revenue.created_by == current_user.id
             )
-        ).order_by(Revenue.created_at.desc()).all()
-
-    result = []
-    for r in revenue:
-        result.append({
-            'id': str(r.id),
-            '_id': str(r.id),
-            'amount': r.amount,
-            'type': r.type,
-            'member_id': str(r.member_id),
-            'created_by': str(r.created_by),
-            'referral_id': str(r.referral_id) if r.referral_id else None,
-            'notes': r.notes,
-            'date': r.date,
-            'created_at': r.created_at.isoformat() if r.created_at else None
-        })
-    return jsonify(result), 200
+        )
+    return query
+
+@revenue_bp.route('/', methods=['GET'])
+@token_required
+def get_revenue(current_user):
+    query = filtered_revenue_query(current_user, request.args)
+    return paginated_response(query, Revenue.created_at, Revenue.id, serialize_revenue)
 
 @revenue_bp.route('/', methods=['POST'])
 @token_required
@@ -91,12 +99,14 @@ def add_revenue(current_user):
         date=data.get('date', datetime.datetime.utcnow().strftime('%Y-%m-%d'))
     )
     
+    recipient = User.query.get(member_id) # Member who gave the business
     db.session.add(new_revenue)
+    monthly_metrics.record(monthly_metrics.revenue_month(new_revenue.date), new_revenue, recipient, revenue=amount, revenue_count=1)
     db.session.commit()
+    response_cache.invalidate('revenue', member_tag(member_id), member_tag(current_user.id))
     
     # Send Thank You Email to the member who gave the referral/business
     try:
-        recipient = User.query.get(member_id)
         if recipient and recipient.email:
             send_email(
                 subject=f"New Thank You Slip from {current_user.name}",
@@ -128,11 +138,20 @@ def update_revenue(current_user, id):
         return jsonify({'message': 'Record not found'}), 404
         
     if 'amount' in data:
-        revenue.amount = data['amount']
+        try:
+            amount = float(data['amount'])
+        except (ValueError, TypeError):
+            return jsonify({'message': 'Invalid amount'}), 400
+        monthly_metrics.record(
+            monthly_metrics.revenue_month(revenue.date, revenue.created_at), revenue, revenue.referrer,
+            revenue=amount - revenue.amount
+        )
+        revenue.amount = amount
     if 'notes' in data:
         revenue.notes = data['notes']
         
     db.session.commit()
+    response_cache.invalidate('revenue', member_tag(revenue.member_id), member_tag(revenue.created_by))
     return jsonify({'message': 'Revenue updated'}), 200
 
 @revenue_bp.route('/<id>', methods=['DELETE'])
@@ -143,30 +162,103 @@ def delete_revenue(current_user, id):
     if not revenue:
         return jsonify({'message': 'Record not found'}), 404
         
+    monthly_metrics.record(
+        monthly_metrics.revenue_month(revenue.date, revenue.created_at), revenue, revenue.referrer,
+        revenue=-revenue.amount, revenue_count=-1
+    )
+    members = member_tag(revenue.member_id), member_tag(revenue.created_by)
     db.session.delete(revenue)
     db.session.commit()
+    response_cache.invalidate('revenue', *members)
     return jsonify({'message': 'Revenue deleted'}), 200
 @revenue_bp.route('/total', methods=['GET'])
 @token_required
 @admin_required
 def get_total_revenue(current_user):
-    revenue = Revenue.query.all()
-    total = sum(r.amount for r in revenue)
+    total = filtered_revenue_query(current_user, request.args).with_entities(
+        func.coalesce(func.sum(Revenue.amount), 0)
+    ).scalar()
     return jsonify({'total': total}), 200
 
+# Revenue.date is a YYYY-MM-DD string; only well-formed dates go into the period series
+DATED = Revenue.date.like('____-__-__')
+# Labelled so ORDER BY can refer to the select columns by name
+YEAR = func.substr(Revenue.date, 1, 4).label('year')
+PERIODS = {
+    'month': [YEAR, func.substr(Revenue.date, 6, 2).label('month')],
+    'quarter': [YEAR, ((cast(func.substr(Revenue.date, 6, 2), Integer) + 2) // 3).label('quarter')],
+    'year': [YEAR],
+}
+
+def format_period(period, key):
+    if period == 'month':
+        return f"{key[0]}-{key[1]}"
+    if period == 'quarter':
+        return f"{key[0]}-Q{int(key[1])}"
+    return key[0]
+
+@revenue_bp.route('/summary', methods=['GET'])
+@token_required
+def get_revenue_summary(current_user):
+    # Totals, a period series and per-member/per-category breakdowns, all aggregated by the database.
+    # Takes the same filters as GET /api/revenue plus ?period=month|quarter|year and ?top=N
+    period = request.args.get('period', 'month')
+    if period not in PERIODS:
+        return jsonify({'message': 'period must be one of month, quarter, year'}), 400
+    try:
+        top = min(max(int(request.args.get('top', 20)), 1), 500)
+    except ValueError:
+        return jsonify({'message': 'Invalid top'}), 400
+
+    query = filtered_revenue_query(current_user, request.args)
+    total_amount = func.coalesce(func.sum(Revenue.amount), 0)
+    record_count = func.count(Revenue.id)
+
+    total, count = query.with_entities(total_amount, record_count).one()
+
+    keys = PERIODS[period]
+    series = query.filter(DATED).with_entities(*keys, total_amount, record_count).group_by(*keys).order_by(*keys).all()
+
+    referrer = db.aliased(User)
+    by_member = query.join(referrer, Revenue.member_id == referrer.id, isouter=True).with_entities(
+        Revenue.member_id, referrer.name, total_amount, record_count
+    ).group_by(Revenue.member_id, referrer.name).order_by(total_amount.desc()).limit(top).all()
+
+    by_category = query.join(referrer, Revenue.member_id == referrer.id, isouter=True).with_entities(
+        referrer.business_category, total_amount, record_count
+    ).group_by(referrer.business_category).order_by(total_amount.desc()).all()
+
+    return jsonify({
+        'total': total,
+        'count': count,
+        'period': period,
+        'series': [{
+            'period': format_period(period, row[:-2]),
+            'total': row[-2],
+            'count': row[-1]
+        } for row in series],
+        'by_member': [{
+            'member_id': str(member_id),
+            'name': name,
+            'total': amount,
+            'count': n
+        } for member_id, name, amount, n in by_member],
+        'by_category': [{
+            'category': category or 'Uncategorized',
+            'total': amount,
+            'count': n
+        } for category, amount, n in by_category]
+    }), 200
+
 @revenue_bp.route('/monthly', methods=['GET'])
 @token_required
 @admin_required
 def get_monthly_revenue(current_user):
-    revenue = Revenue.query.all()
-    monthly = {}
-    for r in revenue:
-        # Assuming date is string YYYY-MM-DD
-        try:
-            date_obj = datetime.datetime.strptime(r.date, '%Y-%m-%d')
-            month = date_obj.strftime('%B')
-        except:
-            month = 'Unknown'
-            
-        monthly[month] = monthly.get(month, 0) + r.amount
+    # Keyed by YYYY-MM so different years stay apart; read from the monthly rollup
+    series = monthly_metrics.monthly_series(
+        'revenue',
+        chapter=request.args.get('chapter'),
+        category=request.args.get('category')
+    )
+    monthly = {f"{year:04d}-{month:02d}": total for year, month, total in series}
     return jsonify(monthly), 200
@@ -0,0 +1,82 @@
+from flask import Blueprint, request, jsonify
+from backend.models import Referral, Revenue, Meeting, Notification
+from backend.utils.auth import token_required
+from backend.utils import sync
+from backend.routes.referral_routes import filtered_referral_query, serialize_referral
+from backend.routes.revenue_routes import filtered_revenue_query, serialize_revenue
+from backend.routes.meeting_routes import load_attendance, serialize_meeting
+from backend.routes.notification_routes import serialize_notification
+from sqlalchemy.orm import joinedload
+import datetime
+
+sync_bp = Blueprint('sync', __name__)
+
+def referral_changes(current_user, since, limit):
+    # Same visibility as GET /api/referrals
+    rows = filtered_referral_query(current_user, {}).filter(Referral.updated_at > since).order_by(
+        Referral.updated_at
+    ).limit(limit + 1).all()
+    return [serialize_referral(r) for r in rows]
+
+def revenue_changes(current_user, since, limit):
+    rows = filtered_revenue_query(current_user, {}).filter(Revenue.updated_at > since).order_by(
+        Revenue.updated_at
+    ).limit(limit + 1).all()
+    return [serialize_revenue(r) for r in rows]
+
+def meeting_changes(current_user, since, limit):
+    # Registrations touch the meeting's updated_at, so attendee counts come along
+    rows = Meeting.query.filter(Meeting.updated_at > since).order_by(Meeting.updated_at).limit(limit + 1).all()
+    counts, _ = load_attendance([m.id for m in rows], False)
+    return [serialize_meeting(m, counts[m.id]) for m in rows]
+
+def notification_changes(current_user, since, limit):
+    rows = Notification.query.filter(
+        Notification.user_id == current_user.id, Notification.updated_at > since
+    ).options(joinedload(Notification.broadcast)).order_by(Notification.updated_at).limit(limit + 1).all()
+    return [serialize_notification(n) for n in rows]
+
+SYNCED = {
+    'referrals': referral_changes,
+    'revenue': revenue_changes,
+    'meetings': meeting_changes,
+    'notifications': notification_changes,
+}
+
+@sync_bp.route('/', methods=['GET'])
+@token_required
+def get_changes(current_user):
+    """Rows created, updated or deleted since ?since=<token>, per entity.
+
+    Without since (first run) or when the token is too old or too much
+    changed, the response has reset: true and no changes; the client
+    refetches its lists and syncs from the returned token afterwards.
+    ?entities=referrals,notifications limits what is checked.
+    """
+    entities = [e.strip() for e in request.args.get('entities', ','.join(SYNCED)).split(',') if e.strip()]
+    unknown = [e for e in entities if e not in SYNCED]
+    if unknown:
+        return jsonify({'message': f"Unknown entities {', '.join(unknown)}, expected some of {', '.join(SYNCED)}"}), 400
+
+    # Taken before reading, so anything committed during this request is in the next delta
+    now = datetime.datetime.utcnow()
+    token = sync.next_token(now)
+    since = request.args.get('since')
+    if not since:
+        return jsonify({'token': token, 'reset': True, 'changes': {}}), 200
+    try:
+        since = sync.decode_token(since)
+    except sync.SyncError as e:
+        return jsonify({'message': str(e)}), 400
+    if sync.token_expired(since, now):
+        return jsonify({'token': token, 'reset': True, 'changes': {}}), 200
+
+    changes = {}
+    for entity in entities:
+        upserted = SYNCED[entity](current_user, since, sync.MAX_CHANGES)
+        deleted = sync.deleted_since(entity, since, current_user)
+        if len(upserted) > sync.MAX_CHANGES or len(deleted) > sync.MAX_CHANGES:
+            return jsonify({'token': token, 'reset': True, 'changes': {}}), 200
+        changes[entity] = {'upserted': upserted, 'deleted': deleted}
+
+    return jsonify({'token': token, 'reset': False, 'changes': changes}), 200
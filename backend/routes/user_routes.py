@@ -1,12 +1,37 @@
-from flask import Blueprint, request, jsonify
-from backend.models import User
+from collections import Counter
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy import or_, update
+from backend.models import User, Referral, Revenue, Notification, Guest, LearningCredit, OneToOne, Broadcast
 from backend.utils.extensions import db
-from backend.utils.auth import token_required, admin_required
+from backend.utils import photo_store, typeahead
+from backend.utils.typeahead import member_index
+from backend.utils.auth import token_required, admin_required, invalidate_principal
+from backend.utils import member_stats, monthly_metrics, member_import
+from backend.utils.pagination import paginated_response
+from backend.utils.response_cache import cached, response_cache, member_tag
 
 user_bp = Blueprint('users', __name__)
 
+def serialize_user(u):
+    photos = photo_store.photo_urls(u.id, u.photo_key)
+    return {
+        'id': str(u.id),
+        '_id': str(u.id),
+        'name': u.name,
+        'email': u.email,
+        'role': u.role,
+        'phone': u.phone,
+        'chapter': u.chapter,
+        'business_category': u.business_category,
+        'membership_plan': u.membership_plan,
+        # URLs, not image data; the directory stays small however many members have photos
+        'photo': photos['thumb'] if photos else None,
+        'photos': photos
+    }
+
 @user_bp.route('/', methods=['GET'])
 @token_required
+@cached('users')
 def get_users(current_user):
     search = request.args.get('search', '').strip()
     category = request.args.get('category', '').strip()
@@ -17,22 +42,39 @@ def get_users(current_user):
     if category:
         query = query.filter(User.business_category == category)
         
-    users = query.all()
-    result = []
-    for u in users:
-        result.append({
-            'id': str(u.id),
-            '_id': str(u.id),
-            'name': u.name,
-            'email': u.email,
-            'role': u.role,
-            'phone': u.phone,
-            'chapter': u.chapter,
-            'business_category': u.business_category,
-            'membership_plan': u.membership_plan,
-            'photo': u.photo
-        })
-    return jsonify(result), 200
+    return paginated_response(query, User.created_at, User.id, serialize_user)
+
+@user_bp.route('/suggest', methods=['GET'])
+@token_required
+def suggest_users(current_user):
+    # Compact matches for member pickers, from the in-memory typeahead index
+    try:
+        limit = int(request.args.get('limit', typeahead.DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({'message': 'Invalid limit'}), 400
+    limit = min(max(limit, 1), typeahead.MAX_LIMIT)
+
+    member_index.ensure_fresh()
+    return jsonify(member_index.suggest(request.args.get('q', ''), limit)), 200
+
+@user_bp.route('/import', methods=['POST'])
+@token_required
+@admin_required
+def import_users(current_user):
+    # CSV (as the body or a multipart 'file') or a JSON list of members; ?dry_run=true only validates
+    upload = request.files.get('file')
+    try:
+        if upload:
+            rows = member_import.parse_rows(upload.read(), upload.mimetype or '')
+        else:
+            rows = member_import.parse_rows(request.get_data(), request.content_type or '')
+    except member_import.MemberImportError as e:
+        return jsonify({'message': str(e)}), 400
+
+    dry_run = request.args.get('dry_run', '').lower() in ('true', '1', 'yes')
+    result = member_import.import_members(rows, dry_run=dry_run)
+    status = 201 if result['created'] else 200 if not result['failed'] else 422
+    return jsonify(result), status
 
 @user_bp.route('/<id>', methods=['PUT'])
 @token_required
@@ -47,17 +89,85 @@ def update_user(current_user, id):
         return jsonify({'message': 'User not found'}), 404
 
     # Allow partial updates
-    allowed_fields = ['name', 'phone', 'business_category', 'chapter', 'photo', 'bio', 'membership_plan']
+    allowed_fields = ['name', 'phone', 'business_category', 'chapter', 'bio', 'membership_plan']
     if current_user.role == 'admin':
         allowed_fields.extend(['role', 'membership_tier', 'membership_status'])
         
     for key, value in data.items():
         if key in allowed_fields:
             setattr(user, key, value)
+
+    # The profile form still sends photo: a new data URL, '' to remove it, or the URL it was given back
+    old_photo_key = user.photo_key
+    photo = data.get('photo')
+    try:
+        if isinstance(photo, str) and photo.startswith('data:'):
+            user.photo_key = photo_store.save_photo(
+                photo_store.get_store(), user.id, photo_store.decode_data_url(photo),
+                current_app.config['PHOTO_MAX_BYTES']
+            )
+        elif 'photo' in data and not photo:
+            user.photo_key = None
+    except photo_store.PhotoError as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 400
             
     db.session.commit()
+    invalidate_principal(user.id)
+    member_index.upsert(user)
+    response_cache.invalidate('users', 'meetings')
+    if old_photo_key and old_photo_key != user.photo_key:
+        photo_store.delete_photo(photo_store.get_store(), user.id, old_photo_key)
     return jsonify({'message': 'User updated successfully'}), 200
 
+def delete_member_rows(user):
+    """Delete the rows that reference user through the session; returns the other members involved.
+
+    Nothing cascades at the database level, so each row goes through
+    db.session.delete(): that keeps the foreign keys satisfied, lets
+    record_tombstones() tell sync clients, and reverses the member_stats and
+    monthly_metric counts the rows added for anyone else.
+    """
+    uid = user.id
+    referrals = Referral.query.filter(or_(Referral.from_member_id == uid, Referral.to_member_id == uid)).all()
+    revenue = Revenue.query.filter(or_(Revenue.member_id == uid, Revenue.created_by == uid)).all()
+    one_to_ones = OneToOne.query.filter(or_(OneToOne.member_id == uid, OneToOne.with_member_id == uid)).all()
+
+    for referral in referrals:
+        if referral.from_member_id != uid:
+            member_stats.bump(referral.from_member_id, referrals=-1)
+        monthly_metrics.record(referral.created_at, referral, referral.sender, referrals=-1)
+    for entry in revenue:
+        monthly_metrics.record(
+            monthly_metrics.revenue_month(entry.date, entry.created_at), entry, entry.referrer,
+            revenue=-(entry.amount or 0), revenue_count=-1
+        )
+    partners = Counter(o.with_member_id if o.member_id == uid else o.member_id for o in one_to_ones)
+    for partner, count in partners.items():
+        member_stats.bump(partner, one_to_ones=-count)
+
+    # Other members' revenue may point at one of these referrals; keep the revenue, drop the link
+    referral_ids = [r.id for r in referrals]
+    if referral_ids:
+        for entry in Revenue.query.filter(Revenue.referral_id.in_(referral_ids), ~Revenue.id.in_([e.id for e in revenue])):
+            entry.referral_id = None
+    db.session.execute(
+        update(Broadcast).where(Broadcast.created_by == uid).values(created_by=None),
+        execution_options={'synchronize_session': False}
+    )
+
+    dependents = referrals + revenue + one_to_ones + Notification.query.filter_by(user_id=uid).all() \
+        + Guest.query.filter_by(invited_by=uid).all() + LearningCredit.query.filter_by(member_id=uid).all()
+    for row in dependents:
+        db.session.delete(row)
+    # Deletes run in mapper order on flush; make sure the rows are gone before the user is
+    db.session.flush()
+
+    others = {r.from_member_id for r in referrals} | {r.to_member_id for r in referrals} \
+        | {e.member_id for e in revenue} | {e.created_by for e in revenue}
+    return others - {uid}
+
+
 @user_bp.route('/<id>', methods=['DELETE'])
 @token_required
 @admin_required
@@ -66,6 +176,79 @@ def delete_user(current_user, id):
     if not user:
         return jsonify({'message': 'User not found'}), 404
         
+    others = delete_member_rows(user)
+    member_stats.forget(user.id)
+    monthly_metrics.record(user.created_at, user, user, new_members=-1)
     db.session.delete(user)
     db.session.commit()
+    invalidate_principal(id)
+    member_index.remove(id)
+    # Their referrals, revenue, notifications and registrations went with them
+    response_cache.invalidate(
+        'users', 'meetings', 'events', 'referrals', 'revenue', 'notifications', *(member_tag(uid) for uid in others)
+    )
+    photo_store.delete_photo(photo_store.get_store(), id)
     return jsonify({'message': 'User deleted successfully'}), 200
+
+@user_bp.route('/<id>/photo', methods=['POST'])
+@token_required
+def upload_user_photo(current_user, id):
+    if current_user.role != 'admin' and str(current_user.id) != id:
+        return jsonify({'message': 'Permission denied'}), 403
+
+    user = User.query.get(id)
+    if not user:
+        return jsonify({'message': 'User not found'}), 404
+
+    # multipart/form-data with a 'photo' file, or JSON {'photo': '<data URL>'}
+    try:
+        if 'photo' in request.files:
+            data = request.files['photo'].read()
+        else:
+            data = photo_store.decode_data_url((request.get_json(silent=True) or {}).get('photo'))
+        old_photo_key = user.photo_key
+        user.photo_key = photo_store.save_photo(
+            photo_store.get_store(), user.id, data, current_app.config['PHOTO_MAX_BYTES']
+        )
+    except photo_store.PhotoError as e:
+        return jsonify({'message': str(e)}), 400
+
+    db.session.commit()
+    response_cache.invalidate('users')
+    if old_photo_key and old_photo_key != user.photo_key:
+        photo_store.delete_photo(photo_store.get_store(), user.id, old_photo_key)
+    return jsonify({'message': 'Photo updated', 'photos': photo_store.photo_urls(user.id, user.photo_key)}), 200
+
+@user_bp.route('/<id>/photo', methods=['DELETE'])
+@token_required
+def delete_user_photo(current_user, id):
+    if current_user.role != 'admin' and str(current_user.id) != id:
+        return jsonify({'message': 'Permission denied'}), 403
+
+    user = User.query.get(id)
+    if not user:
+        return jsonify({'message': 'User not found'}), 404
+
+    old_photo_key = user.photo_key
+    user.photo_key = None
+    db.session.commit()
+    response_cache.invalidate('users')
+    if old_photo_key:
+        photo_store.delete_photo(photo_store.get_store(), user.id, old_photo_key)
+    return jsonify({'message': 'Photo removed'}), 200
+
+# No token so <img src> works without an Authorization header; instead ?v= must name the current
+# photo, which only authenticated responses hand out, so member ids can't be walked for photos
+@user_bp.route('/<id>/photo', methods=['GET'])
+def get_user_photo(id):
+    size = request.args.get('size', 'medium')
+    if size not in photo_store.RENDITIONS:
+        return jsonify({'message': f"size must be one of: {', '.join(photo_store.RENDITIONS)}"}), 400
+
+    photo_key = db.session.query(User.photo_key).filter(User.id == id).scalar()
+    if not photo_key or not photo_store.is_current(photo_key, request.args.get('v', '')):
+        return jsonify({'message': 'Photo not found'}), 404
+    try:
+        return photo_store.send_photo(id, photo_key, size)
+    except FileNotFoundError:
+        return jsonify({'message': 'Photo not found'}), 404
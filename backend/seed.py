@@ -1,8 +1,11 @@
 from backend.app import create_app
-from backend.utils.extensions import db, bcrypt
+from backend.utils.extensions import db
+from backend.utils.passwords import PasswordHasher
 from backend.models import User
 
 app = create_app()
+# Hash inline: a spawn process pool would re-import this module
+hasher = PasswordHasher(workers=0)
 
 def seed_db():
     with app.app_context():
@@ -13,7 +16,7 @@ def seed_db():
         # Check if admin exists
         if not User.query.filter_by(email='admin@nagarbhavibrigades.com').first():
             # Create Admin User
-            hashed_password = bcrypt.generate_password_hash('admin123').decode('utf-8')
+            hashed_password = hasher.hash('admin123')
             admin = User(
                 name='Admin User',
                 email='admin@nagarbhavibrigades.com',
@@ -31,7 +34,7 @@ def seed_db():
         # Check if test member exists
         if not User.query.filter_by(email='test@example.com').first():
             # Create Test Member
-            hashed_password_member = bcrypt.generate_password_hash('password123').decode('utf-8')
+            hashed_password_member = hasher.hash('password123')
             member = User(
                 name='Test Member',
                 email='test@example.com',
@@ -2,7 +2,51 @@ import jwt
 import datetime
 from functools import wraps
 from flask import request, jsonify, current_app
+from backend.config.config import Config
 from backend.models import User
+from backend.utils.extensions import db
+from backend.utils.cache import TTLCache
+
+# Resolved principals by user id, so most requests skip the user lookup entirely
+principal_cache = TTLCache(maxsize=Config.PRINCIPAL_CACHE_SIZE, ttl=Config.PRINCIPAL_CACHE_TTL)
+
+
+class Principal:
+    """The authenticated member as handlers see it: the columns auth and routes read, never the photo."""
+
+    __slots__ = ('id', 'role', 'name', 'email', 'chapter', 'business_category')
+
+    def __init__(self, id, role, name, email, chapter=None, business_category=None):
+        self.id = id
+        self.role = role
+        self.name = name
+        self.email = email
+        self.chapter = chapter
+        self.business_category = business_category
+
+
+def load_principal(user_id):
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = db.session.query(
+        User.id, User.role, User.name, User.email, User.chapter, User.business_category
+    ).filter(User.id == user_id).first()
+    if not row:
+        return None
+    principal = Principal(*row)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+def invalidate_principal(user_id):
+    """Drop a cached principal after its role, profile or password changes."""
+    try:
+        principal_cache.pop(int(user_id))
+    except (TypeError, ValueError):
+        pass
+
 
 def token_required(f):
     @wraps(f)
@@ -16,7 +60,7 @@ def token_required(f):
 
         try:
             data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
-            current_user = User.query.get(data['user_id'])
+            current_user = load_principal(int(data['user_id']))
             if not current_user:
                  return jsonify({'message': 'Token is invalid!'}), 401
         except Exception as e:
@@ -0,0 +1,34 @@
+import json
+import hashlib
+from flask import request
+from sqlalchemy import select, func
+
+
+def etag_for(*parts):
+    """Weak validator from cheap version numbers (counts, ids, timestamps), never from the body."""
+    return hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()[:32]
+
+
+def conditional_headers(etag):
+    # no-cache: browsers keep the response but revalidate with If-None-Match before reusing it
+    return {'ETag': f'W/"{etag}"', 'Cache-Control': 'private, no-cache'}
+
+
+def not_modified(etag):
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag):
+    return '', 304, conditional_headers(etag)
+
+
+def table_version(model):
+    """(row count, latest updated_at) of a table whose rows show up in another list.
+
+    Returned as scalar subqueries, to be selected alongside that list's own
+    version (pagination.window_version) rather than in a statement of their own.
+    """
+    return (
+        select(func.count(model.id)).scalar_subquery(),
+        select(func.max(model.updated_at)).scalar_subquery(),
+    )
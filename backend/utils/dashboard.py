@@ -0,0 +1,177 @@
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy import select, func, or_, case, exists
+from backend.config.config import Config
+from backend.models import (
+    User, Referral, Revenue, Meeting, Event, Notification, Broadcast, Guest, LearningCredit,
+    meeting_attendees, event_attendees
+)
+from backend.utils.extensions import db
+from backend.utils import sql_stats
+
+RECENT = 5
+UPCOMING = 3
+
+
+def iso(value):
+    return value.isoformat() if value else None
+
+
+def counts(user_id):
+    """Every number on the dashboard, in one statement of index-backed scalar subqueries."""
+    def count(model, *where):
+        return select(func.count()).select_from(model).where(*where).scalar_subquery()
+
+    def total(column, *where):
+        return select(func.coalesce(func.sum(column), 0)).where(*where).scalar_subquery()
+
+    row = db.session.execute(select(
+        count(Referral, Referral.from_member_id == user_id).label('referrals_given'),
+        count(Referral, Referral.to_member_id == user_id).label('referrals_received'),
+        count(meeting_attendees, meeting_attendees.c.user_id == user_id).label('meetings_attended'),
+        count(event_attendees, event_attendees.c.user_id == user_id).label('events_registered'),
+        count(Guest, Guest.invited_by == user_id).label('guests_invited'),
+        total(LearningCredit.duration_hours, LearningCredit.member_id == user_id).label('learning_hours'),
+        count(Notification, Notification.user_id == user_id, Notification.read_status.isnot(True)).label('unread_notifications'),
+        # Revenue.member_id gave the business, created_by received and recorded it
+        total(Revenue.amount, Revenue.member_id == user_id).label('revenue_given'),
+        count(Revenue, Revenue.member_id == user_id).label('revenue_given_count'),
+        total(Revenue.amount, Revenue.created_by == user_id).label('revenue_received'),
+        count(Revenue, Revenue.created_by == user_id).label('revenue_received_count'),
+    )).one()
+    return dict(row._mapping)
+
+
+def recent_referrals(user_id, limit=RECENT):
+    other = db.aliased(User)
+    given = Referral.from_member_id == user_id
+    rows = db.session.query(
+        Referral.id, Referral.contact_name, Referral.referral_type, Referral.status, Referral.created_at,
+        given.label('given'), other.id.label('member_id'), other.name.label('member_name')
+    ).join(
+        other, other.id == case((given, Referral.to_member_id), else_=Referral.from_member_id)
+    ).filter(or_(given, Referral.to_member_id == user_id)).order_by(
+        Referral.created_at.desc(), Referral.id.desc()
+    ).limit(limit)
+    return [{
+        'id': str(r.id), 'contact_name': r.contact_name, 'referral_type': r.referral_type, 'status': r.status,
+        'created_at': iso(r.created_at), 'direction': 'given' if r.given else 'received',
+        'member': {'id': str(r.member_id), 'name': r.member_name}
+    } for r in rows]
+
+
+def recent_revenue(user_id, limit=RECENT):
+    rows = db.session.query(
+        Revenue.id, Revenue.amount, Revenue.type, Revenue.date, Revenue.created_at,
+        (Revenue.member_id == user_id).label('given')
+    ).filter(or_(Revenue.member_id == user_id, Revenue.created_by == user_id)).order_by(
+        Revenue.created_at.desc(), Revenue.id.desc()
+    ).limit(limit)
+    return [{
+        'id': str(r.id), 'amount': r.amount, 'type': r.type, 'date': r.date,
+        'created_at': iso(r.created_at), 'direction': 'given' if r.given else 'received'
+    } for r in rows]
+
+
+def upcoming(model, attendees, key, user_id, limit=UPCOMING):
+    # Dates are stored as YYYY-MM-DD strings, so string comparison orders them
+    today = datetime.utcnow().strftime('%Y-%m-%d')
+    attendee_count = select(func.count()).select_from(attendees).where(key == model.id).scalar_subquery()
+    registered = exists().where(key == model.id, attendees.c.user_id == user_id)
+    columns = [model.id, model.title, model.date] + ([model.time, model.location, model.meeting_mode] if model is Meeting else [])
+    rows = db.session.query(*columns, attendee_count.label('attendee_count'), registered.label('registered')).filter(
+        model.date >= today
+    ).order_by(model.date, model.id).limit(limit)
+    return [dict(r._mapping, id=str(r.id)) for r in rows]
+
+
+def upcoming_meetings(user_id):
+    return upcoming(Meeting, meeting_attendees, meeting_attendees.c.meeting_id, user_id)
+
+
+def upcoming_events(user_id):
+    return upcoming(Event, event_attendees, event_attendees.c.event_id, user_id)
+
+
+def recent_notifications(user_id, limit=RECENT):
+    rows = db.session.query(
+        Notification.id, Notification.type, Notification.message, Notification.read_status, Notification.created_at,
+        func.coalesce(Broadcast.subject, Notification.subject).label('subject')
+    ).outerjoin(Broadcast, Broadcast.id == Notification.broadcast_id).filter(
+        Notification.user_id == user_id
+    ).order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit)
+    return [{
+        'id': str(r.id), 'type': r.type, 'message': r.message, 'subject': r.subject,
+        'read_status': bool(r.read_status), 'created_at': iso(r.created_at)
+    } for r in rows]
+
+
+def recent_guests(user_id, limit=RECENT):
+    rows = db.session.query(Guest.id, Guest.name, Guest.status, Guest.visit_date, Guest.created_at).filter(
+        Guest.invited_by == user_id
+    ).order_by(Guest.created_at.desc(), Guest.id.desc()).limit(limit)
+    return [dict(r._mapping, id=str(r.id), created_at=iso(r.created_at)) for r in rows]
+
+
+def recent_learning(user_id, limit=RECENT):
+    rows = db.session.query(
+        LearningCredit.id, LearningCredit.topic, LearningCredit.duration_hours, LearningCredit.date, LearningCredit.created_at
+    ).filter(LearningCredit.member_id == user_id).order_by(
+        LearningCredit.created_at.desc(), LearningCredit.id.desc()
+    ).limit(limit)
+    return [dict(r._mapping, id=str(r.id), created_at=iso(r.created_at)) for r in rows]
+
+
+SECTIONS = {
+    'counts': counts,
+    'referrals': recent_referrals,
+    'revenue': recent_revenue,
+    'meetings': upcoming_meetings,
+    'events': upcoming_events,
+    'notifications': recent_notifications,
+    'guests': recent_guests,
+    'learning': recent_learning,
+}
+
+# {workers: ThreadPoolExecutor}; normally only the DASHBOARD_WORKERS one is ever made
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers):
+    pool = _pools.get(workers)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(workers)
+            if pool is None:
+                pool = _pools[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard')
+    return pool
+
+
+def run_section(app, fn, user_id, stats):
+    # Each thread gets its own app context, and so its own session and pooled connection;
+    # its statements still count towards the request's SQL stats
+    with app.app_context(), sql_stats.bind(stats):
+        return fn(user_id)
+
+
+def build_dashboard(user_id, workers=None):
+    """{section: data} for one member.
+
+    With workers > 0 (default DASHBOARD_WORKERS) the sections run on a
+    shared pool of that many threads, each on its own connection, so on
+    PostgreSQL their round trips overlap; the pool size caps the extra
+    connections a worker process can take. 0 runs them one after another
+    on the request's session.
+    """
+    workers = Config.DASHBOARD_WORKERS if workers is None else workers
+    if not workers:
+        return {name: fn(user_id) for name, fn in SECTIONS.items()}
+
+    app = current_app._get_current_object()
+    pool = get_pool(workers)
+    stats = sql_stats.current()
+    futures = {name: pool.submit(run_section, app, fn, user_id, stats) for name, fn in SECTIONS.items()}
+    return {name: future.result() for name, future in futures.items()}
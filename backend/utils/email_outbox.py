@@ -0,0 +1,316 @@
+import json
+import time
+import uuid
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, update, delete, insert, func, or_, and_
+from backend.models import EmailOutbox
+from backend.utils.extensions import db, mail
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+# A claim older than this belongs to a worker that died mid-batch; hand it out again
+CLAIM_TIMEOUT = timedelta(minutes=10)
+MAX_RETRY_DELAY = 60 * 60
+
+
+class OutboxMetrics:
+    """Send counters and recent latencies for this process."""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.connections = 0
+        self._queued_latency = deque(maxlen=window) # enqueue -> accepted by SMTP
+        self._smtp_latency = deque(maxlen=window) # time spent in conn.send
+
+    def record_sent(self, queued_seconds, smtp_seconds):
+        with self._lock:
+            self.sent += 1
+            self._queued_latency.append(queued_seconds)
+            self._smtp_latency.append(smtp_seconds)
+
+    def record_failure(self, gave_up):
+        with self._lock:
+            if gave_up:
+                self.failed += 1
+            else:
+                self.retried += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    @staticmethod
+    def percentile(values, pct):
+        if not values:
+            return None
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 4)
+
+    def snapshot(self):
+        with self._lock:
+            queued, smtp = list(self._queued_latency), list(self._smtp_latency)
+            return {
+                'sent': self.sent,
+                'failed': self.failed,
+                'retried': self.retried,
+                'connections': self.connections,
+                'latency_p50_seconds': self.percentile(queued, 0.5),
+                'latency_p95_seconds': self.percentile(queued, 0.95),
+                'smtp_p50_seconds': self.percentile(smtp, 0.5),
+                'smtp_p95_seconds': self.percentile(smtp, 0.95),
+            }
+
+
+metrics = OutboxMetrics()
+
+
+def enqueue(messages):
+    """Queue [{'subject', 'html', 'recipients', 'bcc'}] and commit, so a crash can't lose them."""
+    if not messages:
+        return
+    now = datetime.utcnow()
+    db.session.execute(insert(EmailOutbox), [{
+        'subject': m['subject'],
+        'html': m.get('html'),
+        'recipients': json.dumps(list(m['recipients'])),
+        'bcc': m.get('bcc', False),
+        'status': PENDING,
+        'attempts': 0,
+        'next_attempt_at': now,
+        'created_at': now,
+    } for m in messages])
+    db.session.commit()
+
+    if current_app.config['MAIL_OUTBOX_INLINE_WORKER']:
+        get_worker(current_app._get_current_object()).wake()
+
+
+def claimable(now):
+    return or_(
+        and_(EmailOutbox.status == PENDING, EmailOutbox.next_attempt_at <= now),
+        and_(EmailOutbox.status == SENDING, EmailOutbox.claimed_at < now - CLAIM_TIMEOUT)
+    )
+
+
+def claim(limit):
+    """Mark up to limit due emails as ours and return them.
+
+    SKIP LOCKED keeps concurrent workers (threads or processes) off each
+    other's rows on PostgreSQL; the repeated eligibility check in the UPDATE
+    does the same on SQLite.
+    """
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+    ids = db.session.execute(
+        select(EmailOutbox.id).where(claimable(now))
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(limit).with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not ids:
+        db.session.commit()
+        return []
+
+    db.session.execute(
+        update(EmailOutbox).where(EmailOutbox.id.in_(ids), claimable(now))
+        .values(status=SENDING, claimed_by=token, claimed_at=now),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+    return db.session.execute(
+        select(EmailOutbox).where(EmailOutbox.claimed_by == token, EmailOutbox.status == SENDING)
+        .order_by(EmailOutbox.id)
+    ).scalars().all()
+
+
+def build_message(row):
+    from flask_mail import Message
+
+    recipients = json.loads(row.recipients)
+    sender = current_app.config['MAIL_USERNAME']
+    if row.bcc:
+        msg = Message(row.subject, sender=sender, bcc=recipients)
+    else:
+        msg = Message(row.subject, sender=sender, recipients=recipients)
+    msg.html = row.html
+    return msg
+
+
+def deliver(rows):
+    """Send claimed rows over as few SMTP connections as possible; returns [(row, error)]."""
+    import smtplib
+
+    results = []
+    remaining = list(rows)
+    while remaining:
+        connected = False
+        try:
+            with mail.connect() as conn:
+                connected = True
+                metrics.record_connection()
+                while remaining:
+                    row = remaining.pop(0)
+                    start = time.perf_counter()
+                    try:
+                        conn.send(build_message(row))
+                    except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                        # The server refused this message but the connection is still good
+                        results.append((row, e))
+                        continue
+                    except Exception:
+                        remaining.insert(0, row)
+                        raise
+                    smtp_seconds = time.perf_counter() - start
+                    metrics.record_sent((datetime.utcnow() - row.created_at).total_seconds(), smtp_seconds)
+                    results.append((row, None))
+        except Exception as e:
+            if not connected:
+                # Couldn't connect; the rest of the batch would fail the same way
+                results.extend((row, e) for row in remaining)
+                break
+            # Blame the message being sent and carry on with the rest over a fresh connection
+            results.append((remaining.pop(0), e))
+    return results
+
+
+def retry_delay(attempts):
+    base = current_app.config['MAIL_OUTBOX_RETRY_SECONDS']
+    return min(base * (2 ** (attempts - 1)), MAX_RETRY_DELAY)
+
+
+def record_results(results):
+    now = datetime.utcnow()
+    max_attempts = current_app.config['MAIL_OUTBOX_MAX_ATTEMPTS']
+    sent_ids = [row.id for row, error in results if error is None]
+    if sent_ids:
+        db.session.execute(
+            update(EmailOutbox).where(EmailOutbox.id.in_(sent_ids))
+            .values(status=SENT, sent_at=now, claimed_by=None, last_error=None),
+            execution_options={'synchronize_session': False}
+        )
+    for row, error in results:
+        if error is None:
+            continue
+        attempts = row.attempts + 1
+        gave_up = attempts >= max_attempts
+        metrics.record_failure(gave_up)
+        print(f"❌ Failed to send email {row.id} (attempt {attempts}): {error}")
+        db.session.execute(
+            update(EmailOutbox).where(EmailOutbox.id == row.id).values(
+                status=FAILED if gave_up else PENDING,
+                attempts=attempts,
+                next_attempt_at=now + timedelta(seconds=retry_delay(attempts)),
+                claimed_by=None,
+                last_error=str(error)[:1000]
+            ),
+            execution_options={'synchronize_session': False}
+        )
+    db.session.commit()
+
+
+def process_batch(batch_size=None):
+    """Claim, send and record one batch; returns how many emails were attempted."""
+    rows = claim(batch_size or current_app.config['MAIL_OUTBOX_BATCH_SIZE'])
+    if not rows:
+        return 0
+    record_results(deliver(rows))
+    return len(rows)
+
+
+def queue_stats():
+    """Queue depth from the table plus this process's send metrics."""
+    counts = dict(db.session.execute(
+        select(EmailOutbox.status, func.count()).where(EmailOutbox.status != SENT).group_by(EmailOutbox.status)
+    ).all())
+    oldest = db.session.execute(
+        select(func.min(EmailOutbox.created_at)).where(EmailOutbox.status.in_([PENDING, SENDING]))
+    ).scalar()
+    return {
+        'pending': counts.get(PENDING, 0),
+        'sending': counts.get(SENDING, 0),
+        'failed': counts.get(FAILED, 0),
+        'oldest_pending_seconds': round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else None,
+        **metrics.snapshot(),
+    }
+
+
+def purge(older_than_days):
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    result = db.session.execute(delete(EmailOutbox).where(EmailOutbox.status == SENT, EmailOutbox.sent_at < cutoff))
+    db.session.commit()
+    return result.rowcount
+
+
+class OutboxWorker:
+    """A fixed pool of threads that drain the outbox.
+
+    Each thread claims a batch, sends it over one SMTP connection and goes
+    back for more; when the queue is empty it sleeps until woken by a new
+    email or the poll interval passes.
+    """
+
+    def __init__(self, app, size, poll_seconds):
+        self.app = app
+        self.size = size
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.size):
+                thread = threading.Thread(target=self._run, name=f'email-outbox-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def wake(self):
+        self.start()
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def _run(self):
+        with self.app.app_context():
+            while not self._stopping.is_set():
+                try:
+                    sent = process_batch()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"❌ Email outbox worker error: {e}")
+                    sent = 0
+                finally:
+                    db.session.remove()
+                if not sent:
+                    self._wake.wait(self.poll_seconds)
+                    self._wake.clear()
+
+
+_worker_lock = threading.Lock()
+
+
+def get_worker(app):
+    with _worker_lock:
+        worker = app.extensions.get('email_outbox')
+        if worker is None:
+            worker = app.extensions['email_outbox'] = OutboxWorker(
+                app, app.config['MAIL_OUTBOX_WORKERS'], app.config['MAIL_OUTBOX_POLL_SECONDS']
+            )
+        return worker
@@ -1,22 +1,24 @@
-from flask_mail import Message
 from flask import current_app
-from backend.utils.extensions import mail
-from threading import Thread
+from backend.utils import email_outbox
 
-def send_async_email(app, msg):
-    with app.app_context():
-        try:
-            mail.send(msg)
-            print(f"✅ Email sent to {msg.recipients}")
-        except Exception as e:
-            print(f"❌ Failed to send email: {str(e)}")
+# Emails are written to the email_outbox table and sent by the worker pool in
+# utils/email_outbox.py, so a slow or failing SMTP server never holds up a request.
 
 def send_email(subject, recipients, html_body):
     try:
-        msg = Message(subject, sender=current_app.config['MAIL_USERNAME'], recipients=recipients)
-        msg.html = html_body
-        # Use threading to avoid blocking
-        Thread(target=send_async_email, args=(current_app._get_current_object(), msg)).start()
-        print(f"Attempting to send email to {recipients}...")
+        email_outbox.enqueue([{'subject': subject, 'recipients': recipients, 'html': html_body}])
+        print(f"Queued email to {recipients}")
     except Exception as e:
-        print(f"❌ Error preparing email: {str(e)}")
+        print(f"❌ Error queueing email: {str(e)}")
+
+def send_bulk_email(subject, recipients, html_body, batch_size=None):
+    """Send the same email to many recipients, BCC'd in batches of MAIL_BATCH_SIZE."""
+    batch_size = batch_size or current_app.config['MAIL_BATCH_SIZE']
+    try:
+        email_outbox.enqueue([
+            {'subject': subject, 'recipients': recipients[start:start + batch_size], 'html': html_body, 'bcc': True}
+            for start in range(0, len(recipients), batch_size)
+        ])
+        print(f"Queued email to {len(recipients)} recipients in batches of {batch_size}")
+    except Exception as e:
+        print(f"❌ Error queueing email: {str(e)}")
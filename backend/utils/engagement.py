@@ -0,0 +1,139 @@
+from backend.models import User, Referral, OneToOne, MemberStats, meeting_attendees, event_attendees
+from backend.utils.extensions import db
+from sqlalchemy import select, func, case, union_all, literal
+
+# Points per activity. Meetings have always been weighted twice in the old
+# per-member loop (relationship length + attendee count), so keep 4 here to
+# return the same scores.
+POINTS = {
+    'referrals': 2,
+    'meetings': 4,
+    'events': 1,
+    'one_to_ones': 3,
+}
+
+# Active: > 15 points, Growing: 7-15, Inactive: < 7
+ACTIVE_THRESHOLD = 15
+GROWING_THRESHOLD = 7
+
+STATUSES = ['Active', 'Growing', 'Inactive']
+
+
+def activity_count_subqueries():
+    """One grouped subquery per activity, each keyed by user_id."""
+    referrals = select(
+        Referral.from_member_id.label('user_id'),
+        func.count().label('n')
+    ).group_by(Referral.from_member_id).subquery('referral_counts')
+
+    meetings = select(
+        meeting_attendees.c.user_id,
+        func.count().label('n')
+    ).group_by(meeting_attendees.c.user_id).subquery('meeting_counts')
+
+    events = select(
+        event_attendees.c.user_id,
+        func.count().label('n')
+    ).group_by(event_attendees.c.user_id).subquery('event_counts')
+
+    # A one-to-one counts for both sides, but only once if someone logged one with themselves
+    oto_sides = union_all(
+        select(OneToOne.member_id.label('user_id')),
+        select(OneToOne.with_member_id.label('user_id')).where(OneToOne.with_member_id != OneToOne.member_id)
+    ).subquery('one_to_one_sides')
+    one_to_ones = select(
+        oto_sides.c.user_id,
+        func.count().label('n')
+    ).group_by(oto_sides.c.user_id).subquery('one_to_one_counts')
+
+    return {
+        'referrals': referrals,
+        'meetings': meetings,
+        'events': events,
+        'one_to_ones': one_to_ones,
+    }
+
+
+def points_expression(counts):
+    return sum(counts[key] * weight for key, weight in POINTS.items())
+
+
+def status_expression(points):
+    return case(
+        (points > ACTIVE_THRESHOLD, literal('Active')),
+        (points >= GROWING_THRESHOLD, literal('Growing')),
+        else_=literal('Inactive')
+    )
+
+
+def live_counts_query():
+    """Per-user activity counts straight from the raw tables.
+
+    Used to (re)build member_stats; the engagement endpoint reads the
+    maintained counters instead.
+    """
+    subqueries = activity_count_subqueries()
+    stmt = select(
+        User.id.label('user_id'),
+        *[func.coalesce(sq.c.n, 0).label(key) for key, sq in subqueries.items()]
+    )
+    for sq in subqueries.values():
+        stmt = stmt.outerjoin(sq, sq.c.user_id == User.id)
+    return stmt
+
+
+def engagement_query(member_ids=None):
+    """Select id, name, per-activity counts, points and status for every member.
+
+    Counts are read from member_stats, joined on its primary key, so the
+    whole result is a single scan regardless of chapter size.
+    """
+    counts = {key: func.coalesce(getattr(MemberStats, key), 0) for key in POINTS}
+    points = points_expression(counts)
+
+    stmt = select(
+        User.id,
+        User.name,
+        *[counts[key].label(key) for key in POINTS],
+        points.label('points'),
+        status_expression(points).label('status')
+    ).outerjoin(MemberStats, MemberStats.user_id == User.id).where(User.role == 'member')
+
+    if member_ids:
+        stmt = stmt.where(User.id.in_(member_ids))
+
+    return stmt.subquery('engagement')
+
+
+def get_engagement(member_ids=None, statuses=None, limit=None, offset=0):
+    """Return (rows, total) for the requested members, ordered by user id."""
+    scores = engagement_query(member_ids)
+    stmt = select(scores)
+    if statuses:
+        stmt = stmt.where(scores.c.status.in_(statuses))
+
+    total = None
+    if limit is not None:
+        total = db.session.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+        stmt = stmt.limit(limit).offset(offset)
+
+    rows = db.session.execute(stmt.order_by(scores.c.id)).all()
+    if total is None:
+        total = len(rows)
+    return rows, total
+
+
+def serialize_engagement(row):
+    return {
+        'id': str(row.id),
+        '_id': str(row.id), # Frontend compatibility
+        'name': row.name,
+        'status': row.status,
+        'points': row.points,
+        'stats': {
+            'referrals': row.referrals,
+            'meetings': row.meetings,
+            'events': row.events,
+            'one_to_ones': row.one_to_ones
+        }
+    }
@@ -0,0 +1,82 @@
+import io
+import csv
+import json
+from datetime import date, datetime
+from flask import Response, stream_with_context
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+# Rows fetched per round trip (a server-side cursor on PostgreSQL) and written per response chunk
+BATCH_ROWS = 1000
+# Spreadsheets run cells starting with these as formulas (CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class ExportError(ValueError):
+    pass
+
+
+def parse_format(args):
+    fmt = args.get('format', 'csv').lower()
+    if fmt not in FORMATS:
+        raise ExportError(f"format must be one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def cell(value):
+    # Quote member-entered text so Excel/Sheets show it instead of evaluating it; numbers stay numbers
+    value = plain(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def generate(columns, queries, fmt):
+    """Yield the rows of each query as CSV or NDJSON text, BATCH_ROWS at a time.
+
+    queries are column queries (Query.with_entities or select()); they are
+    read with yield_per, so only one batch of rows is in memory at once.
+    CSV text cells that a spreadsheet would evaluate are prefixed with '.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(columns)
+
+    pending = 0
+    for query in queries:
+        for row in query.yield_per(BATCH_ROWS):
+            if writer:
+                writer.writerow([cell(v) for v in row])
+            else:
+                buffer.write(json.dumps({c: plain(v) for c, v in zip(columns, row)}) + '\n')
+            pending += 1
+            if pending == BATCH_ROWS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(name, columns, queries, fmt):
+    """Chunked download of queries; nothing is materialized beyond one batch."""
+    extension = 'csv' if fmt == 'csv' else 'ndjson'
+    return Response(
+        stream_with_context(generate(columns, queries, fmt)),
+        mimetype=FORMATS[fmt],
+        headers={
+            'Content-Disposition': f'attachment; filename="{name}.{extension}"',
+            # Let proxies pass chunks through instead of buffering the whole download
+            'X-Accel-Buffering': 'no',
+        },
+    )
@@ -1,11 +1,54 @@
 # from flask_pymongo import PyMongo
-from flask_bcrypt import Bcrypt
-from flask_mail import Mail
+import threading
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+
+
+class LazyExtension:
+    """Stands in for a Flask extension whose module is only imported on first use.
+
+    init_app() is remembered and replayed once the real extension is built,
+    so apps that never send mail or hash a password never import the module.
+    """
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+        self._instance = None
+        self._apps = []
+        self._lock = threading.RLock()
+
+    def init_app(self, app):
+        with self._lock:
+            if self._instance is not None:
+                self._instance.init_app(app)
+            else:
+                self._apps.append(app)
+
+    def load(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    # __import__ rather than importlib so -X importtime still reports the module
+                    instance = getattr(__import__(self._module, fromlist=[self._name]), self._name)()
+                    for app in self._apps:
+                        instance.init_app(app)
+                    self._apps = []
+                    self._instance = instance
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
 
 # mongo = PyMongo()
-bcrypt = Bcrypt()
-mail = Mail()
+mail = LazyExtension('flask_mail', 'Mail')
 db = SQLAlchemy()
-migrate = Migrate()
+
+
+def __getattr__(name):
+    # flask_migrate pulls in all of Alembic; only the CLI and schema upgrades need it
+    if name == 'migrate':
+        from flask_migrate import Migrate
+        globals()['migrate'] = Migrate()
+        return globals()['migrate']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
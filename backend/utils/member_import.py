@@ -0,0 +1,163 @@
+import io
+import re
+import csv
+import json
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+from backend.models import User
+from backend.utils.extensions import db
+from backend.utils import monthly_metrics
+from backend.utils.typeahead import member_index
+from backend.utils.passwords import hasher
+from backend.utils.response_cache import response_cache
+
+CHUNK_SIZE = 500
+MAX_ROWS = 20000
+EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+ROLES = ('member', 'admin')
+PLANS = ('Lifetime', '6 Months', '12 Months')
+# Optional columns copied as-is, with register()'s defaults
+DEFAULTS = {
+    'role': 'member',
+    'business_category': None,
+    'business_name': None,
+    'phone': None,
+    'chapter': 'Nagarbhavi Brigades',
+    'membership_plan': '12 Months',
+}
+
+
+class MemberImportError(ValueError):
+    pass
+
+
+def parse_rows(payload, content_type=''):
+    """Rows from a CSV document or a JSON list (or {"members": [...]}) of objects."""
+    if isinstance(payload, bytes):
+        payload = payload.decode('utf-8-sig')
+    if isinstance(payload, str):
+        if 'json' in content_type or payload.lstrip()[:1] in ('[', '{'):
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                raise MemberImportError('Body is not valid JSON')
+        else:
+            reader = csv.DictReader(io.StringIO(payload))
+            if not reader.fieldnames:
+                raise MemberImportError('CSV has no header row')
+            payload = list(reader)
+    if isinstance(payload, dict):
+        payload = payload.get('members')
+    if not isinstance(payload, list) or not all(isinstance(r, dict) for r in payload):
+        raise MemberImportError('Expected a list of member objects')
+    if len(payload) > MAX_ROWS:
+        raise MemberImportError(f'At most {MAX_ROWS} rows per import')
+    return payload
+
+
+def clean(row):
+    """Normalized column values and a list of problems with the row."""
+    def value(key):
+        v = row.get(key)
+        v = str(v).strip() if v is not None else None
+        return v or None
+
+    member = {k: value(k) if value(k) is not None else default for k, default in DEFAULTS.items()}
+    member['name'] = value('name')
+    member['email'] = (value('email') or '').lower() or None
+    member['password'] = str(row['password']) if row.get('password') not in ('', None) else None
+
+    errors = []
+    if not member['name']:
+        errors.append('name is required')
+    if not member['email']:
+        errors.append('email is required')
+    elif not EMAIL.match(member['email']):
+        errors.append('email is not valid')
+    if not member['password']:
+        errors.append('password is required')
+    if member['role'] not in ROLES:
+        errors.append(f"role must be one of {', '.join(ROLES)}")
+    if member['membership_plan'] not in PLANS:
+        errors.append(f"membership_plan must be one of {', '.join(PLANS)}")
+    return member, errors
+
+
+def validate(rows):
+    """One pass over the rows; returns (valid [(line, member)], errors [report entries]).
+
+    Line numbers are 1-based data rows. Email uniqueness is checked within
+    the file and against the database with a single query.
+    """
+    cleaned = [(line, *clean(row)) for line, row in enumerate(rows, start=1)]
+    in_file = Counter(m['email'] for _, m, _ in cleaned if m['email'])
+    candidates = {m['email'] for _, m, errors in cleaned if not errors}
+    taken = set(db.session.execute(
+        select(User.email).where(User.email.in_(candidates))
+    ).scalars()) if candidates else set()
+
+    valid, report = [], []
+    for line, member, errors in cleaned:
+        if member['email'] in taken:
+            errors.append('email already registered')
+        elif member['email'] and in_file[member['email']] > 1:
+            errors.append('email appears more than once in this import')
+        if errors:
+            report.append({'row': line, 'email': member['email'], 'errors': errors})
+        else:
+            valid.append((line, member))
+    return valid, report
+
+
+def insert_chunk(members):
+    """Insert one chunk and its new_members rollup in a single transaction."""
+    now = datetime.utcnow()
+    db.session.execute(insert(User), [
+        dict(m, created_at=now, metric_chapter=m['chapter'] or '', metric_category=m['business_category'] or '')
+        for m in members
+    ])
+    for (chapter, category), count in Counter((m['chapter'], m['business_category']) for m in members).items():
+        bucket = SimpleNamespace(metric_chapter=chapter or '', metric_category=category or '')
+        monthly_metrics.record(now, bucket, None, new_members=count)
+    db.session.commit()
+
+
+def import_members(rows, dry_run=False, workers=None):
+    """Validate, hash and insert rows; returns the per-row report.
+
+    {'total', 'valid', 'created', 'failed', 'errors': [{'row', 'email', 'errors'}]}.
+    A chunk that fails to insert (say, an email registered meanwhile) is
+    rolled back on its own and its rows reported; the other chunks stand.
+    """
+    valid, report = validate(rows)
+    created = 0
+    if valid and not dry_run:
+        hashes = hasher.hash_many([m['password'] for _, m in valid], workers=workers)
+        for (_, member), hashed in zip(valid, hashes):
+            member['password'] = hashed
+
+        for start in range(0, len(valid), CHUNK_SIZE):
+            chunk = valid[start:start + CHUNK_SIZE]
+            try:
+                insert_chunk([m for _, m in chunk])
+                created += len(chunk)
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                reason = f'not imported: {type(e.__cause__ or e).__name__} in rows {chunk[0][0]}-{chunk[-1][0]}'
+                report.extend({'row': line, 'email': m['email'], 'errors': [reason]} for line, m in chunk)
+
+        if created:
+            member_index.rebuild()
+            response_cache.invalidate('users')
+
+    report.sort(key=lambda entry: entry['row'])
+    return {
+        'total': len(rows),
+        'created': created,
+        'valid': len(valid),
+        'failed': len(report),
+        'errors': report,
+    }
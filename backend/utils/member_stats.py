@@ -0,0 +1,91 @@
+from backend.models import MemberStats
+from backend.utils.extensions import db
+from sqlalchemy import select, update, delete, insert
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+
+COUNTERS = ['referrals', 'meetings', 'events', 'one_to_ones']
+
+
+def bump(user_ids, **deltas):
+    """Add deltas to the counters of one or more members.
+
+    Runs in the caller's session so the counters commit (or roll back)
+    together with the write that caused them. Members without a row yet
+    get one on first use.
+    """
+    if isinstance(user_ids, int):
+        user_ids = [user_ids]
+    user_ids = sorted({int(u) for u in user_ids})
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not user_ids or not deltas:
+        return
+
+    unknown = set(deltas) - set(COUNTERS)
+    if unknown:
+        raise ValueError(f"Unknown member_stats counters: {', '.join(sorted(unknown))}")
+
+    values = {k: getattr(MemberStats, k) + v for k, v in deltas.items()}
+    values['updated_at'] = datetime.utcnow()
+    result = db.session.execute(
+        update(MemberStats).where(MemberStats.user_id.in_(user_ids)).values(**values),
+        execution_options={'synchronize_session': False}
+    )
+    if result.rowcount == len(user_ids):
+        return
+
+    existing = set(db.session.execute(
+        select(MemberStats.user_id).where(MemberStats.user_id.in_(user_ids))
+    ).scalars())
+    for user_id in user_ids:
+        if user_id in existing:
+            continue
+        row = {k: max(deltas.get(k, 0), 0) for k in COUNTERS}
+        try:
+            # Savepoint so a concurrent first insert doesn't abort the caller's transaction
+            with db.session.begin_nested():
+                db.session.execute(insert(MemberStats).values(user_id=user_id, updated_at=datetime.utcnow(), **row))
+        except IntegrityError:
+            db.session.execute(
+                update(MemberStats).where(MemberStats.user_id == user_id).values(**values),
+                execution_options={'synchronize_session': False}
+            )
+
+
+def forget(user_id):
+    """Drop a member's counters, e.g. before deleting the user."""
+    db.session.execute(delete(MemberStats).where(MemberStats.user_id == int(user_id)))
+
+
+def rebuild(check_only=False):
+    """Recompute every member's counters from the raw tables.
+
+    Returns a list of drift entries ``(user_id, counter, stored, actual)``.
+    With check_only the table is left untouched; otherwise it is replaced
+    in one transaction.
+    """
+    from backend.utils.engagement import live_counts_query
+
+    actual = {row.user_id: row for row in db.session.execute(live_counts_query())}
+    stored = {row.user_id: row for row in db.session.execute(select(MemberStats.__table__))}
+
+    drift = []
+    for user_id in sorted(set(actual) | set(stored)):
+        live = actual.get(user_id)
+        kept = stored.get(user_id)
+        for counter in COUNTERS:
+            live_value = getattr(live, counter) if live else 0
+            kept_value = getattr(kept, counter) if kept else 0 # A missing row reads as zeros
+            if kept_value != live_value:
+                drift.append((user_id, counter, kept_value, live_value))
+
+    if check_only:
+        return drift
+
+    now = datetime.utcnow()
+    db.session.execute(delete(MemberStats))
+    rows = [dict({k: getattr(r, k) for k in COUNTERS}, user_id=user_id, updated_at=now) for user_id, r in actual.items()]
+    for start in range(0, len(rows), 1000):
+        db.session.execute(insert(MemberStats), rows[start:start + 1000])
+    db.session.commit()
+    return drift
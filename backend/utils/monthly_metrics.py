@@ -0,0 +1,204 @@
+from backend.models import MonthlyMetric, User, Referral, Revenue
+from backend.utils.extensions import db
+from sqlalchemy import select, update, insert, delete, func, extract, and_, or_
+from sqlalchemy.exc import IntegrityError
+from collections import defaultdict
+from datetime import datetime
+
+FACTS = ['referrals', 'revenue', 'revenue_count', 'new_members']
+
+
+def stamp(row, member):
+    """File row under member's current chapter/category, unless it already has a bucket.
+
+    The bucket is kept on the row (metric_chapter/metric_category), so
+    reversing or rebuilding it later uses the bucket it was counted in,
+    not wherever the member's profile has moved since.
+    """
+    if row.metric_chapter is None:
+        row.metric_chapter = (member.chapter if member else None) or ''
+        row.metric_category = (member.business_category if member else None) or ''
+    return row.metric_chapter, row.metric_category
+
+
+def bucket_key(when, row, member):
+    return (when.year, when.month) + stamp(row, member)
+
+
+def revenue_month(date_str, created_at=None):
+    # Revenue.date is a free-form YYYY-MM-DD string; fall back to when it was recorded
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return created_at or datetime.utcnow()
+
+
+def record(when, row, member, **deltas):
+    """Add deltas to row's monthly bucket in the caller's transaction.
+
+    row is the User, Referral or Revenue being counted and member the one
+    it is attributed to, whose profile picks the bucket the first time.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    unknown = set(deltas) - set(FACTS)
+    if unknown:
+        raise ValueError(f"Unknown monthly_metric facts: {', '.join(sorted(unknown))}")
+
+    year, month, chapter, category = bucket_key(when or datetime.utcnow(), row, member)
+    key = and_(
+        MonthlyMetric.year == year,
+        MonthlyMetric.month == month,
+        MonthlyMetric.chapter == chapter,
+        MonthlyMetric.category == category
+    )
+    values = {k: getattr(MonthlyMetric, k) + v for k, v in deltas.items()}
+    values['updated_at'] = datetime.utcnow()
+
+    result = db.session.execute(
+        update(MonthlyMetric).where(key).values(**values),
+        execution_options={'synchronize_session': False}
+    )
+    if result.rowcount:
+        return
+
+    row = {k: max(deltas.get(k, 0), 0) for k in FACTS}
+    try:
+        # Savepoint so a concurrent first insert doesn't abort the caller's transaction
+        with db.session.begin_nested():
+            db.session.execute(insert(MonthlyMetric).values(
+                year=year, month=month, chapter=chapter, category=category,
+                updated_at=datetime.utcnow(), **row
+            ))
+    except IntegrityError:
+        db.session.execute(
+            update(MonthlyMetric).where(key).values(**values),
+            execution_options={'synchronize_session': False}
+        )
+
+
+def since_filter(start_date):
+    if start_date is None:
+        return True
+    return or_(
+        MonthlyMetric.year > start_date.year,
+        and_(MonthlyMetric.year == start_date.year, MonthlyMetric.month >= start_date.month)
+    )
+
+
+def monthly_series(fact, start_date=None, chapter=None, category=None):
+    """Return [(year, month, total)] for one fact, oldest first, skipping empty months."""
+    total = func.sum(getattr(MonthlyMetric, fact))
+    stmt = select(MonthlyMetric.year, MonthlyMetric.month, total).where(since_filter(start_date))
+    if chapter:
+        stmt = stmt.where(MonthlyMetric.chapter == chapter)
+    if category:
+        stmt = stmt.where(MonthlyMetric.category == category)
+    stmt = stmt.group_by(MonthlyMetric.year, MonthlyMetric.month).having(total != 0)
+    return db.session.execute(stmt.order_by(MonthlyMetric.year, MonthlyMetric.month)).all()
+
+
+def stamped(model, member=User):
+    # The bucket kept on the row, or for rows never recorded its member's current profile
+    return (
+        func.coalesce(model.metric_chapter, member.chapter, ''),
+        func.coalesce(model.metric_category, member.business_category, '')
+    )
+
+
+def compute_from_source():
+    """Aggregate every monthly bucket from the raw tables."""
+    buckets = defaultdict(lambda: dict.fromkeys(FACTS, 0))
+
+    chapter, category = stamped(Referral)
+    referral_rows = db.session.execute(
+        select(
+            extract('year', Referral.created_at), extract('month', Referral.created_at),
+            chapter, category, func.count(Referral.id)
+        ).outerjoin(User, Referral.from_member_id == User.id)
+        .where(Referral.created_at.isnot(None))
+        .group_by(extract('year', Referral.created_at), extract('month', Referral.created_at), chapter, category)
+    )
+    for year, month, chapter, category, count in referral_rows:
+        buckets[(int(year), int(month), chapter or '', category or '')]['referrals'] += count
+
+    chapter, category = stamped(User)
+    member_rows = db.session.execute(
+        select(
+            extract('year', User.created_at), extract('month', User.created_at),
+            chapter, category, func.count(User.id)
+        ).where(User.created_at.isnot(None))
+        .group_by(extract('year', User.created_at), extract('month', User.created_at), chapter, category)
+    )
+    for year, month, chapter, category, count in member_rows:
+        buckets[(int(year), int(month), chapter or '', category or '')]['new_members'] += count
+
+    # Revenue.date is a string column, so bucket it here while streaming only the columns we need
+    revenue_rows = db.session.execute(
+        select(Revenue.date, Revenue.created_at, Revenue.amount, *stamped(Revenue))
+        .outerjoin(User, Revenue.member_id == User.id)
+        .execution_options(yield_per=5000)
+    )
+    for date_str, created_at, amount, chapter, category in revenue_rows:
+        when = revenue_month(date_str, created_at)
+        bucket = buckets[(when.year, when.month, chapter or '', category or '')]
+        bucket['revenue'] += amount or 0
+        bucket['revenue_count'] += 1
+
+    return buckets
+
+
+def stamp_unrecorded():
+    """Stamp rows added without record() (seed data, older rows) with their member's current bucket."""
+    for model, member_id in ((User, User.id), (Referral, Referral.from_member_id), (Revenue, Revenue.member_id)):
+        member = db.aliased(User)
+
+        def profile(column):
+            return func.coalesce(select(column).where(member.id == member_id).scalar_subquery(), '')
+
+        db.session.execute(
+            update(model).where(model.metric_chapter.is_(None)).values(
+                metric_chapter=profile(member.chapter), metric_category=profile(member.business_category)
+            ),
+            execution_options={'synchronize_session': False}
+        )
+
+
+def backfill(check_only=False):
+    """Rebuild monthly_metric from the raw tables.
+
+    Returns drift entries ``(key, fact, stored, actual)``. With check_only
+    nothing is written; otherwise rows never recorded are stamped with
+    their member's current bucket first.
+    """
+    actual = compute_from_source()
+    stored = {
+        (r.year, r.month, r.chapter, r.category): r
+        for r in db.session.execute(select(MonthlyMetric.__table__))
+    }
+
+    drift = []
+    for key in sorted(set(actual) | set(stored)):
+        live = actual.get(key, {})
+        kept = stored.get(key)
+        for fact in FACTS:
+            live_value = live.get(fact, 0)
+            kept_value = getattr(kept, fact) if kept else 0
+            if abs(kept_value - live_value) > 1e-6:
+                drift.append((key, fact, kept_value, live_value))
+
+    if check_only:
+        return drift
+
+    stamp_unrecorded()
+    now = datetime.utcnow()
+    db.session.execute(delete(MonthlyMetric))
+    rows = [
+        dict(facts, year=year, month=month, chapter=chapter, category=category, updated_at=now)
+        for (year, month, chapter, category), facts in actual.items()
+    ]
+    for start in range(0, len(rows), 1000):
+        db.session.execute(insert(MonthlyMetric), rows[start:start + 1000])
+    db.session.commit()
+    return drift
@@ -0,0 +1,139 @@
+import json
+import base64
+from datetime import datetime
+from flask import request, jsonify
+from sqlalchemy import select, func, or_, and_
+from backend.utils.extensions import db
+from backend.utils.conditional import etag_for, conditional_headers, not_modified, not_modified_response, table_version
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def wants_everything(args):
+    # Old unpaginated list responses, kept while the frontend migrates: ?paginate=false
+    return args.get('paginate', '').lower() in ('false', '0', 'no')
+
+
+def encode_cursor(sort_value, row_id):
+    if isinstance(sort_value, datetime):
+        payload = {'t': sort_value.isoformat(), 'id': row_id}
+    else:
+        payload = {'v': sort_value, 'id': row_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if 't' in payload:
+            return datetime.fromisoformat(payload['t']), int(payload['id'])
+        return payload['v'], int(payload['id'])
+    except (ValueError, KeyError, TypeError):
+        raise PaginationError('Invalid cursor')
+
+
+def parse_limit(args):
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise PaginationError('Invalid limit')
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def after_cursor(query, sort_col, id_col, args, ascending=False):
+    cursor = args.get('cursor')
+    if not cursor:
+        return query
+    sort_value, last_id = decode_cursor(cursor)
+    if ascending:
+        return query.filter(or_(
+            sort_col > sort_value,
+            and_(sort_col == sort_value, id_col > last_id)
+        ))
+    return query.filter(or_(
+        sort_col < sort_value,
+        and_(sort_col == sort_value, id_col < last_id)
+    ))
+
+
+def window(query, sort_col, id_col, limit=None, ascending=False):
+    """query newest first (oldest first with ascending), limit + 1 rows when
+    limit is set, so the caller can tell if there is a next page."""
+    if ascending:
+        query = query.order_by(sort_col.asc(), id_col.asc())
+    else:
+        query = query.order_by(sort_col.desc(), id_col.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def window_version(query, id_col, extra=()):
+    """(count, sum of ids, latest updated_at, *extra) of the rows query would return.
+
+    One aggregate over just the id and updated_at columns, so it stays cheap
+    however wide the rows are. Inserts and deletes change the count or the
+    id sum, edits change updated_at; extra are table_version() subqueries.
+    """
+    model = id_col.class_
+    rows = query.with_entities(id_col.label('id'), model.updated_at.label('updated_at')).subquery()
+    return tuple(db.session.execute(select(
+        func.count(rows.c.id), func.sum(rows.c.id), func.max(rows.c.updated_at), *extra
+    )).one())
+
+
+def split_page(rows, limit, sort_col, id_col):
+    """(first limit rows, next_cursor) of a window; next_cursor is None on the last page."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
+
+
+def paginated_response(query, sort_col, id_col, serialize=None, args=None, serialize_rows=None, depends_on=(),
+                       ascending=False):
+    """Serialize a list endpoint as {'items', 'next_cursor'}, or the old plain list with ?paginate=false.
+
+    Pass serialize_rows instead of serialize when related data should be
+    loaded for the whole page at once, and list in depends_on the models
+    whose rows it reads. Responses carry a weak ETag computed, before the page
+    query runs, from one narrow aggregate over the page's rows and the
+    versions of those tables; a matching If-None-Match gets an empty 304
+    without the page being loaded or serialized. Pages run newest first
+    unless ascending is set; cursors follow the same direction.
+    """
+    args = request.args if args is None else args
+    if serialize_rows is None:
+        serialize_rows = lambda rows: [serialize(r) for r in rows]
+    everything = wants_everything(args)
+
+    try:
+        limit = None if everything else parse_limit(args)
+        filtered = query if everything else after_cursor(query, sort_col, id_col, args, ascending)
+    except PaginationError as e:
+        return jsonify({'message': str(e)}), 400
+    page = window(filtered, sort_col, id_col, limit, ascending)
+    extra = [column for model in depends_on for column in table_version(model)]
+    # The whole list needs no ordering to be versioned; a page is the ordered, limited window
+    etag = etag_for(request.full_path, *window_version(filtered if everything else page, id_col, extra))
+    if not_modified(etag):
+        return not_modified_response(etag)
+
+    rows = page.all()
+
+    if everything:
+        return jsonify(serialize_rows(rows)), 200, conditional_headers(etag)
+
+    rows, next_cursor = split_page(rows, limit, sort_col, id_col)
+    return jsonify({
+        'items': serialize_rows(rows),
+        'next_cursor': next_cursor
+    }), 200, conditional_headers(etag)
@@ -0,0 +1,112 @@
+import os
+import re
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from backend.config.config import Config
+
+COST = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+
+class HasherOverloaded(RuntimeError):
+    """Every hashing slot is taken and none freed up within the wait; callers answer 503."""
+
+
+# bcrypt is imported in the pool processes (or on first inline use), not at worker boot
+def _hash(password, rounds):
+    import bcrypt as bcrypt_lib
+    return bcrypt_lib.hashpw(password.encode('utf-8'), bcrypt_lib.gensalt(rounds)).decode('utf-8')
+
+
+def _check(pw_hash, password):
+    # Same check Flask-Bcrypt did, so hashes it wrote still verify
+    import bcrypt as bcrypt_lib
+    try:
+        return bcrypt_lib.checkpw(password.encode('utf-8'), pw_hash.encode('utf-8'))
+    except ValueError:
+        return False  # not a bcrypt hash
+
+
+def cost(pw_hash):
+    match = COST.match(pw_hash or '')
+    return int(match.group(1)) if match else None
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification off the request threads.
+
+    Work runs in a process pool of `workers` (inline when 0), so a login storm
+    costs at most that many cores per gunicorn worker. At most `workers +
+    queue` calls are admitted at once; a call that can't get a slot within
+    `wait` seconds raises HasherOverloaded instead of piling up behind the
+    others. The pool is started on first use, after gunicorn has forked.
+    """
+
+    def __init__(self, workers=2, queue=8, wait=0.5):
+        self.workers = workers
+        self.wait = wait
+        self.capacity = workers + queue if workers else queue
+        self._slots = threading.BoundedSemaphore(max(self.capacity, 1))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # spawn, not fork: gunicorn workers run threads (outbox worker, request threads)
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                    )
+                    atexit.register(self._pool.shutdown, wait=False, cancel_futures=True)
+        return self._pool
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.wait):
+            with self._stats_lock:
+                self.rejected += 1
+            raise HasherOverloaded('Too many password checks in progress')
+        with self._stats_lock:
+            self.in_flight += 1
+        try:
+            if not self.workers:
+                return fn(*args)
+            return self._get_pool().submit(fn, *args).result()
+        finally:
+            with self._stats_lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def hash(self, password, rounds=None):
+        return self._run(_hash, password, rounds or current_app.config['BCRYPT_LOG_ROUNDS'])
+
+    def check(self, pw_hash, password):
+        return self._run(_check, pw_hash, password)
+
+    def needs_rehash(self, pw_hash):
+        return cost(pw_hash) != current_app.config['BCRYPT_LOG_ROUNDS']
+
+    def hash_many(self, passwords, rounds=None, workers=None):
+        """Hash a batch (bulk import) across a dedicated pool of `workers` processes.
+
+        Bypasses admission control: it is an admin action, not request traffic.
+        """
+        rounds = rounds or current_app.config['BCRYPT_LOG_ROUNDS']
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(passwords) < 2:
+            return [_hash(p, rounds) for p in passwords]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(pool.map(_hash, passwords, [rounds] * len(passwords), chunksize=chunksize))
+
+    def stats(self):
+        return {'workers': self.workers, 'capacity': self.capacity,
+                'in_flight': self.in_flight, 'rejected': self.rejected}
+
+
+hasher = PasswordHasher(Config.PASSWORD_HASH_WORKERS, Config.PASSWORD_HASH_QUEUE, Config.PASSWORD_HASH_WAIT)
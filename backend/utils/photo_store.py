@@ -0,0 +1,184 @@
+import os
+import io
+import base64
+import shutil
+import hmac
+import hashlib
+import binascii
+from flask import current_app, send_file, url_for
+
+# Longest edge in pixels for each generated rendition; 'original' is the upload as-is
+SIZES = {
+    'thumb': 96,
+    'medium': 320,
+}
+ORIGINAL = 'original'
+RENDITIONS = [*SIZES, ORIGINAL]
+
+FORMATS = {
+    'JPEG': ('jpg', 'image/jpeg'),
+    'PNG': ('png', 'image/png'),
+    'WEBP': ('webp', 'image/webp'),
+    'GIF': ('gif', 'image/gif'),
+}
+MIMETYPES = {ext: mimetype for ext, mimetype in FORMATS.values()}
+
+# Cache lifetime of photo URLs; they carry the photo version (?v=), so any new upload changes the URL
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+class PhotoError(ValueError):
+    pass
+
+
+class LocalPhotoStore:
+    """Photo files under a directory on local disk, laid out as <user_id>/<version>/<rendition>.<ext>."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    def path(self, key):
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise PhotoError('Invalid photo key')
+        return path
+
+    def put(self, key, data):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        with open(self.path(key), 'rb') as f:
+            return f.read()
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    def delete_prefix(self, prefix):
+        shutil.rmtree(self.path(prefix), ignore_errors=True)
+
+    def send(self, key, mimetype, etag, max_age):
+        return send_file(self.path(key), mimetype=mimetype, etag=etag, conditional=True, max_age=max_age)
+
+
+# PHOTO_STORE picks one of these; another backend only needs the LocalPhotoStore methods
+BACKENDS = {
+    'local': LocalPhotoStore,
+}
+
+
+def store_from_config(config):
+    backend = BACKENDS.get(config.get('PHOTO_STORE', 'local'))
+    if backend is None:
+        raise RuntimeError(f"Unknown PHOTO_STORE: {config.get('PHOTO_STORE')}")
+    return backend(config['PHOTO_STORAGE_DIR'])
+
+
+def get_store():
+    store = current_app.extensions.get('photo_store')
+    if store is None:
+        store = current_app.extensions['photo_store'] = store_from_config(current_app.config)
+    return store
+
+
+def decode_data_url(value):
+    """Bytes of a 'data:image/...;base64,' URL, as the profile form sends them."""
+    if not isinstance(value, str) or not value.startswith('data:'):
+        raise PhotoError('Photo must be a base64 data URL')
+    header, _, payload = value.partition(',')
+    if ';base64' not in header:
+        raise PhotoError('Photo must be a base64 data URL')
+    try:
+        return base64.b64decode(payload, validate=False)
+    except (binascii.Error, ValueError):
+        raise PhotoError('Photo is not valid base64')
+
+
+def render(data):
+    """Validate an upload and return (ext, {rendition: bytes}) with every thumbnail generated."""
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        raise PhotoError('Photo is not a supported image')
+    if image.format not in FORMATS:
+        raise PhotoError(f'Unsupported image format: {image.format}')
+
+    ext = FORMATS[image.format][0]
+    renditions = {ORIGINAL: data}
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    for name, edge in SIZES.items():
+        thumb = image.copy()
+        thumb.thumbnail((edge, edge), Image.LANCZOS)
+        out = io.BytesIO()
+        thumb.convert('RGB').save(out, 'JPEG', quality=85, optimize=True)
+        renditions[name] = out.getvalue()
+    return ext, renditions
+
+
+def rendition_key(user_id, photo_key, size):
+    version, _, ext = photo_key.partition('.')
+    return f'{user_id}/{version}/{size}.{ext if size == ORIGINAL else "jpg"}'
+
+
+def save_photo(store, user_id, data, max_bytes=None):
+    """Write the upload and its thumbnails; returns the photo_key to store on the user."""
+    if not data:
+        raise PhotoError('Photo is empty')
+    if max_bytes and len(data) > max_bytes:
+        raise PhotoError(f'Photo is larger than {max_bytes // (1024 * 1024)} MB')
+
+    ext, renditions = render(data)
+    photo_key = f'{hashlib.sha256(data).hexdigest()[:16]}.{ext}'
+    for size, content in renditions.items():
+        store.put(rendition_key(user_id, photo_key, size), content)
+    return photo_key
+
+
+def delete_photo(store, user_id, photo_key=None):
+    """Remove one stored version, or every version when photo_key is None."""
+    if photo_key:
+        store.delete_prefix(f'{user_id}/{photo_key.partition(".")[0]}')
+    else:
+        store.delete_prefix(str(user_id))
+
+
+def is_current(photo_key, requested_version):
+    """Whether ?v= names the stored photo.
+
+    The version is a hash of the upload that only authenticated responses
+    (photo_urls) hand out, so it doubles as the capability to fetch the photo.
+    """
+    version = photo_key.partition('.')[0]
+    return bool(requested_version) and hmac.compare_digest(version, requested_version)
+
+
+def send_photo(user_id, photo_key, size):
+    version = photo_key.partition('.')[0]
+    mimetype = MIMETYPES[photo_key.partition('.')[2]] if size == ORIGINAL else 'image/jpeg'
+    # Versioned URLs never change content
+    response = get_store().send(rendition_key(user_id, photo_key, size), mimetype, f'{version}-{size}', IMMUTABLE_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+
+def photo_urls(user_id, photo_key):
+    """API paths of every rendition, or None when the member has no photo."""
+    if not photo_key:
+        return None
+    version = photo_key.partition('.')[0]
+    return {
+        size: url_for('users.get_user_photo', id=user_id, size=size, v=version)
+        for size in RENDITIONS
+    }
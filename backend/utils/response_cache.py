@@ -0,0 +1,189 @@
+import json
+import hashlib
+import threading
+from collections import Counter
+from functools import wraps
+from flask import request, current_app
+from backend.config.config import Config
+from backend.utils.cache import TTLCache
+from backend.utils.conditional import conditional_headers, not_modified, not_modified_response
+
+
+class ResponseCache:
+    """Cached GET responses, invalidated by tag.
+
+    Every tag has a generation number that goes into the cache key, and a
+    write bumps the generations of the tags it touches, so entries made
+    before the write can no longer be found. The bump happens in this
+    process before the write's response is sent, so a later read here never
+    sees the old entry; a read racing the write stores under the old
+    generation and is equally unreachable.
+
+    Entries live in a per-worker LRU (TTLCache) unless redis_url is set, in
+    which case entries and generations are shared through Redis (or anything
+    speaking its protocol) and other workers see a write immediately too.
+    Without Redis, ttl bounds how long another worker serves a stale entry.
+    """
+
+    def __init__(self, maxsize=512, ttl=300, redis_url=None, prefix='response-cache:'):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.redis = None
+        if redis_url:
+            try:
+                import redis
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.2, socket_connect_timeout=0.2)
+                self._redis_error = redis.RedisError
+            except ImportError:
+                print("⚠️ RESPONSE_CACHE_REDIS_URL is set but the redis package is not installed; caching per worker")
+        self.enabled = maxsize > 0 or self.redis is not None
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self.invalidations = Counter()
+
+    def generations(self, tags):
+        # Local generations always count, so a write here invalidates even if Redis is unreachable
+        generations = [self._generations.get(tag, 0) for tag in tags]
+        if self.redis is not None:
+            shared = self.redis.mget([f'{self.prefix}tag:{tag}' for tag in tags])
+            generations += [int(g or 0) for g in shared]
+        return generations
+
+    def key(self, endpoint, scope, tags):
+        raw = json.dumps([scope, sorted(request.args.items(multi=True)), self.generations(tags)])
+        return f'{self.prefix}{endpoint}:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+    def get(self, key):
+        if self.redis is None:
+            return self.local.get(key)
+        raw = self.redis.get(key)
+        if raw is None:
+            return None
+        status, mimetype, etag, body = raw.split(b'\n', 3)
+        return int(status), mimetype.decode(), etag.decode() or None, body
+
+    def set(self, key, status, mimetype, etag, body):
+        if self.redis is None:
+            self.local.set(key, (status, mimetype, etag, body))
+        else:
+            self.redis.set(key, f'{status}\n{mimetype}\n{etag or ""}\n'.encode() + body, ex=self.ttl)
+
+    def invalidate(self, *tags):
+        """Call after committing a write to the data behind `tags`."""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                self.invalidations[tag] += 1
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.incr(f'{self.prefix}tag:{tag}')
+                pipe.execute()
+            except self._redis_error as e:
+                self.count('redis_errors')
+                print(f"⚠️ Response cache invalidation of {', '.join(tags)} not shared: {e}")
+
+    def count(self, name, endpoint=None):
+        with self._lock:
+            self._counts[name] += 1
+            if endpoint:
+                self._counts[(endpoint, name)] += 1
+
+    def clear(self):
+        self.local.clear()
+        with self._lock:
+            self._counts.clear()
+            self.invalidations.clear()
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+            invalidations = dict(self.invalidations)
+        hits, misses = counts.get('hits', 0), counts.get('misses', 0)
+        endpoints = sorted({key[0] for key in counts if isinstance(key, tuple)})
+        return {
+            'backend': 'redis' if self.redis is not None else 'local',
+            'size': len(self.local),
+            'maxsize': self.local.maxsize,
+            'ttl': self.ttl,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+            'redis_errors': counts.get('redis_errors', 0),
+            'endpoints': {
+                endpoint: {'hits': counts.get((endpoint, 'hits'), 0), 'misses': counts.get((endpoint, 'misses'), 0)}
+                for endpoint in endpoints
+            },
+            'invalidations': invalidations,
+        }
+
+
+response_cache = ResponseCache(Config.RESPONSE_CACHE_SIZE, Config.RESPONSE_CACHE_TTL, Config.RESPONSE_CACHE_REDIS_URL)
+
+
+def member_tag(user_id):
+    """Tag for data shown only to one member; writes touching several members invalidate each."""
+    return f'member:{user_id}'
+
+
+def scope_of(current_user, scope):
+    if scope == 'user':
+        return f'user:{current_user.id}'
+    if scope == 'role':
+        return f'role:{current_user.role}'
+    return 'all'
+
+
+def cached(*tags, scope='role'):
+    """Cache a token_required GET handler's 200 responses, keyed by route, query args and scope.
+
+    scope is 'role' (default), 'user' or 'all'. A tag may be a function of
+    current_user, e.g. lambda user: member_tag(user.id). Write handlers call
+    response_cache.invalidate() with the same tags. Goes below @token_required.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(current_user, *args, **kwargs):
+            if not response_cache.enabled:
+                return f(current_user, *args, **kwargs)
+
+            endpoint = request.endpoint
+            key = None
+            try:
+                resolved = [tag(current_user) if callable(tag) else tag for tag in tags]
+                key = response_cache.key(endpoint, scope_of(current_user, scope), resolved)
+                entry = response_cache.get(key)
+            except Exception as e:
+                # Redis trouble degrades to no caching, never to an error
+                response_cache.count('redis_errors')
+                print(f"⚠️ Response cache read failed: {e}")
+                key, entry = None, None
+
+            if entry is not None:
+                response_cache.count('hits', endpoint)
+                status, mimetype, etag, body = entry
+                if etag and not_modified(etag):
+                    response = current_app.make_response(not_modified_response(etag))
+                else:
+                    response = current_app.response_class(body, status=status, mimetype=mimetype)
+                    if etag:
+                        response.headers.update(conditional_headers(etag))
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response_cache.count('misses', endpoint)
+            response = current_app.make_response(f(current_user, *args, **kwargs))
+            if key and response.status_code == 200 and not response.is_streamed:
+                try:
+                    etag, _ = response.get_etag()
+                    response_cache.set(key, response.status_code, response.mimetype, etag, response.get_data())
+                except Exception as e:
+                    response_cache.count('redis_errors')
+                    print(f"⚠️ Response cache write failed: {e}")
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,105 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+from sqlalchemy import text, inspect
+from backend.utils.extensions import db
+
+MIGRATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'migrations'))
+
+# Arbitrary but fixed key for pg_advisory_lock, shared by every `flask schema upgrade` run
+ADVISORY_LOCK_KEY = 724301958
+
+
+class SchemaLockTimeout(RuntimeError):
+    pass
+
+
+REVISION_LINE = re.compile(r"^(revision|down_revision)\s*=\s*(.+)$", re.M)
+REVISION_ID = re.compile(r"['\"](\w+)['\"]")
+
+
+def head_revision():
+    """Newest revision in migrations/versions.
+
+    Read straight from the scripts' revision/down_revision lines, so the
+    startup check doesn't have to import Alembic.
+    """
+    revisions, parents = set(), set()
+    versions_dir = os.path.join(MIGRATIONS_DIR, 'versions')
+    for name in os.listdir(versions_dir):
+        if not name.endswith('.py'):
+            continue
+        with open(os.path.join(versions_dir, name)) as f:
+            for key, value in REVISION_LINE.findall(f.read()):
+                (revisions if key == 'revision' else parents).update(REVISION_ID.findall(value))
+    heads = sorted(revisions - parents)
+    return heads[0] if len(heads) == 1 else tuple(heads)
+
+
+def init_migrate(app):
+    """Register Flask-Migrate (and so Alembic) on app, once."""
+    if 'migrate' not in app.extensions:
+        from backend.utils.extensions import db, migrate
+        migrate.init_app(app, db, directory=MIGRATIONS_DIR)
+
+
+def current_revision():
+    """Revision stamped in alembic_version, or None on an unmigrated database."""
+    with db.engine.connect() as conn:
+        if not inspect(conn).has_table('alembic_version'):
+            return None
+        return conn.execute(text('SELECT version_num FROM alembic_version')).scalar()
+
+
+@contextmanager
+def schema_lock(timeout=300):
+    """Hold a database-wide advisory lock so only one process migrates at a time.
+
+    PostgreSQL only; SQLite is single-host and serializes DDL itself.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        yield
+        return
+
+    with db.engine.connect() as conn:
+        deadline = time.monotonic() + timeout
+        while not conn.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': ADVISORY_LOCK_KEY}).scalar():
+            if time.monotonic() > deadline:
+                raise SchemaLockTimeout(f'Another process held the schema lock for over {timeout}s')
+            time.sleep(1)
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': ADVISORY_LOCK_KEY})
+            conn.commit()
+
+
+def upgrade_schema(lock_timeout=300):
+    """Run Alembic to head under the advisory lock; returns (before, after) revisions."""
+    from flask import current_app
+    from flask_migrate import upgrade
+
+    init_migrate(current_app._get_current_object())
+    with schema_lock(lock_timeout):
+        before = current_revision()
+        if before != head_revision():
+            upgrade(directory=MIGRATIONS_DIR)
+        return before, current_revision()
+
+
+def check_schema(strict=False):
+    """Compare the stamped revision with the code's head; one small query at startup.
+
+    Returns True when they match. Otherwise warns, or raises with strict.
+    """
+    current, head = current_revision(), head_revision()
+    if current == head:
+        return True
+    message = (f"Database schema is at {current or 'no revision'} but the code expects {head}. "
+               f"Run `flask --app run schema upgrade`.")
+    if strict:
+        raise RuntimeError(message)
+    print(f"⚠️ {message}")
+    return False
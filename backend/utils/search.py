@@ -0,0 +1,135 @@
+import re
+from markupsafe import escape
+from sqlalchemy import text, or_
+from backend.utils.extensions import db
+from backend.models import User, USER_SEARCH_DOCUMENT, USER_SEARCH_COLUMNS
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+MAX_TERMS = 8
+
+# The database wraps matched words in these; mark() escapes the text and turns them into <mark> tags
+HIT_START, HIT_END = '\x02', '\x03'
+HIGHLIGHTED = ['name', 'business_name', 'business_category']
+SNIPPET = 'services_offered'
+SNIPPET_WORDS = 12
+
+RESULT_COLUMNS = ['id', 'name', 'email', 'phone', 'business_name', 'business_category',
+                  'services_offered', 'role', 'chapter']
+
+
+# An email address or a phone number (3+ digits). The tsvector keeps an address as one token and
+# splits numbers its own way, so neither prefix-matches reliably; these searches use a substring match
+CONTACT_TERM = re.compile(r'@|\d.*\d.*\d')
+
+
+def terms(query):
+    """Lower-cased words of a search box query; punctuation can't reach the query syntax."""
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def contact_terms(query):
+    """Whitespace-separated terms, kept whole, when any looks like an email address or phone number; else []."""
+    parts = query.lower().split()[:MAX_TERMS]
+    return parts if any(CONTACT_TERM.search(p) for p in parts) else []
+
+
+def like_pattern(word):
+    return '%' + word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def mark(value):
+    if value is None:
+        return None
+    return str(escape(value)).replace(HIT_START, '<mark>').replace(HIT_END, '</mark>')
+
+
+def _search_postgresql(words, limit):
+    # Every word is a prefix (typeahead) and all must match; the GIN index on
+    # USER_SEARCH_DOCUMENT finds the rows, ts_headline only runs on the top `limit`
+    headline = f'StartSel={HIT_START}, StopSel={HIT_END}'
+    highlights = ', '.join(
+        f"ts_headline('simple', coalesce({c}, ''), query, :whole) AS {c}_hl" for c in HIGHLIGHTED
+    )
+    sql = text(f"""
+        SELECT ranked.*, {highlights},
+               ts_headline('simple', coalesce({SNIPPET}, ''), query, :snippet) AS {SNIPPET}_hl
+        FROM (
+            SELECT {', '.join(RESULT_COLUMNS)}, query, ts_rank_cd({USER_SEARCH_DOCUMENT}, query) AS rank
+            FROM "user", to_tsquery('simple', :query) AS query
+            WHERE {USER_SEARCH_DOCUMENT} @@ query
+            ORDER BY rank DESC, id
+            LIMIT :limit
+        ) AS ranked
+        ORDER BY rank DESC, id
+    """)
+    return db.session.execute(sql, {
+        'query': ' & '.join(f'{w}:*' for w in words),
+        'whole': f'{headline}, HighlightAll=true',
+        'snippet': f'{headline}, MaxWords={SNIPPET_WORDS}, MinWords=4',
+        'limit': limit,
+    }).mappings().all()
+
+
+def _search_sqlite(words, limit):
+    # FTS5 over the user_search table; bm25 weights follow the tsvector ones (names first, contact details last)
+    highlights = ', '.join(
+        f"highlight(user_search, {USER_SEARCH_COLUMNS.index(c)}, :start, :end) AS {c}_hl" for c in HIGHLIGHTED
+    )
+    sql = text(f"""
+        SELECT {', '.join(f'u.{c}' for c in RESULT_COLUMNS)},
+               -bm25(user_search, 10.0, 10.0, 4.0, 2.0, 1.0, 1.0) AS rank, {highlights},
+               snippet(user_search, {USER_SEARCH_COLUMNS.index(SNIPPET)}, :start, :end, '…', {SNIPPET_WORDS}) AS {SNIPPET}_hl
+        FROM user_search JOIN "user" AS u ON u.id = user_search.rowid
+        WHERE user_search MATCH :query
+        ORDER BY rank DESC, u.id
+        LIMIT :limit
+    """)
+    return db.session.execute(sql, {
+        'query': ' '.join(f'"{w}"*' for w in words),
+        'start': HIT_START,
+        'end': HIT_END,
+        'limit': limit,
+    }).mappings().all()
+
+
+def _search_scan(words, limit):
+    # Databases without a search index: the old substring match, unranked and unhighlighted
+    columns = [User.name, User.email, User.phone, User.business_name, User.business_category, User.services_offered]
+    query = db.session.query(*[getattr(User, c) for c in RESULT_COLUMNS])
+    for word in words:
+        query = query.filter(or_(*[c.ilike(like_pattern(word), escape='\\') for c in columns]))
+    return [dict(row._mapping, rank=None) for row in query.order_by(User.name).limit(limit)]
+
+
+SEARCHERS = {
+    'postgresql': _search_postgresql,
+    'sqlite': _search_sqlite,
+}
+
+
+def search_members(query, limit=DEFAULT_LIMIT):
+    """Top `limit` members matching every word of query as a prefix, best first.
+
+    Each result has the member's columns, a rank (higher is better) and
+    'highlights': name, business name and category with matches wrapped in
+    <mark>, plus a snippet of services_offered. Highlights are HTML-escaped.
+    Queries with an email address or phone number in them are matched as
+    substrings on every database, unranked and without highlights.
+    """
+    words = contact_terms(query)
+    if words:
+        search = _search_scan
+    else:
+        words = terms(query)
+        search = SEARCHERS.get(db.engine.dialect.name, _search_scan)
+    if not words:
+        return []
+    results = []
+    for row in search(words, limit):
+        result = {c: row[c] for c in RESULT_COLUMNS}
+        result['rank'] = row['rank']
+        if f'{SNIPPET}_hl' in row:
+            result['highlights'] = {c: mark(row[f'{c}_hl']) for c in HIGHLIGHTED + [SNIPPET]}
+        results.append(result)
+    return results
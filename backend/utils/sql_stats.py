@@ -0,0 +1,209 @@
+import time
+import heapq
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import request, g
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from backend.config.config import Config
+
+# Statements are kept as text without their parameters, which may hold member data
+STATEMENT_CHARS = 300
+
+_current = ContextVar('sql_stats', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def squash(statement):
+    return ' '.join(statement.split())[:STATEMENT_CHARS]
+
+
+class QueryStats:
+    """Statements run while bound (see record()); a stats bound inside another also counts towards it."""
+
+    def __init__(self, parent=None, slowest=None):
+        self.parent = parent
+        self.queries = 0
+        self.seconds = 0.0
+        self.slowest = []  # min-heap of (seconds, statement)
+        self.keep = Config.SQL_STATS_SLOWEST if slowest is None else slowest
+        self.repeats = {}
+        self._lock = threading.Lock()
+
+    def add(self, statement, seconds):
+        with self._lock:
+            self.queries += 1
+            self.seconds += seconds
+            self.repeats[statement] = self.repeats.get(statement, 0) + 1
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, (seconds, statement))
+            elif self.slowest and seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (seconds, statement))
+        if self.parent is not None:
+            self.parent.add(statement, seconds)
+
+    def repeated(self, limit=None):
+        """{statement: times} for statements run at least limit times - usually a query in a loop."""
+        limit = Config.SQL_STATS_REPEAT_LIMIT if limit is None else limit
+        return {statement: n for statement, n in self.repeats.items() if n >= limit}
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.seconds * 1000, 2),
+            'slowest': [{'ms': round(s * 1000, 2), 'statement': squash(st)} for s, st in sorted(self.slowest, reverse=True)],
+            'repeated': [{'times': n, 'statement': squash(st)} for st, n in self.repeated().items()],
+        }
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def bind(stats):
+    """Make stats the current QueryStats in this thread, e.g. in a worker thread serving a request."""
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def record():
+    """Count the statements run inside the block, including those of requests made from it."""
+    with bind(QueryStats(parent=current())) as stats:
+        yield stats
+
+
+@contextmanager
+def expect_queries(budget):
+    """Raise QueryBudgetExceeded if the block runs more than budget statements, e.g. around client.get()."""
+    with record() as stats:
+        yield stats
+    if stats.queries > budget:
+        raise QueryBudgetExceeded(f"{stats.queries} queries, budget {budget}: {stats.as_dict()}")
+
+
+def query_budget(limit):
+    """Declare the most statements a route should run, authentication included.
+
+    Requests over it are logged and counted in /api/analytics/queries; with
+    app.testing or app.debug set they raise QueryBudgetExceeded, which the
+    test client re-raises. benchmarks/query_budget.py fails on them too.
+    """
+    def decorator(f):
+        f.query_budget = limit
+        return f
+    return decorator
+
+
+def budget_of(view):
+    # token_required and cached use functools.wraps, which carries the attribute outwards
+    return getattr(view, 'query_budget', None)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('sql_stats_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get('sql_stats_started')
+    if stats is not None and started:
+        stats.add(statement, time.perf_counter() - started.pop())
+
+
+class EndpointStats:
+    """Per-endpoint totals for this worker, served by /api/analytics/queries."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, stats, budget):
+        with self._lock:
+            entry = self.endpoints.get(endpoint)
+            if entry is None:
+                entry = self.endpoints[endpoint] = {
+                    'requests': 0, 'queries': 0, 'max_queries': 0, 'db_seconds': 0.0, 'max_db_ms': 0.0,
+                    'budget': budget, 'over_budget': 0, 'slowest': [], 'repeated': {}
+                }
+            entry['requests'] += 1
+            entry['queries'] += stats.queries
+            entry['max_queries'] = max(entry['max_queries'], stats.queries)
+            entry['db_seconds'] += stats.seconds
+            entry['max_db_ms'] = max(entry['max_db_ms'], stats.seconds * 1000)
+            if budget is not None and stats.queries > budget:
+                entry['over_budget'] += 1
+            entry['slowest'] = heapq.nlargest(stats.keep, entry['slowest'] + stats.slowest)
+            for statement, n in stats.repeated().items():
+                entry['repeated'][statement] = max(entry['repeated'].get(statement, 0), n)
+
+    def stats(self):
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    'requests': e['requests'],
+                    'avg_queries': round(e['queries'] / e['requests'], 1),
+                    'max_queries': e['max_queries'],
+                    'avg_db_ms': round(e['db_seconds'] * 1000 / e['requests'], 2),
+                    'max_db_ms': round(e['max_db_ms'], 2),
+                    'budget': e['budget'],
+                    'over_budget': e['over_budget'],
+                    'slowest': [{'ms': round(s * 1000, 2), 'statement': squash(st)} for s, st in e['slowest']],
+                    'repeated': [{'times': n, 'statement': squash(st)} for st, n in e['repeated'].items()],
+                }
+                for endpoint, e in self.endpoints.items()
+            }
+        return {'endpoints': dict(sorted(endpoints.items(), key=lambda item: -item[1]['avg_db_ms']))}
+
+
+endpoint_stats = EndpointStats()
+
+
+def init_app(app):
+    """Record the statements of every request and report them in a Server-Timing header."""
+
+    @app.before_request
+    def start_sql_stats():
+        g.sql_stats_started = time.perf_counter()
+        g.sql_stats = QueryStats(parent=current())
+        g.sql_stats_token = _current.set(g.sql_stats)
+
+    @app.after_request
+    def report_sql_stats(response):
+        stats = g.get('sql_stats')
+        if stats is None:
+            return response
+        # db can exceed app when a handler runs statements on several threads (utils/dashboard.py)
+        elapsed = (time.perf_counter() - g.sql_stats_started) * 1000
+        response.headers['Server-Timing'] = (
+            f'db;dur={stats.seconds * 1000:.1f};desc="{stats.queries} queries", app;dur={elapsed:.1f}'
+        )
+        if request.endpoint:
+            budget = budget_of(app.view_functions.get(request.endpoint))
+            endpoint_stats.add(request.endpoint, stats, budget)
+            if budget is not None and stats.queries > budget:
+                print(f"⚠️ {request.method} {request.path} ran {stats.queries} queries (budget {budget})")
+                if app.testing or app.debug:
+                    raise QueryBudgetExceeded(
+                        f"{request.method} {request.path} ran {stats.queries} queries, budget {budget}: {stats.as_dict()}"
+                    )
+            for statement, n in stats.repeated().items():
+                print(f"⚠️ {request.method} {request.path} ran the same statement {n} times: {squash(statement)[:120]}")
+        return response
+
+    @app.teardown_request
+    def stop_sql_stats(exc):
+        token = g.pop('sql_stats_token', None)
+        if token is not None:
+            _current.reset(token)
@@ -0,0 +1,34 @@
+import os
+import sys
+import subprocess
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+MARKER = '-- startup profile --'
+
+
+def import_profile(module='backend.wsgi', env=None):
+    """Import module in a fresh interpreter under -X importtime.
+
+    Returns (total_ms, modules), where modules maps each top-level package to
+    the milliseconds spent importing it. Interpreter startup (site, encodings)
+    happens before the marker line and is left out.
+    """
+    child = f"import sys; sys.stderr.write({MARKER!r} + '\\n'); import {module}"
+    env = dict(os.environ if env is None else env)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (ROOT, env.get('PYTHONPATH')) if p)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', child],
+                            env=env, cwd=ROOT, capture_output=True, text=True)
+    lines = result.stderr.splitlines()
+    if result.returncode != 0 or MARKER not in lines:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+
+    modules = defaultdict(float)
+    for line in lines[lines.index(MARKER) + 1:]:
+        if not line.startswith('import time:'):
+            continue
+        self_us, _cumulative, name = line[len('import time:'):].split('|', 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        modules[name.strip().split('.')[0]] += int(self_us) / 1000
+    return sum(modules.values()), dict(modules)
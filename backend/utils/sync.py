@@ -0,0 +1,62 @@
+import json
+import base64
+from datetime import datetime, timedelta
+from sqlalchemy import or_, delete
+from backend.config.config import Config
+from backend.models import Tombstone
+from backend.utils.extensions import db
+
+# A token points this far before the sync that issued it, so a row written just before the
+# sync but committed after it still comes back next time. Clients upsert by id, so the
+# rows repeated from the overlap are harmless.
+OVERLAP = timedelta(seconds=5)
+# More changes than this for one entity and the client is told to refetch instead
+MAX_CHANGES = 2000
+
+
+class SyncError(ValueError):
+    pass
+
+
+def encode_token(moment):
+    return base64.urlsafe_b64encode(json.dumps({'t': moment.isoformat()}).encode()).decode().rstrip('=')
+
+
+def decode_token(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return datetime.fromisoformat(json.loads(base64.urlsafe_b64decode(padded.encode()))['t'])
+    except (ValueError, KeyError, TypeError):
+        raise SyncError('Invalid sync token')
+
+
+def next_token(now=None):
+    return encode_token((now or datetime.utcnow()) - OVERLAP)
+
+
+def token_expired(since, now=None):
+    # Tombstones older than the retention may have been pruned, so deletions could be missed
+    return since < (now or datetime.utcnow()) - timedelta(days=Config.SYNC_TOMBSTONE_DAYS)
+
+
+def deleted_since(entity, since, current_user, limit=MAX_CHANGES):
+    """Ids (as strings) of entity rows current_user could see that were deleted after since."""
+    query = db.session.query(Tombstone.row_id).filter(
+        Tombstone.entity == entity, Tombstone.deleted_at > since
+    )
+    if current_user.role != 'admin':
+        query = query.filter(or_(
+            Tombstone.user_id == current_user.id,
+            Tombstone.other_user_id == current_user.id,
+            Tombstone.user_id.is_(None) & Tombstone.other_user_id.is_(None)
+        ))
+    return [str(row_id) for row_id, in query.order_by(Tombstone.deleted_at).limit(limit + 1)]
+
+
+def prune_tombstones(days=None, now=None):
+    """Delete tombstones older than the retention; returns how many went."""
+    days = Config.SYNC_TOMBSTONE_DAYS if days is None else days
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    result = db.session.execute(delete(Tombstone).where(Tombstone.deleted_at < cutoff))
+    db.session.commit()
+    return result.rowcount
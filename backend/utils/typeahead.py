@@ -0,0 +1,186 @@
+import re
+import time
+import heapq
+import bisect
+import threading
+from collections import Counter
+from backend.config.config import Config
+
+# Fields a member can be found by, best match first
+FIELDS = ['name', 'business_name', 'business_category']
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# When prefixes find too few, names sharing this share of the query's trigrams fill in (typos)
+MIN_TRIGRAM_SIMILARITY = 0.5
+MIN_FUZZY_LENGTH = 4
+
+
+def words(text):
+    return re.findall(r'\w+', (text or '').lower())
+
+
+def trigrams(text):
+    # Padded at the start only: the query is what has been typed so far, not a whole word
+    padded = f'  {text}'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TypeaheadIndex:
+    """In-memory prefix and trigram index over member names, businesses and categories.
+
+    Each gunicorn worker builds its own copy from the database. Routes that
+    create, update or delete a member call upsert()/remove() after committing;
+    other workers pick the change up when their copy is older than max_age
+    seconds and is rebuilt on the next lookup.
+    """
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self.built_at = None
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._members = {}      # id -> compact result dict
+        self._postings = {}     # word -> {id: best field rank}
+        self._words = []        # sorted distinct words, for prefix ranges
+        self._names = []        # sorted (lower-cased name, id), so the best matches are a range
+        self._trigrams = {}     # trigram -> set of ids
+
+    def rebuild(self):
+        from backend.models import User
+        from backend.utils.extensions import db
+
+        rows = db.session.query(User.id, User.name, User.business_name, User.business_category).all()
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._add(row.id, row.name, row.business_name, row.business_category)
+            self._words.sort()
+            self._names.sort()
+            self.built_at = time.monotonic()
+        return len(rows)
+
+    def ensure_fresh(self):
+        if self.built_at is None or time.monotonic() - self.built_at > self.max_age:
+            self.rebuild()
+
+    def upsert(self, user):
+        with self._lock:
+            self._remove(user.id)
+            self._add(user.id, user.name, user.business_name, user.business_category, keep_sorted=True)
+
+    def remove(self, user_id):
+        with self._lock:
+            self._remove(int(user_id))
+
+    def __len__(self):
+        return len(self._members)
+
+    def _add(self, user_id, name, business_name, business_category, keep_sorted=False):
+        member = {'id': user_id, 'name': name, 'business_name': business_name,
+                  'business_category': business_category}
+        self._members[user_id] = member
+        key = (' '.join(words(name)), user_id)
+        if keep_sorted:
+            bisect.insort(self._names, key)
+        else:
+            self._names.append(key)
+        for rank, field in enumerate(FIELDS):
+            for word in words(member[field]):
+                postings = self._postings.get(word)
+                if postings is None:
+                    postings = self._postings[word] = {}
+                    if keep_sorted:
+                        bisect.insort(self._words, word)
+                    else:
+                        self._words.append(word)
+                postings[user_id] = min(postings.get(user_id, rank), rank)
+        for gram in trigrams(' '.join(words(name))):
+            self._trigrams.setdefault(gram, set()).add(user_id)
+
+    def _remove(self, user_id):
+        member = self._members.pop(user_id, None)
+        if member is None:
+            return
+        key = (' '.join(words(member['name'])), user_id)
+        i = bisect.bisect_left(self._names, key)
+        if i < len(self._names) and self._names[i] == key:
+            del self._names[i]
+        for field in FIELDS:
+            for word in words(member[field]):
+                postings = self._postings.get(word)
+                if postings is not None and postings.pop(user_id, None) is not None and not postings:
+                    del self._postings[word]
+                    i = bisect.bisect_left(self._words, word)
+                    if i < len(self._words) and self._words[i] == word:
+                        del self._words[i]
+        for gram in trigrams(' '.join(words(member['name']))):
+            ids = self._trigrams.get(gram)
+            if ids is not None:
+                ids.discard(user_id)
+                if not ids:
+                    del self._trigrams[gram]
+
+    def _prefix_matches(self, prefix):
+        """{id: best field rank} over every indexed word starting with prefix."""
+        matches = {}
+        start = bisect.bisect_left(self._words, prefix)
+        for word in self._words[start:bisect.bisect_left(self._words, prefix + '\uffff')]:
+            for user_id, rank in self._postings[word].items():
+                if rank < matches.get(user_id, len(FIELDS)):
+                    matches[user_id] = rank
+        return matches
+
+    def suggest(self, query, limit=DEFAULT_LIMIT):
+        """Top `limit` members for what has been typed so far.
+
+        Names starting with the query come first. After them, members where
+        every word prefixes a word of the name, business or category, with a
+        name match outranking a business match, which outranks the category.
+        If that finds fewer than `limit`, names sharing enough trigrams with
+        the query (typos) fill the rest.
+        """
+        terms = words(query)
+        if not terms:
+            return []
+        phrase = ' '.join(terms)
+        with self._lock:
+            # Names that start with what was typed come first, alphabetically; a short
+            # prefix like "r" is answered from this range without scoring anyone
+            start = bisect.bisect_left(self._names, (phrase,))
+            end = bisect.bisect_left(self._names, (phrase + '\uffff',), start, min(start + limit, len(self._names)))
+            results = [self._members[user_id] for _, user_id in self._names[start:end]]
+
+            if len(results) < limit:
+                scores = None
+                for term in sorted(terms, key=len, reverse=True):
+                    matches = self._prefix_matches(term)
+                    if scores is None:
+                        scores = matches
+                    else:
+                        scores = {i: scores[i] + rank for i, rank in matches.items() if i in scores}
+                    if not scores:
+                        break
+                seen = {member['id'] for member in results}
+                best = heapq.nsmallest(limit - len(results), (
+                    (rank, self._members[user_id]['name'].lower(), user_id)
+                    for user_id, rank in scores.items() if user_id not in seen
+                ))
+                results.extend(self._members[user_id] for _, _, user_id in best)
+
+            if len(results) < limit and len(phrase) >= MIN_FUZZY_LENGTH:
+                grams = trigrams(phrase)
+                shared = Counter()
+                for gram in grams:
+                    shared.update(self._trigrams.get(gram, ()))
+                seen = {member['id'] for member in results}
+                close = [(count / len(grams), user_id) for user_id, count in shared.items()
+                         if user_id not in seen and count / len(grams) >= MIN_TRIGRAM_SIMILARITY]
+                for _, user_id in heapq.nlargest(limit - len(results), close):
+                    results.append(self._members[user_id])
+
+        return [dict(member, id=str(member['id'])) for member in results]
+
+
+member_index = TypeaheadIndex(Config.SUGGEST_INDEX_MAX_AGE)
@@ -1,5 +1,29 @@
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:5000/api';
 
+// List endpoints return { items, next_cursor } pages by default; this keeps the
+// old plain-array responses until the pages below move to cursor pagination.
+const UNPAGINATED = { paginate: 'false' };
+
+// Photo URLs come back as API paths (/api/users/<id>/photo?...); point them at the backend host.
+const API_ORIGIN = API_URL.replace(/\/api\/?$/, '');
+const absolutePhotoUrl = (path?: string | null) => (path && path.startsWith('/') ? `${API_ORIGIN}${path}` : path);
+// Merge one entity's /api/sync delta into a newest-first list already on screen: changed rows are
+// replaced in place, new ones go on top and deleted ids are dropped
+export const applySyncChanges = <T extends { id: string }>(items: T[], delta?: { upserted: T[], deleted: string[] }): T[] => {
+    if (!delta || (!delta.upserted.length && !delta.deleted.length)) return items;
+    const changed = new Map(delta.upserted.map(row => [row.id, row]));
+    const deleted = new Set(delta.deleted);
+    const known = new Set(items.map(row => row.id));
+    const added = delta.upserted.filter(row => !known.has(row.id) && !deleted.has(row.id)).reverse();
+    return [...added, ...items.filter(row => !deleted.has(row.id)).map(row => changed.get(row.id) ?? row)];
+};
+
+const withPhotoUrls = (u: any) => ({
+    ...u,
+    photo: absolutePhotoUrl(u.photo),
+    photos: u.photos && Object.fromEntries(Object.entries(u.photos).map(([size, path]) => [size, absolutePhotoUrl(path as string)])),
+});
+
 export const api = {
     // Auth
     login: async (email: string, password: string): Promise<any> => {
@@ -43,8 +67,11 @@ export const api = {
     },
 
     // Referrals
-    getReferrals: async (token: string, params?: { search?: string, category?: string, filter?: string }): Promise<any> => {
-        const query = new URLSearchParams(params as any).toString();
+    getReferrals: async (token: string, params?: {
+        search?: string, category?: string, filter?: string, status?: string, referral_type?: string,
+        startDate?: string, endDate?: string, counterparty?: string
+    }): Promise<any> => {
+        const query = new URLSearchParams({ ...params, ...UNPAGINATED } as any).toString();
         const res = await fetch(`${API_URL}/referrals/${query ? '?' + query : ''}`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
@@ -100,11 +127,21 @@ export const api = {
     },
 
     getUsers: async (token: string, params?: { search?: string, category?: string }): Promise<any> => {
-        const query = new URLSearchParams(params as any).toString();
+        const query = new URLSearchParams({ ...params, ...UNPAGINATED } as any).toString();
         const res = await fetch(`${API_URL}/users/${query ? '?' + query : ''}`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
         if (!res.ok) throw new Error('Failed to fetch users');
+        return (await res.json()).map(withPhotoUrls);
+    },
+
+    // Compact { id, name, business_name, business_category } matches for member pickers
+    suggestUsers: async (token: string, q: string, limit?: number): Promise<any> => {
+        const query = new URLSearchParams({ q, ...(limit ? { limit: String(limit) } : {}) }).toString();
+        const res = await fetch(`${API_URL}/users/suggest?${query}`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!res.ok) throw new Error('Failed to fetch suggestions');
         return res.json();
     },
 
@@ -132,7 +169,7 @@ export const api = {
 
     // Meetings
     getMeetings: async (token: string, params?: { search?: string, category?: string, filter?: string }): Promise<any> => {
-        const query = new URLSearchParams(params as any).toString();
+        const query = new URLSearchParams({ ...params, ...UNPAGINATED, include: 'participants' } as any).toString();
         const res = await fetch(`${API_URL}/meetings/${query ? '?' + query : ''}`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
@@ -178,7 +215,7 @@ export const api = {
 
     // Revenue
     getRevenue: async (token: string, params?: { filter?: string, member_id?: string, category?: string, startDate?: string, endDate?: string }): Promise<any> => {
-        const query = new URLSearchParams(params as any).toString();
+        const query = new URLSearchParams({ ...params, ...UNPAGINATED } as any).toString();
         const res = await fetch(`${API_URL}/revenue/${query ? '?' + query : ''}`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
@@ -216,18 +253,55 @@ export const api = {
         return res.json();
     },
 
+    // Member dashboard in one request: counts, revenue totals, unread notifications and the
+    // latest few referrals, revenue, meetings, events, notifications, guests and learning credits
+    getDashboard: async (token: string): Promise<any> => {
+        const res = await fetch(`${API_URL}/dashboard/me`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!res.ok) throw new Error('Failed to fetch dashboard');
+        return res.json();
+    },
+
     // Search
     search: async (token: string, query: string): Promise<any> => {
-        const res = await fetch(`${API_URL}/search/?q=${query}`, {
+        const res = await fetch(`${API_URL}/search/?q=${encodeURIComponent(query)}`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
         if (!res.ok) throw new Error('Search failed');
         return res.json();
     },
 
+    // Exports: streamed CSV/NDJSON, filtered like the matching list endpoint
+    exportData: async (token: string, entity: 'referrals' | 'revenue' | 'attendance', params?: Record<string, string>): Promise<Blob> => {
+        const query = new URLSearchParams(params || {}).toString();
+        const res = await fetch(`${API_URL}/export/${entity}${query ? '?' + query : ''}`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!res.ok) throw new Error('Export failed');
+        return res.blob();
+    },
+
+    // Delta sync: rows of referrals, revenue, meetings and notifications changed since the last
+    // token. On reset (first call, an old token, or too many changes) refetch the lists, then
+    // keep syncing from the returned token; merge deltas with applySyncChanges.
+    sync: async (token: string, since?: string | null, entities?: Array<'referrals' | 'revenue' | 'meetings' | 'notifications'>): Promise<{
+        token: string, reset: boolean, changes: Record<string, { upserted: any[], deleted: string[] }>
+    }> => {
+        const params: Record<string, string> = {};
+        if (since) params.since = since;
+        if (entities) params.entities = entities.join(',');
+        const query = new URLSearchParams(params).toString();
+        const res = await fetch(`${API_URL}/sync/${query ? '?' + query : ''}`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!res.ok) throw new Error('Sync failed');
+        return res.json();
+    },
+
     // Notifications
     getNotifications: async (token: string): Promise<any> => {
-        const res = await fetch(`${API_URL}/notifications/`, {
+        const res = await fetch(`${API_URL}/notifications/?paginate=false`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
         if (!res.ok) throw new Error('Failed to fetch notifications');
@@ -259,7 +333,7 @@ export const api = {
 
     // Guests
     getGuests: async (token: string): Promise<any> => {
-        const res = await fetch(`${API_URL}/guests/`, {
+        const res = await fetch(`${API_URL}/guests/?paginate=false`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
         if (!res.ok) throw new Error('Failed to fetch guests');
@@ -294,7 +368,7 @@ export const api = {
 
     // Learning Credits
     getLearningCredits: async (token: string): Promise<any> => {
-        const res = await fetch(`${API_URL}/learning/`, {
+        const res = await fetch(`${API_URL}/learning/?paginate=false`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
         if (!res.ok) throw new Error('Failed to fetch learning credits');
@@ -316,7 +390,7 @@ export const api = {
 
     // Dashboard Data (Parallel fetching for efficiency)
     getDashboardData: async (token: string, filter?: string): Promise<any> => {
-        const filterQuery = filter && filter !== 'lifetime' ? `?filter=${filter}` : '';
+        const filterQuery = filter && filter !== 'lifetime' ? `?filter=${filter}&paginate=false` : '?paginate=false';
         const handleResponse = async (res: Response) => {
             if (!res.ok) {
                 const text = await res.text();
@@ -342,7 +416,7 @@ export const api = {
             safeFetch(`${API_URL}/referrals/${filterQuery}`),
             safeFetch(`${API_URL}/revenue/${filterQuery}`),
             safeFetch(`${API_URL}/meetings/${filterQuery}`),
-            safeFetch(`${API_URL}/auth/users`),
+            safeFetch(`${API_URL}/auth/users?paginate=false`),
         ]);
 
         return { referrals, revenue, meetings, members };
@@ -0,0 +1,30 @@
+"""Link broadcast notifications to their Broadcast row
+
+Revision ID: a7e2c94f0b15
+Revises: f3c6d1a8b920
+Create Date: 2026-10-18 16:48:12.530447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7e2c94f0b15'
+down_revision = 'f3c6d1a8b920'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('broadcast_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_notification_broadcast_id_broadcast', 'broadcast', ['broadcast_id'], ['id'])
+        batch_op.create_index('ix_notification_broadcast_id', ['broadcast_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_broadcast_id')
+        batch_op.drop_constraint('fk_notification_broadcast_id_broadcast', type_='foreignkey')
+        batch_op.drop_column('broadcast_id')
@@ -0,0 +1,46 @@
+"""Add tombstones and updated_at indexes for /api/sync
+
+Revision ID: a9c4e7f1d263
+Revises: b6e3d9f2a471
+Create Date: 2026-10-19 00:31:08.204517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9c4e7f1d263'
+down_revision = 'b6e3d9f2a471'
+branch_labels = None
+depends_on = None
+
+
+# (table, index name, columns) - kept in sync with __table_args__ in backend/models.py
+INDEXES = [
+    ('referral', 'ix_referral_updated_at', ['updated_at']),
+    ('revenue', 'ix_revenue_updated_at', ['updated_at']),
+    ('notification', 'ix_notification_user_id_updated_at', ['user_id', 'updated_at']),
+]
+
+
+def upgrade():
+    op.create_table('tombstone',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=30), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('other_user_id', sa.Integer(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstone_deleted_at', 'tombstone', ['deleted_at'], unique=False)
+    for table, name, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for table, name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_index('ix_tombstone_deleted_at', table_name='tombstone')
+    op.drop_table('tombstone')
@@ -0,0 +1,31 @@
+"""Add updated_at to the listed tables for conditional GETs
+
+Revision ID: b6e3d9f2a471
+Revises: d4a7b2e9c815
+Create Date: 2026-10-18 23:12:40.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e3d9f2a471'
+down_revision = 'd4a7b2e9c815'
+branch_labels = None
+depends_on = None
+
+TABLES = ['user', 'referral', 'revenue', 'meeting', 'event', 'notification', 'guest', 'learning_credit']
+
+
+def upgrade():
+    # Nullable and not backfilled, so this is a catalog change even on large tables. List ETags
+    # combine max(updated_at) with the row count and ids, so old rows left NULL are still covered:
+    # the first update gives them a timestamp.
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_column(table, 'updated_at')
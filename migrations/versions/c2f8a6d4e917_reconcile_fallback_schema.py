@@ -0,0 +1,72 @@
+"""Create the columns and tables that only the startup raw SQL fallback used to add
+
+Revision ID: c2f8a6d4e917
+Revises: b9d4e1f7c203
+Create Date: 2026-10-18 19:32:08.245170
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f8a6d4e917'
+down_revision = 'b9d4e1f7c203'
+branch_labels = None
+depends_on = None
+
+
+# (table, column) - added by the old ALTER TABLE ... IF NOT EXISTS fallback or db.create_all()
+COLUMNS = [
+    ('meeting', sa.Column('meeting_mode', sa.String(length=20), nullable=True, server_default='Offline')),
+    ('meeting', sa.Column('meet_link', sa.String(length=500), nullable=True)),
+    ('user', sa.Column('membership_plan', sa.String(length=50), nullable=True, server_default='12 Months')),
+]
+
+
+def upgrade():
+    # Production databases already have some or all of this, so check everything first
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    for table, column in COLUMNS:
+        if column.name not in {c['name'] for c in inspector.get_columns(table)}:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.add_column(column)
+
+    if 'guest' not in tables:
+        op.create_table('guest',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('invited_by', sa.Integer(), nullable=False),
+        sa.Column('visit_date', sa.String(length=20), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['invited_by'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_guest_invited_by_created_at', 'guest', ['invited_by', 'created_at'], unique=False)
+
+    if 'learning_credit' not in tables:
+        op.create_table('learning_credit',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False),
+        sa.Column('topic', sa.String(length=200), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=True),
+        sa.Column('duration_hours', sa.Float(), nullable=True),
+        sa.Column('date', sa.String(length=20), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['member_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_learning_credit_member_id_created_at', 'learning_credit', ['member_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    # These predate the migration on most databases; leave them in place
+    pass
@@ -0,0 +1,45 @@
+"""Add member_stats rollup table
+
+Revision ID: c41d7e2a9f10
+Revises: b78b33492c13
+Create Date: 2026-10-18 10:02:11.418220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e2a9f10'
+down_revision = 'b78b33492c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('member_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('referrals', sa.Integer(), nullable=False),
+    sa.Column('meetings', sa.Integer(), nullable=False),
+    sa.Column('events', sa.Integer(), nullable=False),
+    sa.Column('one_to_ones', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill from the raw tables so engagement doesn't read zeros until the first rebuild
+    op.execute("""
+        INSERT INTO member_stats (user_id, referrals, meetings, events, one_to_ones, updated_at)
+        SELECT u.id,
+            (SELECT COUNT(*) FROM referral r WHERE r.from_member_id = u.id),
+            (SELECT COUNT(*) FROM meeting_attendees ma WHERE ma.user_id = u.id),
+            (SELECT COUNT(*) FROM event_attendees ea WHERE ea.user_id = u.id),
+            (SELECT COUNT(*) FROM one_to_one o WHERE o.member_id = u.id OR o.with_member_id = u.id),
+            CURRENT_TIMESTAMP
+        FROM "user" u
+    """)
+
+
+def downgrade():
+    op.drop_table('member_stats')
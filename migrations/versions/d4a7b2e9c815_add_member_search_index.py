@@ -0,0 +1,63 @@
+"""Add the member full-text search index
+
+Revision ID: d4a7b2e9c815
+Revises: c2f8a6d4e917
+Create Date: 2026-10-18 21:04:51.377120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7b2e9c815'
+down_revision = 'c2f8a6d4e917'
+branch_labels = None
+depends_on = None
+
+
+# Copied from backend/models.py at the time of this revision
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(business_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(business_category, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(services_offered, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(phone, '')), 'D')"
+)
+COLUMNS = 'name, business_name, business_category, services_offered, email, phone'
+NEW = ', '.join(f'new.{c.strip()}' for c in COLUMNS.split(','))
+OLD = ', '.join(f'old.{c.strip()}' for c in COLUMNS.split(','))
+
+SQLITE_UPGRADE = [
+    f"CREATE VIRTUAL TABLE user_search USING fts5({COLUMNS}, content='user', content_rowid='id', prefix='2 3')",
+    f"""CREATE TRIGGER user_search_ai AFTER INSERT ON "user" BEGIN
+        INSERT INTO user_search(rowid, {COLUMNS}) VALUES (new.id, {NEW});
+    END""",
+    f"""CREATE TRIGGER user_search_ad AFTER DELETE ON "user" BEGIN
+        INSERT INTO user_search(user_search, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD});
+    END""",
+    f"""CREATE TRIGGER user_search_au AFTER UPDATE OF {COLUMNS} ON "user" BEGIN
+        INSERT INTO user_search(user_search, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD});
+        INSERT INTO user_search(rowid, {COLUMNS}) VALUES (new.id, {NEW});
+    END""",
+    # Index the members that already exist
+    "INSERT INTO user_search(user_search) VALUES ('rebuild')",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.create_index('ix_user_search', 'user', [sa.text(SEARCH_DOCUMENT)], unique=False, postgresql_using='gin')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_user_search', table_name='user')
+    elif dialect == 'sqlite':
+        for trigger in ('user_search_ai', 'user_search_ad', 'user_search_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS user_search')
@@ -0,0 +1,36 @@
+"""Add monthly_metric rollup table
+
+Revision ID: d8a3f5b61c27
+Revises: c41d7e2a9f10
+Create Date: 2026-10-18 11:24:37.902113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3f5b61c27'
+down_revision = 'c41d7e2a9f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled by e5b2c8d47a13, once rows carry the bucket they were counted in
+    op.create_table('monthly_metric',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('chapter', sa.String(length=100), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('referrals', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('revenue_count', sa.Integer(), nullable=False),
+    sa.Column('new_members', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('year', 'month', 'chapter', 'category')
+    )
+
+
+def downgrade():
+    op.drop_table('monthly_metric')
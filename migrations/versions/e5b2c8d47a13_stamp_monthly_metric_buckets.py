@@ -0,0 +1,100 @@
+"""Keep the monthly_metric bucket on each row and backfill monthly_metric
+
+Revision ID: e5b2c8d47a13
+Revises: a9c4e7f1d263
+Create Date: 2026-10-19 09:12:44.530871
+
+"""
+from collections import defaultdict
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2c8d47a13'
+down_revision = 'a9c4e7f1d263'
+branch_labels = None
+depends_on = None
+
+
+# (table, column holding the member the row is filed under)
+TABLES = [
+    ('user', 'id'),
+    ('referral', 'from_member_id'),
+    ('revenue', 'member_id'),
+]
+
+FACTS = ['referrals', 'revenue', 'revenue_count', 'new_members']
+
+
+def upgrade():
+    for table, member_id in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('metric_chapter', sa.String(length=100), nullable=True))
+            batch_op.add_column(sa.Column('metric_category', sa.String(length=100), nullable=True))
+
+        # Existing rows are filed under their member's profile as it stands now
+        op.execute(f"""
+            UPDATE "{table}" SET
+                metric_chapter = COALESCE((SELECT u.chapter FROM "user" u WHERE u.id = "{table}".{member_id}), ''),
+                metric_category = COALESCE((SELECT u.business_category FROM "user" u WHERE u.id = "{table}".{member_id}), '')
+        """)
+
+    # monthly_metric was created empty (d8a3f5b61c27); rebuild it from the stamped rows as
+    # `flask monthly-metrics backfill` does, so analytics doesn't read zeros until someone runs it
+    bind = op.get_bind()
+    buckets = defaultdict(lambda: dict.fromkeys(FACTS, 0))
+
+    def add(when, chapter, category, **facts):
+        bucket = buckets[(when.year, when.month, chapter, category)]
+        for fact, value in facts.items():
+            bucket[fact] += value
+
+    for created_at, chapter, category in bind.execute(sa.text(
+        'SELECT created_at, metric_chapter, metric_category FROM referral WHERE created_at IS NOT NULL'
+    )):
+        add(as_datetime(created_at), chapter, category, referrals=1)
+
+    for created_at, chapter, category in bind.execute(sa.text(
+        'SELECT created_at, metric_chapter, metric_category FROM "user" WHERE created_at IS NOT NULL'
+    )):
+        add(as_datetime(created_at), chapter, category, new_members=1)
+
+    for date_str, created_at, amount, chapter, category in bind.execute(sa.text(
+        'SELECT date, created_at, amount, metric_chapter, metric_category FROM revenue'
+    )):
+        # Same rule as monthly_metrics.revenue_month()
+        try:
+            when = datetime.strptime(date_str, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            when = as_datetime(created_at) or datetime.utcnow()
+        add(when, chapter, category, revenue=amount or 0, revenue_count=1)
+
+    monthly_metric = sa.table(
+        'monthly_metric',
+        sa.column('year'), sa.column('month'), sa.column('chapter'), sa.column('category'),
+        sa.column('updated_at'), *[sa.column(fact) for fact in FACTS]
+    )
+    now = datetime.utcnow()
+    rows = [
+        dict(facts, year=year, month=month, chapter=chapter, category=category, updated_at=now)
+        for (year, month, chapter, category), facts in buckets.items()
+    ]
+    op.execute(monthly_metric.delete())
+    if rows:
+        op.bulk_insert(monthly_metric, rows)
+
+
+def as_datetime(value):
+    # SQLite hands back DateTime columns as text through a plain text() query
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def downgrade():
+    for table, _ in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('metric_category')
+            batch_op.drop_column('metric_chapter')
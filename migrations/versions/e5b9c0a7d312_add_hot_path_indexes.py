@@ -0,0 +1,60 @@
+"""Add indexes for list filters and joins
+
+Revision ID: e5b9c0a7d312
+Revises: d8a3f5b61c27
+Create Date: 2026-10-18 12:40:05.771930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b9c0a7d312'
+down_revision = 'd8a3f5b61c27'
+branch_labels = None
+depends_on = None
+
+
+# (table, index name, columns) - kept in sync with __table_args__ in backend/models.py
+INDEXES = [
+    ('referral', 'ix_referral_from_member_id_created_at', ['from_member_id', 'created_at']),
+    ('referral', 'ix_referral_to_member_id_created_at', ['to_member_id', 'created_at']),
+    ('referral', 'ix_referral_created_at', ['created_at']),
+    ('revenue', 'ix_revenue_member_id_created_at', ['member_id', 'created_at']),
+    ('revenue', 'ix_revenue_created_by_created_at', ['created_by', 'created_at']),
+    ('revenue', 'ix_revenue_created_at', ['created_at']),
+    ('revenue', 'ix_revenue_date', ['date']),
+    ('notification', 'ix_notification_user_id_created_at', ['user_id', 'created_at']),
+    ('guest', 'ix_guest_invited_by_created_at', ['invited_by', 'created_at']),
+    ('learning_credit', 'ix_learning_credit_member_id_created_at', ['member_id', 'created_at']),
+    ('one_to_one', 'ix_one_to_one_member_id', ['member_id']),
+    ('one_to_one', 'ix_one_to_one_with_member_id', ['with_member_id']),
+    # The attendee primary keys lead with user_id, so per-meeting/per-event lookups need their own index
+    ('meeting_attendees', 'ix_meeting_attendees_meeting_id', ['meeting_id']),
+    ('event_attendees', 'ix_event_attendees_event_id', ['event_id']),
+]
+
+
+def upgrade():
+    # guest and learning_credit were created outside migrations on some databases, so check first
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    for table, name, columns in INDEXES:
+        if table not in tables:
+            continue
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    for table, name, columns in reversed(INDEXES):
+        if table in tables and name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
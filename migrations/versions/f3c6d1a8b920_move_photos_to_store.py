@@ -0,0 +1,77 @@
+"""Move member photos from user.photo into the photo store
+
+Revision ID: f3c6d1a8b920
+Revises: e5b9c0a7d312
+Create Date: 2026-10-18 15:21:47.093114
+
+"""
+import base64
+from alembic import op
+import sqlalchemy as sa
+from flask import current_app
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c6d1a8b920'
+down_revision = 'e5b9c0a7d312'
+branch_labels = None
+depends_on = None
+
+BATCH = 100
+
+user = sa.table('user',
+    sa.column('id', sa.Integer),
+    sa.column('photo', sa.Text),
+    sa.column('photo_key', sa.String)
+)
+
+
+def upgrade():
+    from backend.utils import photo_store
+
+    columns = [c['name'] for c in sa.inspect(op.get_bind()).get_columns('user')]
+    if 'photo_key' not in columns:
+        op.add_column('user', sa.Column('photo_key', sa.String(length=64), nullable=True))
+
+    store = photo_store.store_from_config(current_app.config)
+    conn = op.get_bind()
+    moved, skipped, last_id = 0, 0, 0
+    # Walk by id in small batches so only a handful of base64 blobs are in memory at once
+    while True:
+        rows = conn.execute(
+            sa.select(user.c.id, user.c.photo)
+            .where(user.c.id > last_id, user.c.photo.isnot(None), user.c.photo != '')
+            .order_by(user.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        for user_id, photo in rows:
+            last_id = user_id
+            try:
+                data = photo_store.decode_data_url(photo)
+                photo_key = photo_store.save_photo(store, user_id, data)
+            except photo_store.PhotoError as e:
+                # Leave unreadable data in place rather than lose it
+                print(f"Skipping photo of user {user_id}: {e}")
+                skipped += 1
+                continue
+            conn.execute(user.update().where(user.c.id == user_id).values(photo_key=photo_key, photo=None))
+            moved += 1
+    print(f"Moved {moved} photo(s) to {store.root}, skipped {skipped}")
+
+
+def downgrade():
+    from backend.utils import photo_store
+
+    store = photo_store.store_from_config(current_app.config)
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(user.c.id, user.c.photo_key).where(user.c.photo_key.isnot(None))).all()
+    for user_id, photo_key in rows:
+        key = photo_store.rendition_key(user_id, photo_key, photo_store.ORIGINAL)
+        if not store.exists(key):
+            continue
+        mimetype = photo_store.MIMETYPES[photo_key.partition('.')[2]]
+        data_url = f"data:{mimetype};base64,{base64.b64encode(store.get(key)).decode()}"
+        conn.execute(user.update().where(user.c.id == user_id).values(photo=data_url))
+
+    op.drop_column('user', 'photo_key')
@@ -1,8 +1,11 @@
 from backend.app import create_app
 from backend.models import User
-from backend.utils.extensions import db, bcrypt
+from backend.utils.extensions import db
+from backend.utils.passwords import PasswordHasher
 
 app = create_app()
+# Hash inline: a spawn process pool would re-import and re-run this script
+hasher = PasswordHasher(workers=0)
 
 with app.app_context():
     # Create DB if not exists
@@ -11,7 +14,7 @@ with app.app_context():
     admin_email = 'admin@nagarbhavi.com'
     existing = User.query.filter_by(email=admin_email).first()
     if not existing:
-        hashed_password = bcrypt.generate_password_hash('admin123').decode('utf-8')
+        hashed_password = hasher.hash('admin123')
         admin = User(
             name='Admin User',
             email=admin_email,
@@ -1,8 +1,10 @@
 from backend.app import create_app
 from backend.models.user import User
-from backend.utils.extensions import bcrypt
+from backend.utils.passwords import PasswordHasher
 
 app = create_app()
+# Hash inline: a spawn process pool would re-import and re-run this script
+hasher = PasswordHasher(workers=0)
 
 with app.app_context():
     # Check if admin exists
@@ -11,7 +13,7 @@ with app.app_context():
     
     if not existing_admin:
         print(f"Creating admin user: {admin_email}")
-        hashed_password = bcrypt.generate_password_hash('admin123').decode('utf-8')
+        hashed_password = hasher.hash('admin123')
         User.create_user({
             'name': 'Admin User',
             'email': admin_email,
@@ -39,7 +41,7 @@ with app.app_context():
 
     if not existing_member:
         print(f"Creating member user: {member_email}")
-        hashed_password = bcrypt.generate_password_hash('password123').decode('utf-8')
+        hashed_password = hasher.hash('password123')
         User.create_user({
             'name': 'Test Member',
             'email': member_email,
@@ -1,8 +1,11 @@
 from backend.app import create_app
 from backend.models import User
-from backend.utils.extensions import db, bcrypt
+from backend.utils.extensions import db
+from backend.utils.passwords import PasswordHasher
 
 app = create_app()
+# Hash inline: a spawn process pool would re-import and re-run this script
+hasher = PasswordHasher(workers=0)
 
 with app.app_context():
     users = User.query.all()
@@ -17,7 +20,7 @@ with app.app_context():
         match = "No Match"
         for p in passwords:
             try:
-                if bcrypt.check_password_hash(user.password, p):
+                if hasher.check(user.password, p):
                     match = f"Match: {p}"
                     break
             except:
@@ -1,8 +1,10 @@
 from backend.app import create_app
 from backend.models import User
-from backend.utils.extensions import bcrypt
+from backend.utils.passwords import PasswordHasher
 
 app = create_app()
+# Hash inline: a spawn process pool would re-import and re-run this script
+hasher = PasswordHasher(workers=0)
 
 def verify_user(email, password):
     with app.app_context():
@@ -12,13 +14,13 @@ def verify_user(email, password):
             return False
             
         print(f"User found: {user.email}, Role: {user.role}")
-        if bcrypt.check_password_hash(user.password, password):
+        if hasher.check(user.password, password):
             print("Password check: VALID")
             return True
         else:
             print("Password check: INVALID")
             # Debugging: Generate a new hash to see what it should look like
-            new_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+            new_hash = hasher.hash(password)
             print(f"Stored hash: {user.password}")
             print(f"New hash for '{password}': {new_hash}")
             return False